@@ -5,6 +5,7 @@ from flask_restx import Api
 
 from conf.flask_conf import FlaskConf
 from core.database.database import init_db
+from core.jobs.job_handler import job_handler
 from core.routes import (
     callback_namespace,
     debug_namespace,
@@ -38,6 +39,8 @@ api = Api(
 make_directory(path=TEMP_PATH)
 make_directory(path=TRIAL_NETWORKS_PATH)
 
+job_handler.start()
+
 api.add_namespace(ns=callback_namespace, path="/api/v1/callback")
 if FlaskConf.FLASK_ENV == "development":
     api.add_namespace(ns=debug_namespace, path="/api/v1/debug")
@@ -10,7 +10,7 @@ backlog = 1024
 # Address and port Gunicorn will bind to
 bind = f"0.0.0.0:{TnlcmSettings.TNLCM_PORT}"
 
-# Request timeout in seconds (35 minutes). The time of the component that takes the longest time to deploy
+# Request timeout in seconds. Activations and destructions run as background jobs, so it only has to cover the cloning of the repositories
 timeout = get_dotenv_var(key="GUNICORN_TIMEOUT")
 
 # Number of worker processes to handle requests
@@ -8,13 +8,27 @@ class JenkinsSettings:
     Jenkins Settings
     """
 
+    JENKINS_CREDENTIALS_CHECK_INTERVAL = int(
+        get_dotenv_var(key="JENKINS_CREDENTIALS_CHECK_INTERVAL") or 300
+    )
     JENKINS_DESTROY_PIPELINE = get_dotenv_var(key="JENKINS_DESTROY_PIPELINE")
     JENKINS_DEPLOY_PIPELINE = get_dotenv_var(key="JENKINS_DEPLOY_PIPELINE")
     JENKINS_HOST = get_dotenv_var(key="JENKINS_HOST")
+    JENKINS_MAX_PARALLEL_BUILDS_PER_SITE = int(
+        get_dotenv_var(key="JENKINS_MAX_PARALLEL_BUILDS_PER_SITE") or 8
+    )
+    JENKINS_MAX_PARALLEL_BUILDS_PER_TRIAL_NETWORK = int(
+        get_dotenv_var(key="JENKINS_MAX_PARALLEL_BUILDS_PER_TRIAL_NETWORK") or 4
+    )
     JENKINS_PASSWORD = get_dotenv_var(key="JENKINS_PASSWORD")
+    JENKINS_POLL_INTERVAL = int(get_dotenv_var(key="JENKINS_POLL_INTERVAL") or 60)
     JENKINS_PORT = get_dotenv_var(key="JENKINS_PORT")
+    JENKINS_TIMEOUT = int(get_dotenv_var(key="JENKINS_TIMEOUT") or 30)
     JENKINS_TNLCM_DIRECTORY = get_dotenv_var(key="JENKINS_TNLCM_DIRECTORY")
     JENKINS_TOKEN = get_dotenv_var(key="JENKINS_TOKEN")
+    JENKINS_UNAVAILABLE_INTERVAL = int(
+        get_dotenv_var(key="JENKINS_UNAVAILABLE_INTERVAL") or 30
+    )
     JENKINS_URL = get_dotenv_var(key="JENKINS_URL")
     JENKINS_USERNAME = get_dotenv_var(key="JENKINS_USERNAME")
 
@@ -31,13 +45,19 @@ class JenkinsSettings:
         raise UndefinedEnvVarError(missing_variables=missing_variables)
 
     config_dict = {
+        "JENKINS_CREDENTIALS_CHECK_INTERVAL": JENKINS_CREDENTIALS_CHECK_INTERVAL,
         "JENKINS_DESTROY_PIPELINE": JENKINS_DESTROY_PIPELINE,
         "JENKINS_DEPLOY_PIPELINE": JENKINS_DEPLOY_PIPELINE,
         "JENKINS_HOST": JENKINS_HOST,
+        "JENKINS_MAX_PARALLEL_BUILDS_PER_SITE": JENKINS_MAX_PARALLEL_BUILDS_PER_SITE,
+        "JENKINS_MAX_PARALLEL_BUILDS_PER_TRIAL_NETWORK": JENKINS_MAX_PARALLEL_BUILDS_PER_TRIAL_NETWORK,
         "JENKINS_PASSWORD": JENKINS_PASSWORD,
+        "JENKINS_POLL_INTERVAL": JENKINS_POLL_INTERVAL,
         "JENKINS_PORT": JENKINS_PORT,
+        "JENKINS_TIMEOUT": JENKINS_TIMEOUT,
         "JENKINS_TNLCM_DIRECTORY": JENKINS_TNLCM_DIRECTORY,
         "JENKINS_TOKEN": JENKINS_TOKEN,
+        "JENKINS_UNAVAILABLE_INTERVAL": JENKINS_UNAVAILABLE_INTERVAL,
         "JENKINS_URL": JENKINS_URL,
         "JENKINS_USERNAME": JENKINS_USERNAME,
     }
@@ -12,6 +12,10 @@ class TnlcmSettings:
     TNLCM_ADMIN_PASSWORD = get_dotenv_var(key="TNLCM_ADMIN_PASSWORD")
     TNLCM_ADMIN_USER = get_dotenv_var(key="TNLCM_ADMIN_USER")
     TNLCM_HOST = get_dotenv_var(key="TNLCM_HOST")
+    TNLCM_JOB_HEARTBEAT_TIMEOUT = int(
+        get_dotenv_var(key="TNLCM_JOB_HEARTBEAT_TIMEOUT") or 300
+    )
+    TNLCM_JOB_WORKERS = int(get_dotenv_var(key="TNLCM_JOB_WORKERS") or 4)
     TNLCM_PORT = get_dotenv_var(key="TNLCM_PORT")
     TNLCM_CALLBACK = get_dotenv_var(key="TNLCM_CALLBACK")
 
@@ -30,6 +34,8 @@ class TnlcmSettings:
         "TNLCM_ADMIN_PASSWORD": TNLCM_ADMIN_PASSWORD,
         "TNLCM_ADMIN_USER": TNLCM_ADMIN_USER,
         "TNLCM_HOST": TNLCM_HOST,
+        "TNLCM_JOB_HEARTBEAT_TIMEOUT": TNLCM_JOB_HEARTBEAT_TIMEOUT,
+        "TNLCM_JOB_WORKERS": TNLCM_JOB_WORKERS,
         "TNLCM_PORT": TNLCM_PORT,
         "TNLCM_CALLBACK": TNLCM_CALLBACK,
     }
@@ -1,11 +1,65 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import List
+
+from core.models.trial_network import TrialNetworkModel
 from core.models.user import UserModel
 
+USERS_CACHE_SIZE = 1024
+USERS_CACHE_TTL = 30
+
+users_cache = OrderedDict()
+users_cache_lock = Lock()
+
 
 def get_current_user_from_jwt(jwt_identity: str) -> UserModel:
     """
-    Function to know the current user based on their JWT (JSON Web Token) identity
+    Function to know the current user based on their JWT (JSON Web Token) identity. The users are cached for USERS_CACHE_TTL seconds, so the requests of the same user do not query the database each time
 
     :param jwt_identity: identity of the user contained in the JWT, ``str``
     :return: current user model, ``UserModel``
     """
-    return UserModel.objects(username=jwt_identity).first()
+    now = monotonic()
+    with users_cache_lock:
+        cached_user = users_cache.get(jwt_identity)
+        if cached_user and cached_user[0] > now:
+            users_cache.move_to_end(jwt_identity)
+            return cached_user[1]
+    user = UserModel.objects(username=jwt_identity).first()
+    if user:
+        with users_cache_lock:
+            users_cache[jwt_identity] = (now + USERS_CACHE_TTL, user)
+            users_cache.move_to_end(jwt_identity)
+            if len(users_cache) > USERS_CACHE_SIZE:
+                users_cache.popitem(last=False)
+    return user
+
+
+def invalidate_current_user(username: str) -> None:
+    """
+    Function to remove a user from the cache after it has been modified
+
+    :param username: username of the user, ``str``
+    """
+    with users_cache_lock:
+        users_cache.pop(username, None)
+
+
+def get_user_trial_network(
+    current_user: UserModel, tn_id: str, fields: List[str] = None
+) -> TrialNetworkModel:
+    """
+    Function to get a trial network the current user has access to with a single query. Users have access to the trial networks they created and admin users to all of them
+
+    :param current_user: current user model, ``UserModel``
+    :param tn_id: trial network identifier, ``str``
+    :param fields: fields to be loaded. If not specified, all the fields are loaded, ``List[str]``
+    :return: model of the trial network or None if the user has no access to it, ``TrialNetworkModel``
+    """
+    trial_networks = TrialNetworkModel.objects(tn_id=tn_id)
+    if current_user.role != "admin":
+        trial_networks = trial_networks.filter(user_created=current_user.username)
+    if fields:
+        trial_networks = trial_networks.only(*fields)
+    return trial_networks.first()
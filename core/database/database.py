@@ -1,4 +1,6 @@
 from mongoengine import connect
+from mongoengine.connection import get_db
+from pymongo.errors import OperationFailure
 
 from conf.mongodb import MongoDBSettings
 
@@ -8,3 +10,16 @@ def init_db() -> None:
     Initializes MongoDB connection
     """
     connect(alias="tnlcm-database-alias", host=MongoDBSettings.ME_CONFIG_MONGODB_URL)
+    drop_resource_manager_tn_id_index()
+
+
+def drop_resource_manager_tn_id_index() -> None:
+    """
+    Drop the unique index of the trial network identifier created by previous versions in the resource manager collection. The reservations of a component are shared by several trial networks, so the index rejects them
+    """
+    resource_manager = get_db(alias="tnlcm-database-alias")["resource_manager"]
+    try:
+        if "tn_id_1" in resource_manager.index_information():
+            resource_manager.drop_index("tn_id_1")
+    except OperationFailure:
+        pass
@@ -14,6 +14,10 @@ var tnlcmAdminEmail = process.env.TNLCM_ADMIN_EMAIL;
 var db = db.getSiblingDB(dbName);
 
 // Create collections
+db.createCollection("jenkins_build_console");
+db.createCollection("jenkins_build_event");
+db.createCollection("jenkins_pipeline");
+db.createCollection("job");
 db.createCollection("resource_manager");
 db.createCollection("trial_network");
 db.createCollection("user");
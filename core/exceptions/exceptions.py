@@ -94,6 +94,12 @@ class JenkinsError(CustomException):
     pass
 
 
+class JobError(CustomException):
+    """Base class for job related errors"""
+
+    pass
+
+
 class LibraryError(CustomException):
     """Base class for Library related errors"""
 
@@ -131,3 +137,9 @@ class UndefinedEnvVarError(CustomException):
             message=f"Set the value of the variables {missing_variables} in the .env file",
             status_code=404,
         )
+
+
+class VaultError(CustomException):
+    """Base class for Ansible Vault related errors"""
+
+    pass
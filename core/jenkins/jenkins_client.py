@@ -0,0 +1,369 @@
+import json
+from threading import Lock
+from time import monotonic
+from typing import Dict, Set, Tuple
+
+import requests
+from jenkins import (
+    EmptyResponseException,
+    Jenkins,
+    JenkinsException,
+    NotFoundException,
+    TimeoutException,
+)
+from requests.adapters import HTTPAdapter
+
+from conf.jenkins import JenkinsSettings
+from core.exceptions.exceptions import JenkinsError
+from core.logs.log_handler import console_logger
+
+BUILD_CONSOLE_PROGRESSIVE_TEXT = "%(folder_url)sjob/%(short_name)s/%(number)d/logText/progressiveText?start=%(start)d"
+BUILD_STATE = (
+    "%(folder_url)sjob/%(short_name)s/%(number)d/api/json?tree=number,building,result"
+)
+BUILDS_STATE = "%(folder_url)sjob/%(short_name)s/api/json?tree=allBuilds[number,result]"
+CONNECTION_POOL_SIZE = 32
+JOB_STATE = "%(folder_url)sjob/%(short_name)s/api/json?tree=name,url"
+QUEUE_INTERVAL = 5
+QUEUE_ITEM_STATE = (
+    "queue/item/%(number)d/api/json?tree=id,cancelled,why,executable[number]"
+)
+QUEUE_ITEMS = "queue/api/json?tree=items[id]"
+UNAVAILABLE_STATUS_CODES = (502, 503, 504)
+
+jenkins_clients = {}
+jenkins_clients_lock = Lock()
+
+
+def is_jenkins_unavailable(error: Exception) -> bool:
+    """
+    Check if an error received when sending a request to Jenkins means that Jenkins did not answer
+
+    :param error: error received when sending a request to Jenkins, ``Exception``
+    :return: True if Jenkins did not answer, False otherwise, ``bool``
+    """
+    if isinstance(error, (requests.exceptions.ConnectionError, TimeoutException)):
+        return True
+    return (
+        isinstance(error, requests.exceptions.HTTPError)
+        and error.response is not None
+        and error.response.status_code in UNAVAILABLE_STATUS_CODES
+    )
+
+
+def get_jenkins_client() -> "JenkinsClient":
+    """
+    Get the Jenkins client shared by all the threads of this process, so the connections to Jenkins are kept alive between requests. It fails without sending any request while Jenkins is unavailable. The credentials are verified the first time and then every JENKINS_CREDENTIALS_CHECK_INTERVAL seconds
+
+    :return: Jenkins client, ``JenkinsClient``
+    :raises JenkinsError:
+    """
+    with jenkins_clients_lock:
+        if JenkinsSettings.JENKINS_URL not in jenkins_clients:
+            jenkins_clients[JenkinsSettings.JENKINS_URL] = JenkinsClient(
+                url=JenkinsSettings.JENKINS_URL,
+                username=JenkinsSettings.JENKINS_USERNAME,
+                password=JenkinsSettings.JENKINS_PASSWORD,
+                timeout=JenkinsSettings.JENKINS_TIMEOUT,
+            )
+        jenkins_client = jenkins_clients[JenkinsSettings.JENKINS_URL]
+    jenkins_client.check_available()
+    jenkins_client.verify_credentials()
+    return jenkins_client
+
+
+class QueueWatcher:
+    """
+    Items of the Jenkins queue waited by the threads of this process. The identifiers of the items still in the queue are fetched together with one request at most every QUEUE_INTERVAL seconds, and only the items that left the queue are fetched one by one to know the number of their build
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor
+        """
+        self.lock = Lock()
+        self.queue_items = set()
+        self.refreshed_at = None
+
+    def get_build_number(
+        self, jenkins_client: "JenkinsClient", queue_item: int
+    ) -> int | None:
+        """
+        Get the number of the build started for a queue item
+
+        :param jenkins_client: Jenkins client, ``JenkinsClient``
+        :param queue_item: number of the queue item, ``int``
+        :return: number of the build or None if it has not started yet, ``int``
+        :raises JenkinsError:
+        :raises JenkinsException:
+        """
+        with self.lock:
+            if (
+                self.refreshed_at is None
+                or monotonic() - self.refreshed_at >= QUEUE_INTERVAL
+            ):
+                self.queue_items = jenkins_client.get_queue_items()
+                self.refreshed_at = monotonic()
+            if queue_item in self.queue_items:
+                return None
+        queue_item_state = jenkins_client.get_queue_item_state(number=queue_item)
+        if queue_item_state.get("cancelled"):
+            raise JenkinsError(
+                message=f"The queue item {queue_item} was cancelled in Jenkins before its build started",
+                status_code=500,
+            )
+        executable = queue_item_state.get("executable")
+        if not executable:
+            return None
+        return executable["number"]
+
+
+queue_watcher = QueueWatcher()
+
+
+class JenkinsClient(Jenkins):
+    """
+    Jenkins client with the requests that python-jenkins does not provide. It keeps the health of Jenkins, so when Jenkins stops answering the new operations fail without sending any request for JENKINS_UNAVAILABLE_INTERVAL seconds
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Constructor
+        """
+        super().__init__(*args, **kwargs)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=CONNECTION_POOL_SIZE,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self.health_lock = Lock()
+        self.credentials_lock = Lock()
+        self.credentials_verified_at = None
+        self.unavailable_until = 0
+        self.unavailable_error = None
+
+    def jenkins_request(
+        self, req, add_crumb=True, resolve_auth=True, stream=None
+    ) -> requests.Response:
+        """
+        Send a request to Jenkins, marking Jenkins as unavailable if it does not answer
+
+        :param req: request to be sent, ``requests.Request``
+        :param add_crumb: whether to add the crumb of Jenkins to the request, ``bool``
+        :param resolve_auth: whether to add the authentication to the request, ``bool``
+        :param stream: whether to return a stream, ``bool``
+        :return: response of Jenkins, ``requests.Response``
+        :raises JenkinsException:
+        """
+        try:
+            return super().jenkins_request(
+                req, add_crumb=add_crumb, resolve_auth=resolve_auth, stream=stream
+            )
+        except (requests.exceptions.RequestException, TimeoutException) as e:
+            if is_jenkins_unavailable(error=e):
+                self.set_unavailable(error=e)
+            raise
+
+    def check_available(self) -> None:
+        """
+        Check that Jenkins has not stopped answering in the last JENKINS_UNAVAILABLE_INTERVAL seconds. It is checked before starting a new operation, not by the requests of the operations already running
+
+        :raises JenkinsError:
+        """
+        with self.health_lock:
+            if monotonic() < self.unavailable_until:
+                raise JenkinsError(
+                    message=f"Jenkins is not available. Error received: {self.unavailable_error}",
+                    status_code=503,
+                )
+
+    def set_unavailable(self, error: Exception) -> None:
+        """
+        Mark Jenkins as unavailable for JENKINS_UNAVAILABLE_INTERVAL seconds. The credentials are verified again when Jenkins answers, since a restart of Jenkins invalidates its crumb
+
+        :param error: error received when sending a request to Jenkins, ``Exception``
+        """
+        with self.health_lock:
+            if monotonic() >= self.unavailable_until:
+                console_logger.warning(
+                    message=f"Jenkins is not available. Error received: {error}"
+                )
+            self.unavailable_until = (
+                monotonic() + JenkinsSettings.JENKINS_UNAVAILABLE_INTERVAL
+            )
+            self.unavailable_error = error
+            self.credentials_verified_at = None
+
+    def verify_credentials(self) -> None:
+        """
+        Verify the credentials in Jenkins if they have not been verified in the last JENKINS_CREDENTIALS_CHECK_INTERVAL seconds. The crumb of Jenkins is fetched again after each verification
+
+        :raises JenkinsError:
+        :raises JenkinsException:
+        """
+        with self.credentials_lock:
+            if (
+                self.credentials_verified_at is not None
+                and monotonic() - self.credentials_verified_at
+                < JenkinsSettings.JENKINS_CREDENTIALS_CHECK_INTERVAL
+            ):
+                return
+            self.get_whoami()
+            self.crumb = None
+            self.credentials_verified_at = monotonic()
+
+    def get_job_state(self, name: str) -> Dict:
+        """
+        Get the state of a pipeline. Only its name and URL are asked to Jenkins instead of the whole pipeline with its builds
+
+        :param name: name of the pipeline, ``str``
+        :return: state of the pipeline, ``Dict``
+        :raises NotFoundException:
+        :raises JenkinsException:
+        """
+        folder_url, short_name = self._get_job_folder(name)
+        try:
+            response = self.jenkins_open(
+                requests.Request("GET", self._build_url(JOB_STATE, locals()))
+            )
+        except NotFoundException:
+            raise NotFoundException(f"job[{name}] does not exist")
+        return json.loads(response)
+
+    def get_build_state(self, name: str, number: int) -> Dict:
+        """
+        Get the state of a build. Only its number, whether it is running and its result are asked to Jenkins
+
+        :param name: name of the pipeline, ``str``
+        :param number: number of the build, ``int``
+        :return: state of the build, ``Dict``
+        :raises JenkinsException:
+        """
+        folder_url, short_name = self._get_job_folder(name)
+        try:
+            response = self.jenkins_open(
+                requests.Request("GET", self._build_url(BUILD_STATE, locals()))
+            )
+        except NotFoundException:
+            raise JenkinsException(f"job[{name}] number[{number}] does not exist")
+        return json.loads(response)
+
+    def get_builds_state(self, name: str) -> Dict[int, Dict]:
+        """
+        Get the state of all the builds of a pipeline with one request. Only the number and the result of each build are asked to Jenkins
+
+        :param name: name of the pipeline, ``str``
+        :return: dictionary with the state of each build by its number, ``Dict[int, Dict]``
+        :raises JenkinsException:
+        """
+        folder_url, short_name = self._get_job_folder(name)
+        try:
+            response = self.jenkins_open(
+                requests.Request("GET", self._build_url(BUILDS_STATE, locals()))
+            )
+        except NotFoundException:
+            raise JenkinsException(f"job[{name}] does not exist")
+        return {
+            build_state["number"]: build_state
+            for build_state in json.loads(response).get("allBuilds", [])
+        }
+
+    def get_queue_items(self) -> Set[int]:
+        """
+        Get the identifiers of the items in the Jenkins queue. Only the identifiers are asked to Jenkins
+
+        :return: identifiers of the items in the queue, ``Set[int]``
+        :raises JenkinsException:
+        """
+        response = self.jenkins_open(
+            requests.Request("GET", self._build_url(QUEUE_ITEMS))
+        )
+        return {queue_item["id"] for queue_item in json.loads(response)["items"]}
+
+    def get_queue_item_state(self, number: int) -> Dict:
+        """
+        Get the state of a queue item. Only whether it was cancelled, why it is waiting and the number of its build are asked to Jenkins
+
+        :param number: number of the queue item, ``int``
+        :return: state of the queue item, ``Dict``
+        :raises JenkinsException:
+        """
+        try:
+            response = self.jenkins_open(
+                requests.Request("GET", self._build_url(QUEUE_ITEM_STATE, locals()))
+            )
+        except NotFoundException:
+            raise JenkinsException(f"queue item[{number}] does not exist")
+        return json.loads(response)
+
+    def get_build_console_progressive(
+        self, name: str, number: int, start: int = 0
+    ) -> Tuple[str, int, bool]:
+        """
+        Get the console output of a build starting at a byte offset
+
+        :param name: name of the pipeline, ``str``
+        :param number: number of the build, ``int``
+        :param start: byte offset of the console output from which to read, ``int``
+        :return: tuple with the new console output, the byte offset from which to read the next time and whether the build may still write more output, ``Tuple[str, int, bool]``
+        :raises JenkinsException:
+        """
+        folder_url, short_name = self._get_job_folder(name)
+        try:
+            response = self.jenkins_request(
+                requests.Request(
+                    "GET", self._build_url(BUILD_CONSOLE_PROGRESSIVE_TEXT, locals())
+                )
+            )
+        except (requests.exceptions.HTTPError, NotFoundException) as e:
+            if is_jenkins_unavailable(error=e):
+                raise
+            raise JenkinsException(f"job[{name}] number[{number}] does not exist")
+        response.encoding = "utf-8"
+        return (
+            response.text,
+            int(response.headers.get("X-Text-Size", start)),
+            response.headers.get("X-More-Data") == "true",
+        )
+
+    def build_job_with_file(
+        self,
+        name: str,
+        parameters: Dict,
+        file_parameter: str,
+        file_name: str,
+        file_content: str,
+        content_type: str = "text/yaml",
+    ) -> int:
+        """
+        Trigger a build of a pipeline that receives a file parameter. The file is sent from memory as a multipart body using the keep-alive session of the client, that also keeps the crumb of Jenkins
+
+        :param name: name of the pipeline, ``str``
+        :param parameters: parameters of the build, ``Dict``
+        :param file_parameter: name of the file parameter of the pipeline, ``str``
+        :param file_name: name of the uploaded file, ``str``
+        :param file_content: content of the uploaded file, ``str``
+        :param content_type: media type of the uploaded file, ``str``
+        :return: number of the queue item of the build, ``int``
+        :raises JenkinsException:
+        """
+        response = self.jenkins_request(
+            requests.Request(
+                "POST",
+                self.build_job_url(name, parameters),
+                files={
+                    file_parameter: (
+                        file_name,
+                        file_content.encode(encoding="utf-8"),
+                        content_type,
+                    )
+                },
+            )
+        )
+        location = response.headers.get("Location")
+        if not location:
+            raise EmptyResponseException(
+                f"Header 'Location' not found in response from server[{self.server}]"
+            )
+        return int(location.rstrip("/").split("/")[-1])
@@ -1,21 +1,68 @@
-from time import sleep
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Event, Lock
+from time import monotonic, sleep
 from typing import Dict, List, Tuple
 
-from jenkins import Jenkins
+from jenkins import JenkinsException, NotFoundException
+from requests import RequestException
 
 from conf.jenkins import JenkinsSettings
 from conf.tnlcm import TnlcmSettings
 from core.exceptions.exceptions import JenkinsError
+from core.jenkins.jenkins_client import (
+    QUEUE_INTERVAL,
+    get_jenkins_client,
+    is_jenkins_unavailable,
+    queue_watcher,
+)
 from core.library.library_handler import LibraryHandler
 from core.logs.log_handler import TrialNetworkLogger
+from core.models.jenkins_build_console import JenkinsBuildConsoleModel
+from core.models.jenkins_build_event import JenkinsBuildEventModel
+from core.models.jenkins_pipeline import JenkinsPipelineModel
+from core.models.job import JobModel
 from core.models.trial_network import TrialNetworkModel
-from core.utils.cli import run_command
-from core.utils.file import save_yaml_file
-from core.utils.os import (
-    TEMP_PATH,
-    join_path,
-    remove_file,
-)
+from core.utils.file import dumps_yaml
+
+BUILD_CONSOLE_INTERVAL = 10
+PIPELINES_CACHE_TTL = 300
+
+build_completion_events = {}
+build_completion_events_lock = Lock()
+site_semaphores = {}
+site_semaphores_lock = Lock()
+pipelines_cache = {}
+pipelines_cache_lock = Lock()
+
+
+def notify_build_completion(pipeline_name: str, build_number: int) -> None:
+    """
+    Wake up the threads of this process that are waiting for the completion of a build
+
+    :param pipeline_name: name of the pipeline, ``str``
+    :param build_number: number of the build, ``int``
+    """
+    with build_completion_events_lock:
+        build_completion_event = build_completion_events.get(
+            (pipeline_name, build_number)
+        )
+    if build_completion_event:
+        build_completion_event.set()
+
+
+def get_site_semaphore(deployment_site: str) -> BoundedSemaphore:
+    """
+    Get the semaphore that limits the number of builds running at the same time in a deployment site
+
+    :param deployment_site: trial network deployment site, ``str``
+    :return: semaphore of the deployment site, ``BoundedSemaphore``
+    """
+    with site_semaphores_lock:
+        if deployment_site not in site_semaphores:
+            site_semaphores[deployment_site] = BoundedSemaphore(
+                value=JenkinsSettings.JENKINS_MAX_PARALLEL_BUILDS_PER_SITE
+            )
+        return site_semaphores[deployment_site]
 
 
 class JenkinsHandler:
@@ -23,22 +70,28 @@ class JenkinsHandler:
         self,
         trial_network: TrialNetworkModel = None,
         library_handler: LibraryHandler = None,
+        max_parallel_builds: int = None,
+        job: JobModel = None,
     ) -> None:
         """
         Constructor
 
         :param trial_network: model of the trial network to be deployed, ``TrialNetworkModel``
         :param library_handler: Library handler, ``LibraryHandler``
+        :param max_parallel_builds: maximum number of entities of the trial network deployed at the same time, ``int``
+        :param job: job that runs the operation, used to report the progress of each entity, ``JobModel``
         :raises JenkinsError:
         """
         self.trial_network = trial_network
         self.library_handler = library_handler
-        self.jenkins_client = Jenkins(
-            url=JenkinsSettings.JENKINS_URL,
-            username=JenkinsSettings.JENKINS_USERNAME,
-            password=JenkinsSettings.JENKINS_PASSWORD,
-        )
-        self.jenkins_client.get_whoami()
+        self.max_parallel_builds = max_parallel_builds
+        self.job = job
+        if not max_parallel_builds or max_parallel_builds < 1:
+            self.max_parallel_builds = (
+                JenkinsSettings.JENKINS_MAX_PARALLEL_BUILDS_PER_TRIAL_NETWORK
+            )
+        self.trial_network_lock = Lock()
+        self.jenkins_client = get_jenkins_client()
 
     def clone_pipeline(self, old_name: str, new_name: str) -> Tuple[str, str]:
         """
@@ -49,8 +102,7 @@ class JenkinsHandler:
         :return: tuple with the name and URL of the new pipeline, ``Tuple[str, str]``
         :raises JenkinsError:
         """
-        pipelines = self.get_all_pipelines()
-        if old_name not in pipelines:
+        if not self.pipeline_exists(pipeline_name=old_name):
             raise JenkinsError(
                 message=f"Failed to create the new pipeline {new_name} using the old pipeline {old_name}. The old pipeline does not exist",
                 status_code=404,
@@ -59,16 +111,46 @@ class JenkinsHandler:
             self.jenkins_client.create_folder(
                 folder_name=JenkinsSettings.JENKINS_TNLCM_DIRECTORY
             )
-        if new_name not in pipelines:
-            config = self.jenkins_client.get_job_config(name=old_name)
-            config = config.replace(old_name, new_name)
-            config = config.replace(f"{new_name}.groovy", f"{old_name}.groovy")
-            self.jenkins_client.create_job(name=new_name, config_xml=config)
-        pipeline_url = self.jenkins_client.get_job_info(name=new_name)["url"].replace(
+            self.set_pipeline_exists(
+                pipeline_name=JenkinsSettings.JENKINS_TNLCM_DIRECTORY, exists=True
+            )
+        jenkins_pipeline = JenkinsPipelineModel.objects(name=new_name).first()
+        if self.pipeline_exists(pipeline_name=new_name):
+            if jenkins_pipeline:
+                return new_name, jenkins_pipeline.url
+        else:
+            self.create_pipeline(old_name=old_name, new_name=new_name)
+        try:
+            job_state = self.jenkins_client.get_job_state(name=new_name)
+        except NotFoundException:
+            self.set_pipeline_exists(pipeline_name=new_name, exists=False)
+            self.create_pipeline(old_name=old_name, new_name=new_name)
+            job_state = self.jenkins_client.get_job_state(name=new_name)
+        pipeline_url = job_state["url"].replace(
             "http://localhost:8080", JenkinsSettings.JENKINS_URL
         )
+        JenkinsPipelineModel.objects(name=new_name).update_one(
+            set__url=pipeline_url,
+            set__base_pipeline=old_name,
+            set__tn_id=self.trial_network.tn_id if self.trial_network else None,
+            upsert=True,
+        )
         return new_name, pipeline_url
 
+    def create_pipeline(self, old_name: str, new_name: str) -> None:
+        """
+        Create a pipeline in Jenkins with the configuration of another pipeline
+
+        :param old_name: name of the pipeline whose configuration is copied, ``str``
+        :param new_name: name of the new pipeline, ``str``
+        :raises JenkinsException:
+        """
+        config = self.jenkins_client.get_job_config(name=old_name)
+        config = config.replace(old_name, new_name)
+        config = config.replace(f"{new_name}.groovy", f"{old_name}.groovy")
+        self.jenkins_client.create_job(name=new_name, config_xml=config)
+        self.set_pipeline_exists(pipeline_name=new_name, exists=True)
+
     def deploy_pipeline_params(
         self, component_type: str, custom_name: str, debug: str
     ) -> Dict:
@@ -104,146 +186,315 @@ class JenkinsHandler:
             )
         return parameters
 
-    def deploy_trial_network(self) -> None:
+    def deploy_entity(
+        self, jenkins_deploy_pipeline: str, entity_name: str, entity_data: Dict
+    ) -> None:
         """
-        Trial network deploy
+        Deploy one entity of the trial network and wait until its build finishes
 
+        :param jenkins_deploy_pipeline: name of the deployment pipeline, ``str``
+        :param entity_name: name of the entity to be deployed, ``str``
+        :param entity_data: definition of the entity in the descriptor, ``Dict``
         :raises JenkinsError:
         """
-        jenkins_deploy_pipeline = self.trial_network.get_jenkins_deploy_pipeline()
-        if self.jenkins_client.get_job_info(name=jenkins_deploy_pipeline)["inQueue"]:
+        component_type = entity_data["type"]
+        custom_name = None
+        if "name" in entity_data:
+            custom_name = entity_data["name"]
+        debug = False
+        if "debug" in entity_data:
+            debug = entity_data["debug"]
+        entity_data_input = entity_data["input"]
+        entity_input_file = dumps_yaml(data=entity_data_input)
+        build_params = self.deploy_pipeline_params(
+            component_type=component_type, custom_name=custom_name, debug=debug
+        )
+        with get_site_semaphore(deployment_site=self.trial_network.deployment_site):
+            self.set_entity_state(entity_name=entity_name, state="deploying")
+            self.jenkins_client.check_available()
+            try:
+                queue_item = self.jenkins_client.build_job_with_file(
+                    name=jenkins_deploy_pipeline,
+                    parameters=build_params,
+                    file_parameter="FILE",
+                    file_name=f"{self.trial_network.tn_id}_{entity_name}_input.yaml",
+                    file_content=entity_input_file,
+                )
+            except (JenkinsException, RequestException) as e:
+                raise JenkinsError(
+                    message=f"Error in the response received by Jenkins when trying to deploy the {entity_name} entity. Error received: {e}",
+                    status_code=500,
+                )
+            TrialNetworkLogger(tn_id=self.trial_network.tn_id).info(
+                message=f"Start deployment of entity {entity_name} in {self.trial_network.deployment_site} site",
+                section=entity_name,
+            )
+            build_number = self.wait_build_start(queue_item=queue_item)
+            TrialNetworkLogger(tn_id=self.trial_network.tn_id).info(
+                message=f"Deploying {entity_name} entity in {self.trial_network.deployment_site} site using the build {build_number}",
+                section=entity_name,
+            )
+            build_result, build_console_output = self.wait_build_completion(
+                pipeline_name=jenkins_deploy_pipeline,
+                build_number=build_number,
+                build_description=f"the entity {entity_name}",
+                log_section=entity_name,
+            )
+        build_console_output = (
+            f"Pipeline response for the deployment of the entity {entity_name} in {self.trial_network.deployment_site} site\n"
+            "------------------------------------------------------------------------------------------------------------------\n"
+            f"{build_console_output}"
+            "------------------------------------------------------------------------------------------------------------------"
+        )
+        TrialNetworkLogger(tn_id=self.trial_network.tn_id).info(
+            message=f"Pipeline response for the deployment of the entity {entity_name} in {self.trial_network.deployment_site} site: {build_result}",
+            section=entity_name,
+        )
+        if build_result != "SUCCESS":
             raise JenkinsError(
-                message=f"The indicated pipeline {jenkins_deploy_pipeline} is in use and is not available to deploy trial networks",
+                message=(f"{build_console_output}"),
                 status_code=500,
             )
+        build_console_id = self.save_build_console(
+            build_name=entity_name,
+            pipeline_name=jenkins_deploy_pipeline,
+            build_number=build_number,
+            build_console=build_console_output,
+        )
+        with self.trial_network_lock:
+            self.trial_network.save_jenkins_deploy_build(
+                build_name=entity_name,
+                build_number=build_number,
+                build_params=build_params,
+                build_console_id=build_console_id,
+                build_file=entity_data_input,
+            )
+        self.set_entity_state(entity_name=entity_name, state="deployed")
+
+    def deploy_trial_network(self) -> None:
+        """
+        Trial network deploy. The entities are deployed in waves following the dependencies of the descriptor, and the entities of the same wave are deployed concurrently
+
+        :raises JenkinsError:
+        """
+        jenkins_deploy_pipeline = self.trial_network.get_jenkins_deploy_pipeline()
         deployed_descriptor = self.trial_network.to_mongo()["deployed_descriptor"][
             "trial_network"
         ]
-        deployed_descriptor_copy = deployed_descriptor.copy()
-        for entity_name, entity_data in deployed_descriptor_copy.items():
-            component_type = entity_data["type"]
-            custom_name = None
-            if "name" in entity_data:
-                custom_name = entity_data["name"]
-            debug = False
-            if "debug" in entity_data:
-                debug = entity_data["debug"]
-            entity_data_input = entity_data["input"]
-            entity_input_file_path = join_path(
-                TEMP_PATH,
-                f"{self.trial_network.tn_id}_{entity_name}_input.yaml",
-            )
-            save_yaml_file(data=entity_data_input, file_path=entity_input_file_path)
-            build_params = self.deploy_pipeline_params(
-                component_type=component_type, custom_name=custom_name, debug=debug
-            )
-            build_job_url = self.jenkins_client.build_job_url(
-                name=jenkins_deploy_pipeline,
-                parameters=build_params,
-            )
-            next_build_number = self.jenkins_client.get_job_info(
-                name=jenkins_deploy_pipeline
-            )["nextBuildNumber"]
-            stdout, stderr, rc = run_command(
-                command=f'curl -w "%{{http_code}}" -X POST "{build_job_url}" -u "{JenkinsSettings.JENKINS_USERNAME}:{JenkinsSettings.JENKINS_TOKEN}" -F "FILE=@{entity_input_file_path};type=text/yaml"'
-            )
-            remove_file(path=entity_input_file_path)
+        for entity_name in deployed_descriptor:
+            self.set_entity_state(entity_name=entity_name, state="pending")
+        for wave in self.trial_network.get_deployment_waves():
             TrialNetworkLogger(tn_id=self.trial_network.tn_id).info(
-                message=f"Start deployment of entity {entity_name} in {self.trial_network.deployment_site} site"
+                message=f"Start deployment of the entities {', '.join(wave)}"
             )
-            _, status_code = stdout[:-3].strip(), stdout[-3:]
-            if status_code != "201":
-                raise JenkinsError(
-                    message=f"Error in the response received by Jenkins when trying to deploy the {entity_name} entity. Error received: {stderr}. Return code: {rc}",
-                    status_code=status_code,
-                )
-            while (
-                not self.jenkins_client.get_job_info(name=jenkins_deploy_pipeline)[
-                    "lastBuild"
-                ]
-                or next_build_number
-                != self.jenkins_client.get_job_info(name=jenkins_deploy_pipeline)[
-                    "lastBuild"
-                ]["number"]
-            ):
-                sleep(5)
-            build_console_num_lines_aux = 0
-            while not self.jenkins_client.get_job_info(name=jenkins_deploy_pipeline)[
-                "lastCompletedBuild"
-            ]:
-                build_console_output = self.jenkins_client.get_build_console_output(
-                    name=jenkins_deploy_pipeline, number=next_build_number
-                )
-                build_console_output = (
-                    f"Deploying {entity_name} entity in {self.trial_network.deployment_site} site\n"
-                    "------------------------------------------------------------------------------------------------------------------\n"
-                    f"{build_console_output}"
-                    "------------------------------------------------------------------------------------------------------------------"
-                )
-                build_console_num_lines = build_console_output.count("\n")
-                TrialNetworkLogger(tn_id=self.trial_network.tn_id).info(
-                    message=build_console_output,
-                    lines_to_remove=build_console_num_lines_aux,
-                )
-                build_console_num_lines_aux = build_console_num_lines
-                sleep(10)
-            while (
-                next_build_number
-                != self.jenkins_client.get_job_info(name=jenkins_deploy_pipeline)[
-                    "lastCompletedBuild"
-                ]["number"]
-            ):
-                build_console_output = self.jenkins_client.get_build_console_output(
-                    name=jenkins_deploy_pipeline, number=next_build_number
-                )
-                build_console_output = (
-                    f"Deploying {entity_name} entity in {self.trial_network.deployment_site} site\n"
-                    "------------------------------------------------------------------------------------------------------------------\n"
-                    f"{build_console_output}"
-                    "------------------------------------------------------------------------------------------------------------------"
+            with ThreadPoolExecutor(
+                max_workers=min(len(wave), self.max_parallel_builds)
+            ) as executor:
+                futures = {
+                    entity_name: executor.submit(
+                        self.deploy_entity,
+                        jenkins_deploy_pipeline,
+                        entity_name,
+                        deployed_descriptor[entity_name],
+                    )
+                    for entity_name in wave
+                }
+            errors = []
+            for entity_name, future in futures.items():
+                if future.exception():
+                    self.set_entity_state(entity_name=entity_name, state="failed")
+                    TrialNetworkLogger(tn_id=self.trial_network.tn_id).error(
+                        message=f"Deployment of the entity {entity_name} failed"
+                    )
+                    errors.append(future.exception())
+            if errors:
+                raise errors[0]
+        self.trial_network.set_deployed_descriptor()
+
+    def resume_trial_network(self) -> None:
+        """
+        Prepare the resume of a failed activation. The builds recorded for the deployed entities are verified against Jenkins with one request, and only the entities without a successful build and the entities that depend on them are deployed again
+
+        :raises JenkinsException:
+        """
+        jenkins_deploy_pipeline = self.trial_network.get_jenkins_deploy_pipeline()
+        builds_state = self.jenkins_client.get_builds_state(
+            name=jenkins_deploy_pipeline
+        )
+        failed_builds = []
+        for build_name, build in self.trial_network.jenkins_deploy["builds"].items():
+            build_state = builds_state.get(int(build["build_number"]))
+            if not build_state or build_state["result"] != "SUCCESS":
+                failed_builds.append(build_name)
+                TrialNetworkLogger(tn_id=self.trial_network.tn_id).warning(
+                    message=f"Build {build['build_number']} of the entity {build_name} is not a successful build of the pipeline {jenkins_deploy_pipeline}. The entity is deployed again",
+                    section=build_name,
                 )
-                build_console_num_lines = build_console_output.count("\n")
-                TrialNetworkLogger(tn_id=self.trial_network.tn_id).info(
-                    message=build_console_output,
-                    lines_to_remove=build_console_num_lines_aux,
+        self.trial_network.resume_deployed_descriptor(failed_builds=failed_builds)
+        for build_name in self.trial_network.jenkins_deploy["builds"]:
+            self.set_entity_state(entity_name=build_name, state="deployed")
+        TrialNetworkLogger(tn_id=self.trial_network.tn_id).info(
+            message=f"Resume activation deploying the entities {', '.join(self.trial_network.deployed_descriptor['trial_network']) or 'none'}"
+        )
+
+    def set_entity_state(self, entity_name: str, state: str) -> None:
+        """
+        Report the state of an entity to the job that runs the operation, if any
+
+        :param entity_name: name of the entity, ``str``
+        :param state: state of the entity, ``str``
+        """
+        if self.job:
+            self.job.set_entity_state(entity_name=entity_name, state=state)
+
+    def wait_jenkins_available(self, error: Exception, log_section: str = None) -> None:
+        """
+        Back off for JENKINS_UNAVAILABLE_INTERVAL seconds when Jenkins does not answer while waiting for a build. The build keeps running in Jenkins, so it is not failed and the wait is retried afterwards
+
+        :param error: error received when sending a request to Jenkins, ``Exception``
+        :param log_section: section of the trial network log where the back-off is written, ``str``
+        :raises JenkinsException: if the error does not mean that Jenkins is unavailable
+        """
+        if not is_jenkins_unavailable(error=error):
+            raise error
+        TrialNetworkLogger(tn_id=self.trial_network.tn_id).warning(
+            message=f"Jenkins is not available. Retry in {JenkinsSettings.JENKINS_UNAVAILABLE_INTERVAL} seconds. Error received: {error}",
+            section=log_section,
+        )
+        sleep(JenkinsSettings.JENKINS_UNAVAILABLE_INTERVAL)
+
+    def wait_build_start(self, queue_item: int) -> int:
+        """
+        Wait until Jenkins starts the build of a queue item and return the number of the build. The build is tracked through the queue item returned when it was triggered, so several builds of the same pipeline can be started at the same time
+
+        :param queue_item: number of the queue item of the build, ``int``
+        :return: number of the build, ``int``
+        :raises JenkinsError:
+        """
+        while True:
+            try:
+                build_number = queue_watcher.get_build_number(
+                    jenkins_client=self.jenkins_client, queue_item=queue_item
                 )
-                build_console_num_lines_aux = build_console_num_lines
-                sleep(10)
-            build_console_output = self.jenkins_client.get_build_console_output(
-                name=jenkins_deploy_pipeline, number=next_build_number
-            )
-            build_console_output = (
-                f"Pipeline response for the deployment of the entity {entity_name} in {self.trial_network.deployment_site} site\n"
-                "------------------------------------------------------------------------------------------------------------------\n"
-                f"{build_console_output}"
-                "------------------------------------------------------------------------------------------------------------------"
-            )
-            TrialNetworkLogger(tn_id=self.trial_network.tn_id).info(
-                message=build_console_output,
-                lines_to_remove=build_console_num_lines_aux,
+            except (JenkinsException, RequestException) as e:
+                self.wait_jenkins_available(error=e)
+                continue
+            if build_number is not None:
+                return build_number
+            sleep(QUEUE_INTERVAL)
+
+    def wait_build_completion(
+        self,
+        pipeline_name: str,
+        build_number: int,
+        build_description: str,
+        log_section: str,
+    ) -> Tuple[str, str]:
+        """
+        Wait until a build finishes and return its result and console output. The completion is notified by Jenkins through the callback, and Jenkins is only asked for the build every JENKINS_POLL_INTERVAL seconds in case the notification is lost. The notification of the build is deleted once its result is known, whichever way it was obtained. Meanwhile, the new console output of the build is appended to the trial network log
+
+        :param pipeline_name: name of the pipeline, ``str``
+        :param build_number: number of the build, ``int``
+        :param build_description: description of what the build does, used in the trial network log, ``str``
+        :param log_section: section of the trial network log where the console output is written, ``str``
+        :return: tuple with the result and the console output of the build, ``Tuple[str, str]``
+        """
+        build_completion_event = Event()
+        with build_completion_events_lock:
+            build_completion_events[(pipeline_name, build_number)] = (
+                build_completion_event
             )
-            if (
-                self.jenkins_client.get_job_info(name=jenkins_deploy_pipeline)[
-                    "lastSuccessfulBuild"
-                ]["number"]
-                != next_build_number
-            ):
-                raise JenkinsError(
-                    message=(f"{build_console_output}"),
-                    status_code=500,
+        build_console_chunks = []
+        try:
+            build_console_offset = 0
+            build_result = None
+            last_poll = monotonic()
+            while not build_result:
+                try:
+                    build_console_offset, _ = self.log_build_console(
+                        pipeline_name=pipeline_name,
+                        build_number=build_number,
+                        build_description=build_description,
+                        log_section=log_section,
+                        build_console_chunks=build_console_chunks,
+                        build_console_offset=build_console_offset,
+                    )
+                except (JenkinsException, RequestException) as e:
+                    self.wait_jenkins_available(error=e, log_section=log_section)
+                    continue
+                build_event = JenkinsBuildEventModel.objects(
+                    pipeline_name=pipeline_name, build_number=build_number
+                ).first()
+                if build_event:
+                    build_result = build_event.result
+                    build_event.delete()
+                elif monotonic() - last_poll >= JenkinsSettings.JENKINS_POLL_INTERVAL:
+                    last_poll = monotonic()
+                    try:
+                        build_result = self.jenkins_client.get_build_state(
+                            name=pipeline_name, number=build_number
+                        )["result"]
+                    except (JenkinsException, RequestException) as e:
+                        self.wait_jenkins_available(error=e, log_section=log_section)
+                    if build_result:
+                        JenkinsBuildEventModel.objects(
+                            pipeline_name=pipeline_name, build_number=build_number
+                        ).delete()
+                else:
+                    build_completion_event.wait(timeout=BUILD_CONSOLE_INTERVAL)
+        finally:
+            with build_completion_events_lock:
+                build_completion_events.pop((pipeline_name, build_number), None)
+        build_console_more_data = True
+        while build_console_more_data:
+            try:
+                build_console_offset, build_console_more_data = self.log_build_console(
+                    pipeline_name=pipeline_name,
+                    build_number=build_number,
+                    build_description=build_description,
+                    log_section=log_section,
+                    build_console_chunks=build_console_chunks,
+                    build_console_offset=build_console_offset,
                 )
-            self.trial_network.set_jenkins_deploy_build(
-                build_name=entity_name,
-                build_number=next_build_number,
-                build_params=build_params,
-                build_console=build_console_output,
-                build_file=entity_data_input,
+            except (JenkinsException, RequestException) as e:
+                self.wait_jenkins_available(error=e, log_section=log_section)
+                continue
+            if build_console_more_data:
+                sleep(1)
+        return build_result, "".join(build_console_chunks)
+
+    def log_build_console(
+        self,
+        pipeline_name: str,
+        build_number: int,
+        build_description: str,
+        log_section: str,
+        build_console_chunks: List[str],
+        build_console_offset: int,
+    ) -> Tuple[int, bool]:
+        """
+        Fetch the console output of a build written since the given byte offset, append it to the trial network log and to the list of chunks of the console output
+
+        :param pipeline_name: name of the pipeline, ``str``
+        :param build_number: number of the build, ``int``
+        :param build_description: description of what the build does, ``str``
+        :param log_section: section of the trial network log where the console output is written, ``str``
+        :param build_console_chunks: chunks of the console output already fetched, ``List[str]``
+        :param build_console_offset: byte offset of the console output already fetched, ``int``
+        :return: tuple with the new byte offset and whether the build may still write more output, ``Tuple[int, bool]``
+        """
+        build_console_output, build_console_offset, build_console_more_data = (
+            self.jenkins_client.get_build_console_progressive(
+                name=pipeline_name, number=build_number, start=build_console_offset
             )
-            del deployed_descriptor[entity_name]
-            self.trial_network.set_deployed_descriptor(
-                deployed_descriptor=deployed_descriptor
+        )
+        if build_console_output:
+            build_console_chunks.append(build_console_output)
+            TrialNetworkLogger(tn_id=self.trial_network.tn_id).info(
+                message=f"Console output of {build_description}\n{build_console_output}",
+                section=log_section,
             )
-            self.trial_network.save()
+        return build_console_offset, build_console_more_data
 
     def destroy_pipeline_params(self) -> Dict:
         """
@@ -284,74 +535,19 @@ class JenkinsHandler:
         :raises JenkinsError:
         """
         jenkins_destroy_pipeline = self.trial_network.get_jenkins_destroy_pipeline()
-        if self.jenkins_client.get_job_info(name=jenkins_destroy_pipeline)["inQueue"]:
-            raise JenkinsError(
-                message=f"The indicated pipeline {jenkins_destroy_pipeline} is in use and is not available to destroy trial networks",
-                status_code=500,
-            )
-        next_build_number = self.jenkins_client.get_job_info(
-            name=jenkins_destroy_pipeline
-        )["nextBuildNumber"]
         build_params = self.destroy_pipeline_params()
-        self.jenkins_client.build_job(
+        self.jenkins_client.check_available()
+        queue_item = self.jenkins_client.build_job(
             name=jenkins_destroy_pipeline,
             parameters=build_params,
             token=JenkinsSettings.JENKINS_TOKEN,
         )
-        while (
-            not self.jenkins_client.get_job_info(name=jenkins_destroy_pipeline)[
-                "lastBuild"
-            ]
-            or next_build_number
-            != self.jenkins_client.get_job_info(name=jenkins_destroy_pipeline)[
-                "lastBuild"
-            ]["number"]
-        ):
-            sleep(5)
-        build_console_num_lines_aux = 0
-        while not self.jenkins_client.get_job_info(name=jenkins_destroy_pipeline)[
-            "lastCompletedBuild"
-        ]:
-            build_console_output = self.jenkins_client.get_build_console_output(
-                name=jenkins_destroy_pipeline, number=next_build_number
-            )
-            build_console_output = (
-                f"Destroying trial network in {self.trial_network.deployment_site} site\n"
-                "------------------------------------------------------------------------------------------------------------------\n"
-                f"{build_console_output}"
-                "------------------------------------------------------------------------------------------------------------------"
-            )
-            build_console_num_lines = build_console_output.count("\n")
-            TrialNetworkLogger(tn_id=self.trial_network.tn_id).info(
-                message=build_console_output,
-                lines_to_remove=build_console_num_lines_aux,
-            )
-            build_console_num_lines_aux = build_console_num_lines
-            sleep(10)
-        while (
-            next_build_number
-            != self.jenkins_client.get_job_info(name=jenkins_destroy_pipeline)[
-                "lastCompletedBuild"
-            ]["number"]
-        ):
-            build_console_output = self.jenkins_client.get_build_console_output(
-                name=jenkins_destroy_pipeline, number=next_build_number
-            )
-            build_console_output = (
-                f"Destroying trial network in {self.trial_network.deployment_site} site\n"
-                "------------------------------------------------------------------------------------------------------------------\n"
-                f"{build_console_output}"
-                "------------------------------------------------------------------------------------------------------------------"
-            )
-            build_console_num_lines = build_console_output.count("\n")
-            TrialNetworkLogger(tn_id=self.trial_network.tn_id).info(
-                message=build_console_output,
-                lines_to_remove=build_console_num_lines_aux,
-            )
-            build_console_num_lines_aux = build_console_num_lines
-            sleep(10)
-        build_console_output = self.jenkins_client.get_build_console_output(
-            name=jenkins_destroy_pipeline, number=next_build_number
+        build_number = self.wait_build_start(queue_item=queue_item)
+        build_result, build_console_output = self.wait_build_completion(
+            pipeline_name=jenkins_destroy_pipeline,
+            build_number=build_number,
+            build_description=f"the destroy of trial network in {self.trial_network.deployment_site} site",
+            log_section="destroy",
         )
         build_console_output = (
             f"Pipeline response for the destroy of trial network in {self.trial_network.deployment_site} site\n"
@@ -359,38 +555,80 @@ class JenkinsHandler:
             f"{build_console_output}"
             "------------------------------------------------------------------------------------------------------------------"
         )
-        if (
-            self.jenkins_client.get_job_info(name=jenkins_destroy_pipeline)[
-                "lastSuccessfulBuild"
-            ]["number"]
-            != next_build_number
-        ):
+        TrialNetworkLogger(tn_id=self.trial_network.tn_id).info(
+            message=f"Pipeline response for the destroy of trial network in {self.trial_network.deployment_site} site: {build_result}",
+            section="destroy",
+        )
+        if build_result != "SUCCESS":
             raise JenkinsError(
                 message=(f"{build_console_output}"),
                 status_code=500,
             )
-        TrialNetworkLogger(tn_id=self.trial_network.tn_id).info(
-            message=build_console_output,
-            lines_to_remove=build_console_num_lines_aux,
+        build_console_id = self.save_build_console(
+            build_name="destroy",
+            pipeline_name=jenkins_destroy_pipeline,
+            build_number=build_number,
+            build_console=build_console_output,
         )
-        self.trial_network.set_jenkins_destroy_build(
-            build_number=str(next_build_number),
+        self.trial_network.save_jenkins_destroy_build(
+            build_number=str(build_number),
             build_params=build_params,
-            build_console=build_console_output,
+            build_console_id=build_console_id,
         )
-        self.trial_network.save()
 
-    def get_all_pipelines(self) -> List[str]:
+    def save_build_console(
+        self,
+        build_name: str,
+        pipeline_name: str,
+        build_number: int,
+        build_console: str,
+    ) -> str:
         """
-        Function to get all the pipelines stored in Jenkins
+        Function to store the console output of a build outside the trial network document
 
-        :return: list with pipelines stored in Jenkins, ``List[str]``
+        :param build_name: name of the entity deployed by the build or destroy, ``str``
+        :param pipeline_name: name of the pipeline, ``str``
+        :param build_number: number of the build, ``int``
+        :param build_console: console output of the build, ``str``
+        :return: identifier of the stored console output, ``str``
         """
-        return [
-            job["fullname"]
-            for job in self.jenkins_client.get_all_jobs()
-            if "fullname" in job and "jobs" not in job
-        ]
+        jenkins_build_console = JenkinsBuildConsoleModel(
+            tn_id=self.trial_network.tn_id,
+            build_name=build_name,
+            pipeline_name=pipeline_name,
+            build_number=build_number,
+        )
+        jenkins_build_console.set_console(console=build_console)
+        jenkins_build_console.save()
+        return str(jenkins_build_console.id)
+
+    def pipeline_exists(self, pipeline_name: str) -> bool:
+        """
+        Check if a pipeline or folder exists in Jenkins. Only the requested job is queried and, if it exists, the answer is cached for PIPELINES_CACHE_TTL seconds. A missing pipeline is not cached, so a pipeline created by another process is found at once
+
+        :param pipeline_name: full name of the pipeline or folder, ``str``
+        :return: True if the pipeline exists, False otherwise, ``bool``
+        """
+        with pipelines_cache_lock:
+            expires_at = pipelines_cache.get(pipeline_name)
+        if expires_at and expires_at > monotonic():
+            return True
+        exists = bool(self.jenkins_client.job_exists(name=pipeline_name))
+        self.set_pipeline_exists(pipeline_name=pipeline_name, exists=exists)
+        return exists
+
+    def set_pipeline_exists(self, pipeline_name: str, exists: bool) -> None:
+        """
+        Update the cached existence of a pipeline or folder after creating or deleting it
+
+        :param pipeline_name: full name of the pipeline or folder, ``str``
+        :param exists: whether the pipeline exists, ``bool``
+        """
+        with pipelines_cache_lock:
+            if exists:
+                pipelines_cache[pipeline_name] = monotonic() + PIPELINES_CACHE_TTL
+            else:
+                pipelines_cache.pop(pipeline_name, None)
 
     def is_tnlcm_dir(self) -> bool:
         """
@@ -398,9 +636,8 @@ class JenkinsHandler:
 
         :return: True if directory exists, False otherwise, ``bool``
         """
-        return any(
-            job["name"] == JenkinsSettings.JENKINS_TNLCM_DIRECTORY
-            for job in self.jenkins_client.get_jobs(folder_depth=0)
+        return self.pipeline_exists(
+            pipeline_name=JenkinsSettings.JENKINS_TNLCM_DIRECTORY
         )
 
     def remove_pipeline(self, pipeline_name: str) -> None:
@@ -410,11 +647,16 @@ class JenkinsHandler:
         :param pipeline_name: name of pipeline, ``str``
         """
         if (
-            pipeline_name in self.get_all_pipelines()
+            pipeline_name
             and pipeline_name != JenkinsSettings.JENKINS_DEPLOY_PIPELINE
             and pipeline_name != JenkinsSettings.JENKINS_DESTROY_PIPELINE
         ):
-            self.jenkins_client.delete_job(name=pipeline_name)
+            try:
+                self.jenkins_client.delete_job(name=pipeline_name)
+            except NotFoundException:
+                pass
+            self.set_pipeline_exists(pipeline_name=pipeline_name, exists=False)
+            JenkinsPipelineModel.objects(name=pipeline_name).delete()
 
     # FEATURE: deploy component
     # def deploy_component(
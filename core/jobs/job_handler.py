@@ -0,0 +1,315 @@
+from datetime import datetime, timedelta, timezone
+from os import getpid
+from socket import gethostname
+from threading import Event, Lock, Thread
+from time import sleep
+from typing import Dict
+
+from conf.jenkins import JenkinsSettings
+from conf.tnlcm import TnlcmSettings
+from core.exceptions.exceptions import CustomException
+from core.jenkins.jenkins_handler import JenkinsHandler
+from core.library.library_handler import LibraryHandler
+from core.logs.log_handler import TrialNetworkLogger, console_logger
+from core.models.job import JobModel
+from core.models.resource_manager import ResourceManagerModel
+from core.models.trial_network import TrialNetworkModel
+from core.sites.sites_handler import SitesHandler
+
+JOB_HEARTBEAT_INTERVAL = 30
+JOB_POLL_INTERVAL = 5
+
+
+class JobHandler:
+    def __init__(self) -> None:
+        """
+        Constructor
+        """
+        self.worker = None
+        self.job_available = Event()
+        self.started = False
+        self.started_lock = Lock()
+
+    def start(self) -> None:
+        """
+        Start the threads of this process that run the queued jobs and keep the heartbeat of the running ones
+        """
+        with self.started_lock:
+            if self.started:
+                return
+            self.started = True
+            self.worker = f"{gethostname()}:{getpid()}"
+        for number in range(TnlcmSettings.TNLCM_JOB_WORKERS):
+            Thread(
+                target=self.run_jobs, name=f"tnlcm-job-worker-{number}", daemon=True
+            ).start()
+        Thread(
+            target=self.keep_heartbeat, name="tnlcm-job-heartbeat", daemon=True
+        ).start()
+        console_logger.info(
+            message=f"Start {TnlcmSettings.TNLCM_JOB_WORKERS} job workers in {self.worker}"
+        )
+
+    def submit(
+        self, tn_id: str, user_created: str, operation: str, parameters: Dict
+    ) -> JobModel:
+        """
+        Queue a job
+
+        :param tn_id: trial network identifier, ``str``
+        :param user_created: user that submits the job, ``str``
+        :param operation: operation run by the job, ``str``
+        :param parameters: parameters of the operation, ``Dict``
+        :return: queued job, ``JobModel``
+        :raise JobError:
+        """
+        job = JobModel(tn_id=tn_id, user_created=user_created, parameters=parameters)
+        job.set_operation(operation=operation)
+        job.save()
+        self.job_available.set()
+        return job
+
+    def claim_job(self) -> JobModel:
+        """
+        Atomically take the oldest queued job, so each job is run by only one worker
+
+        :return: claimed job or None if there are no queued jobs, ``JobModel``
+        """
+        now = datetime.now(timezone.utc)
+        return (
+            JobModel.objects(state="queued")
+            .order_by("date_created_utc")
+            .modify(
+                set__state="running",
+                set__worker=self.worker,
+                set__date_started_utc=now,
+                set__date_heartbeat_utc=now,
+                new=True,
+            )
+        )
+
+    def run_jobs(self) -> None:
+        """
+        Loop of a worker thread
+        """
+        while True:
+            try:
+                job = self.claim_job()
+                if not job:
+                    self.job_available.wait(timeout=JOB_POLL_INTERVAL)
+                    self.job_available.clear()
+                    continue
+                self.run_job(job=job)
+            except Exception as e:
+                console_logger.error(message=f"Error in the job worker: {e}")
+
+    def run_job(self, job: JobModel) -> None:
+        """
+        Run a claimed job
+
+        :param job: job to be run, ``JobModel``
+        """
+        trial_network = TrialNetworkModel.objects(tn_id=job.tn_id).first()
+        if not trial_network:
+            job.finish(
+                state="failed",
+                message=f"No trial network with identifier {job.tn_id} in database",
+            )
+            return
+        if job.operation == "activate":
+            self.activate_trial_network(job=job, trial_network=trial_network)
+        else:
+            self.destroy_trial_network(job=job, trial_network=trial_network)
+
+    def activate_trial_network(
+        self, job: JobModel, trial_network: TrialNetworkModel
+    ) -> None:
+        """
+        Activate a trial network whose state has already been set to activating. When the job resumes a failed activation, the pipeline and the builds of the entities already deployed are kept and only the rest of the entities are deployed
+
+        :param job: activation job, ``JobModel``
+        :param trial_network: model of the trial network, ``TrialNetworkModel``
+        """
+        tn_id = trial_network.tn_id
+        try:
+            jenkins_deploy_pipeline = job.parameters.get("jenkins_deploy_pipeline")
+            jenkins_deploy_pipeline_url = None
+            resume = job.parameters.get("resume")
+            jenkins_handler = JenkinsHandler(
+                trial_network=trial_network,
+                max_parallel_builds=job.parameters.get("max_parallel_builds"),
+                job=job,
+            )
+            if not jenkins_deploy_pipeline and not resume:
+                jenkins_deploy_pipeline, jenkins_deploy_pipeline_url = (
+                    jenkins_handler.clone_pipeline(
+                        old_name=JenkinsSettings.JENKINS_DEPLOY_PIPELINE,
+                        new_name=JenkinsSettings.JENKINS_TNLCM_DIRECTORY
+                        + "/"
+                        + JenkinsSettings.JENKINS_DEPLOY_PIPELINE
+                        + "_"
+                        + tn_id,
+                    )
+                )
+            if not trial_network.resource_manager:
+                sites_handler = SitesHandler(
+                    https_url=trial_network.sites_https_url,
+                    reference_type="commit",
+                    reference_value=trial_network.sites_commit_id,
+                    directory_path=trial_network.directory_path,
+                )
+                site_available_components = sites_handler.get_site_available_components(
+                    deployment_site=trial_network.deployment_site
+                )
+                resource_manager = ResourceManagerModel()
+                resource_manager.apply_resource_manager(
+                    trial_network=trial_network,
+                    site_available_components=site_available_components,
+                )
+            if resume:
+                jenkins_handler.resume_trial_network()
+            else:
+                trial_network.set_jenkins_deploy_pipeline(
+                    jenkins_deploy_pipeline=jenkins_deploy_pipeline,
+                    jenkins_deploy_pipeline_url=jenkins_deploy_pipeline_url,
+                )
+            trial_network.save()
+            TrialNetworkLogger(tn_id=tn_id).info(
+                message="Trial network activating. In this transition, the trial network proceeds to the deployment of the components defined in the descriptor"
+            )
+            jenkins_handler.deploy_trial_network()
+            trial_network.set_state(state="activated")
+            trial_network.save()
+            TrialNetworkLogger(tn_id=tn_id).info(
+                message="Trial network activated. In this state, the trial network has been deployed and is ready to be used"
+            )
+            job.finish(
+                state="succeeded",
+                message=f"Trial network with identifier {tn_id} activated. The trial network deployment generates a report file showing the information of the components that have been deployed",
+            )
+        except Exception as e:
+            trial_network.set_state(state="failed-activation")
+            trial_network.save()
+            TrialNetworkLogger(tn_id=tn_id).info(
+                message="Trial network failed-activation. In this state, the trial network is waiting to be deployed"
+            )
+            job.finish(
+                state="failed",
+                message=str(e.message) if isinstance(e, CustomException) else str(e),
+            )
+
+    def destroy_trial_network(
+        self, job: JobModel, trial_network: TrialNetworkModel
+    ) -> None:
+        """
+        Destroy a trial network whose state has already been set to destroying
+
+        :param job: destruction job, ``JobModel``
+        :param trial_network: model of the trial network, ``TrialNetworkModel``
+        """
+        tn_id = trial_network.tn_id
+        try:
+            jenkins_destroy_pipeline = job.parameters.get("jenkins_destroy_pipeline")
+            jenkins_destroy_pipeline_url = None
+            library_handler = LibraryHandler(
+                https_url=trial_network.library_https_url,
+                reference_type="commit",
+                reference_value=trial_network.library_commit_id,
+                directory_path=trial_network.directory_path,
+            )
+            jenkins_handler = JenkinsHandler(
+                trial_network=trial_network, library_handler=library_handler, job=job
+            )
+            if not jenkins_destroy_pipeline:
+                jenkins_destroy_pipeline, jenkins_destroy_pipeline_url = (
+                    jenkins_handler.clone_pipeline(
+                        old_name=JenkinsSettings.JENKINS_DESTROY_PIPELINE,
+                        new_name=JenkinsSettings.JENKINS_TNLCM_DIRECTORY
+                        + "/"
+                        + JenkinsSettings.JENKINS_DESTROY_PIPELINE
+                        + "_"
+                        + tn_id,
+                    )
+                )
+            trial_network.set_jenkins_destroy_pipeline(
+                jenkins_destroy_pipeline=jenkins_destroy_pipeline,
+                jenkins_destroy_pipeline_url=jenkins_destroy_pipeline_url,
+            )
+            trial_network.save()
+            TrialNetworkLogger(tn_id=tn_id).info(
+                message="Trial network destroying. In this transition, the trial network proceeds to the destruction of the components"
+            )
+            jenkins_handler.destroy_trial_network()
+            trial_network.set_deployed_descriptor()
+            resource_manager = ResourceManagerModel()
+            resource_manager.release_resource_manager(trial_network)
+            trial_network.set_state("destroyed")
+            trial_network.save()
+            TrialNetworkLogger(tn_id=tn_id).info(
+                message="Trial network destroyed. In this state, the trial network has been destroyed and ready for deploy again"
+            )
+            job.finish(
+                state="succeeded",
+                message=f"Trial network with identifier {tn_id} destroyed. In this state, the trial network has been destroyed and ready for deploy again",
+            )
+        except Exception as e:
+            trial_network.set_state(state="failed-destruction")
+            trial_network.save()
+            TrialNetworkLogger(tn_id=tn_id).info(
+                message="Trial network failed-destruction. In this state, the trial network is waiting to be destroyed"
+            )
+            job.finish(
+                state="failed",
+                message=str(e.message) if isinstance(e, CustomException) else str(e),
+            )
+
+    def keep_heartbeat(self) -> None:
+        """
+        Loop that refreshes the heartbeat of the jobs run by this process and fails the jobs whose process stopped
+        """
+        while True:
+            try:
+                JobModel.objects(state="running", worker=self.worker).update(
+                    set__date_heartbeat_utc=datetime.now(timezone.utc)
+                )
+                self.fail_lost_jobs()
+            except Exception as e:
+                console_logger.error(message=f"Error in the job heartbeat: {e}")
+            sleep(JOB_HEARTBEAT_INTERVAL)
+
+    def fail_lost_jobs(self) -> None:
+        """
+        Fail the running jobs without heartbeat. Their builds may have been left half done, so the trial network is moved to the failed state of the operation instead of running the job again
+        """
+        date_limit = datetime.now(timezone.utc) - timedelta(
+            seconds=TnlcmSettings.TNLCM_JOB_HEARTBEAT_TIMEOUT
+        )
+        for lost_job in JobModel.objects(
+            state="running", date_heartbeat_utc__lt=date_limit
+        ).only("job_id"):
+            job = JobModel.objects(
+                job_id=lost_job.job_id,
+                state="running",
+                date_heartbeat_utc__lt=date_limit,
+            ).modify(
+                set__state="failed",
+                set__message="The process running the job stopped before it finished",
+                set__date_finished_utc=datetime.now(timezone.utc),
+                new=True,
+            )
+            if not job:
+                continue
+            failed_state = (
+                "failed-activation"
+                if job.operation == "activate"
+                else "failed-destruction"
+            )
+            TrialNetworkModel.objects(
+                tn_id=job.tn_id, state__in=["activating", "destroying"]
+            ).update_one(set__state=failed_state)
+            console_logger.warning(
+                message=f"Job {job.job_id} of the trial network {job.tn_id} lost. Trial network moved to {failed_state}"
+            )
+
+
+job_handler = JobHandler()
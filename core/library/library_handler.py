@@ -1,22 +1,124 @@
-from typing import Dict, List
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, List
 
 from conf.library import LibrarySettings
 from core.exceptions.exceptions import LibraryError
-from core.libs.git import Git
-from core.utils.file import load_yaml
-from core.utils.os import (
-    get_absolute_path,
-    is_directory,
-    is_file,
-    join_path,
-    list_dirs_no_hidden,
-    list_files_no_hidden,
-)
+from core.libs.git import Git, GitObjectReader, get_git_object_reader
+from core.utils.os import get_absolute_path, join_path
+from core.utils.parser import compile_boolean_expression, yaml_to_dict
 
 LIBRARY_PATH = join_path(
     get_absolute_path(__file__), LibrarySettings.LIBRARY_REPOSITORY_NAME
 )
 LIBRARY_REFERENCES_TYPES = ["branch", "commit", "tag"]
+LIBRARY_COMPONENT_INDEXES_CACHE_SIZE = 16
+
+library_component_indexes = OrderedDict()
+library_component_indexes_lock = Lock()
+
+
+class LibraryComponentIndex:
+    def __init__(self, git_object_reader: GitObjectReader, commit_id: str) -> None:
+        """
+        Constructor. Read once all the components of a commit of the Library, so they can be looked up without reading the repository again
+
+        :param git_object_reader: reader of the Git objects of the Library, ``GitObjectReader``
+        :param commit_id: commit of the Library, ``str``
+        :raise GitError:
+        """
+        self.commit_id = commit_id
+        self.components = set()
+        self.public_data = {}
+        self.templates = {}
+        self.required_when_predicates = {}
+        for component_name, is_directory in (
+            git_object_reader.list_directory(reference_value=commit_id) or []
+        ):
+            if not is_directory or component_name.startswith("."):
+                continue
+            self.components.add(component_name)
+            public_file = git_object_reader.read_file(
+                reference_value=commit_id,
+                path=f"{component_name}/.tnlcm/public.yaml",
+            )
+            if public_file is not None:
+                self.public_data[component_name] = yaml_to_dict(
+                    data=public_file.decode()
+                )
+            component_templates = []
+            for file, is_file_directory in sorted(
+                git_object_reader.list_directory(
+                    reference_value=commit_id, path=component_name
+                )
+            ):
+                if not is_file_directory and file.startswith("sample_tnlcm_descriptor"):
+                    file_content = git_object_reader.read_file(
+                        reference_value=commit_id, path=f"{component_name}/{file}"
+                    )
+                    component_templates.append(yaml_to_dict(data=file_content.decode()))
+            self.templates[component_name] = component_templates
+
+    def get_required_when_predicate(
+        self, component_name: str, input_name: str
+    ) -> Callable[[Dict], bool]:
+        """
+        Get the required_when expression of an input of a component compiled into a function. Each expression is compiled only once per commit
+
+        :param component_name: the component type, ``str``
+        :param input_name: name of the input of the component, ``str``
+        :return: function that evaluates the expression with the input provided in the descriptor, ``Callable[[Dict], bool]``
+        :raise LibraryError:
+        """
+        key = (component_name, input_name)
+        if key not in self.required_when_predicates:
+            component_input = (self.public_data.get(component_name) or {}).get(
+                "input"
+            ) or {}
+            required_fields = {
+                field_name
+                for field_name, field_info in component_input.items()
+                if field_info.get("required", False)
+            }
+            try:
+                predicate = compile_boolean_expression(
+                    expression=component_input[input_name]["required_when"],
+                    required_fields=required_fields,
+                )
+            except (SyntaxError, TypeError) as e:
+                raise LibraryError(
+                    message=f"Input {input_name} of component {component_name} has an invalid required_when expression in 6G-Library definition: {e}. Contact component owner or create a issue in the 6G-Library repository",
+                    status_code=422,
+                )
+            self.required_when_predicates[key] = predicate
+        return self.required_when_predicates[key]
+
+
+def get_library_component_index(
+    git_object_reader: GitObjectReader, commit_id: str
+) -> LibraryComponentIndex:
+    """
+    Get the component index of a commit of the Library, shared by all the threads of the process
+
+    :param git_object_reader: reader of the Git objects of the Library, ``GitObjectReader``
+    :param commit_id: commit of the Library, ``str``
+    :return: component index of the commit, ``LibraryComponentIndex``
+    :raise GitError:
+    """
+    with library_component_indexes_lock:
+        if commit_id in library_component_indexes:
+            library_component_indexes.move_to_end(commit_id)
+            return library_component_indexes[commit_id]
+    library_component_index = LibraryComponentIndex(
+        git_object_reader=git_object_reader, commit_id=commit_id
+    )
+    with library_component_indexes_lock:
+        library_component_index = library_component_indexes.setdefault(
+            commit_id, library_component_index
+        )
+        if len(library_component_indexes) > LIBRARY_COMPONENT_INDEXES_CACHE_SIZE:
+            library_component_indexes.popitem(last=False)
+    return library_component_index
 
 
 class LibraryHandler:
@@ -33,7 +135,7 @@ class LibraryHandler:
         :param https_url: URL of the repository, ``str``
         :param reference_type: type of reference (branch, tag, commit) to switch, ``str``
         :param reference_value: value of the reference (branch name, tag name, commit ID) to switch, ``str``
-        :param directory_path: directory path into which the Library is to be cloned, ``str``
+        :param directory_path: directory path into which the Library is to be cloned, ``str``. If not specified, the files are read from the mirror of the Library
         """
         self.library_https_url = https_url
         if https_url is None:
@@ -64,6 +166,11 @@ class LibraryHandler:
             github_reference_value=self.library_reference_value,
         )
         self.library_commit_id = None
+        self.library_objects_directory = self.library_local_directory
+        self.library_objects_reference = "HEAD"
+        if directory_path is None:
+            self.library_objects_directory = self.git_client.github_mirror_directory
+            self.library_objects_reference = self.library_reference_value
 
     def branches(self) -> List[str]:
         """
@@ -71,11 +178,102 @@ class LibraryHandler:
 
         :return branches: the branches of the Library, ``List[str]``
         """
-        branches = self.git_client.branches()
+        branches = self.get_mirror_git_client().branches()
         if "assets" in branches:
             branches.remove("assets")
         return branches
 
+    def commits(self) -> List[str]:
+        """
+        Function to get the commits of the default branch of the Library
+
+        :return commits: the commits of the Library, ``List[str]``
+        """
+        return self.get_mirror_git_client().commits()
+
+    def tags(self) -> List[str]:
+        """
+        Function to get the tags of the Library
+
+        :return tags: the tags of the Library, ``List[str]``
+        """
+        return self.get_mirror_git_client().tags()
+
+    def get_mirror_git_client(self) -> Git:
+        """
+        Function to get a Git client that runs the commands in the mirror of the Library
+
+        :return: Git client of the mirror, ``Git``
+        """
+        return Git(
+            github_https_url=self.library_https_url,
+            github_repository_name=self.library_repository_name,
+            github_local_directory=self.git_client.github_mirror_directory,
+            github_reference_type=self.library_reference_type,
+            github_reference_value=self.library_reference_value,
+        )
+
+    def get_git_object_reader(self) -> GitObjectReader:
+        """
+        Function to get the reader of the Git objects of the Library
+
+        :return: reader of the Git objects, ``GitObjectReader``
+        """
+        return get_git_object_reader(
+            repository_directory=self.library_objects_directory
+        )
+
+    def get_component_index(self) -> LibraryComponentIndex:
+        """
+        Function to get the component index of the commit the Library reference points to
+
+        :return: component index of the commit, ``LibraryComponentIndex``
+        :raise LibraryError:
+        """
+        git_object_reader = self.get_git_object_reader()
+        commit_id = git_object_reader.resolve_commit(
+            reference_value=self.library_objects_reference
+        )
+        if commit_id is None:
+            raise LibraryError(
+                message=f"No components available in {self.library_reference_type} reference type and {self.library_reference_value} reference value",
+                status_code=404,
+            )
+        return get_library_component_index(
+            git_object_reader=git_object_reader, commit_id=commit_id
+        )
+
+    def get_public_data(self, component_name: str) -> Dict:
+        """
+        Function to get the content of the public.yaml file of the component type
+
+        :param component_name: the component type, ``str``
+        :return public_data: the content of the public.yaml file, ``Dict``
+        :raise LibraryError:
+        """
+        component_index = self.get_component_index()
+        if component_name not in component_index.public_data:
+            raise LibraryError(
+                message=f"File {component_name}/.tnlcm/public.yaml not found in {component_name} component in {self.library_reference_type} reference type and {self.library_reference_value} reference value",
+                status_code=404,
+            )
+        return component_index.public_data[component_name]
+
+    def get_required_when_predicate(
+        self, component_name: str, input_name: str
+    ) -> Callable[[Dict], bool]:
+        """
+        Function to get the required_when expression of an input of the component type compiled into a function
+
+        :param component_name: the component type, ``str``
+        :param input_name: name of the input of the component type, ``str``
+        :return: function that evaluates the expression with the input provided in the descriptor, ``Callable[[Dict], bool]``
+        :raise LibraryError:
+        """
+        return self.get_component_index().get_required_when_predicate(
+            component_name=component_name, input_name=input_name
+        )
+
     def get_component(self, component_name: str) -> Dict:
         """
         Function to get the component type
@@ -86,15 +284,7 @@ class LibraryHandler:
         """
         component = {}
         self.is_component_library(component_name=component_name)
-        public_file_path = join_path(
-            self.library_local_directory, component_name, ".tnlcm", "public.yaml"
-        )
-        if not is_file(path=public_file_path):
-            raise LibraryError(
-                message=f"File {public_file_path} not found in {component_name} component in {self.library_reference_type} reference type and {self.library_reference_value} reference value",
-                status_code=404,
-            )
-        public_data = load_yaml(file_path=public_file_path)
+        public_data = self.get_public_data(component_name=component_name)
         if public_data:
             component = public_data
         return component
@@ -108,15 +298,7 @@ class LibraryHandler:
         :raise LibraryError:
         """
         component_input = {}
-        public_file_path = join_path(
-            self.library_local_directory, component_name, ".tnlcm", "public.yaml"
-        )
-        if not is_file(path=public_file_path):
-            raise LibraryError(
-                message=f"File {public_file_path} not found in {component_name} component in {self.library_reference_type} reference type and {self.library_reference_value} reference value",
-                status_code=404,
-            )
-        public_data = load_yaml(file_path=public_file_path)
+        public_data = self.get_public_data(component_name=component_name)
         if public_data and "input" in public_data:
             component_input = public_data["input"]
         return component_input
@@ -130,15 +312,7 @@ class LibraryHandler:
         :raise LibraryError:
         """
         component_metadata = {}
-        public_file_path = join_path(
-            self.library_local_directory, component_name, ".tnlcm", "public.yaml"
-        )
-        if not is_file(path=public_file_path):
-            raise LibraryError(
-                message=f"File {public_file_path} not found in {component_name} component in {self.library_reference_type} reference type and {self.library_reference_value} reference value",
-                status_code=404,
-            )
-        public_data = load_yaml(file_path=public_file_path)
+        public_data = self.get_public_data(component_name=component_name)
         if public_data and "metadata" in public_data:
             component_metadata = public_data["metadata"]
         return component_metadata
@@ -150,18 +324,7 @@ class LibraryHandler:
         :return components: the available components, ``List[str]``
         :raise LibraryError:
         """
-        components = []
-        if not is_directory(path=self.library_local_directory):
-            raise LibraryError(
-                message=f"No components available in {self.library_reference_type} reference type and {self.library_reference_value} reference value",
-                status_code=404,
-            )
-        for component in list_dirs_no_hidden(path=self.library_local_directory):
-            if is_directory(
-                path=join_path(self.library_local_directory, component)
-            ) and not component.startswith("."):
-                components.append(component)
-        return sorted(components)
+        return sorted(self.get_component_index().components)
 
     def get_trial_networks_templates_component(self, component_name: str) -> Dict:
         """
@@ -172,14 +335,9 @@ class LibraryHandler:
         :raise LibraryError:
         """
         trial_networks_templates = {}
-        component_path = join_path(self.library_local_directory, component_name)
-        component_templates = []
-        for file in list_files_no_hidden(path=component_path):
-            if file.startswith("sample_tnlcm_descriptor"):
-                file_path = join_path(component_path, file)
-                file_content = load_yaml(file_path=file_path)
-                component_templates.append(file_content)
-        trial_networks_templates[component_name] = component_templates
+        trial_networks_templates[component_name] = (
+            self.get_component_index().templates.get(component_name, [])
+        )
         return trial_networks_templates
 
     def get_trial_networks_templates(self) -> Dict:
@@ -196,6 +354,16 @@ class LibraryHandler:
             )
         return trial_networks_templates
 
+    def is_component(self, component_name: str) -> bool:
+        """
+        Function to check if a component type is in the library
+
+        :param component_name: the component type to check, ``str``
+        :return: whether the component type is in the library, ``bool``
+        :raise LibraryError:
+        """
+        return component_name in self.get_component_index().components
+
     def is_component_library(self, component_name: str) -> None:
         """
         Function to check if component in the descriptor are in the library
@@ -203,7 +371,7 @@ class LibraryHandler:
         :param component_name: the component type to validate, ``str``
         :raise LibraryError:
         """
-        if component_name not in self.get_components():
+        if not self.is_component(component_name=component_name):
             raise LibraryError(
                 message=f"Component {component_name} not found in {self.library_reference_type} reference type and {self.library_reference_value} reference value",
                 status_code=404,
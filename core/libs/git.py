@@ -1,8 +1,195 @@
-from typing import List
+import fcntl
+import re
+import subprocess
+from collections import OrderedDict
+from hashlib import sha1
+from threading import Lock
+from time import time
+from typing import List, Tuple
 
 from core.exceptions.exceptions import GitError
 from core.utils.cli import run_command
-from core.utils.os import exist_directory, join_path, remove_directory
+from core.utils.os import (
+    GIT_MIRRORS_PATH,
+    exist_directory,
+    is_file,
+    join_path,
+    make_directory,
+    remove_directory,
+    rename_directory,
+)
+
+GIT_MIRROR_REFRESH_INTERVAL = 60
+GIT_OBJECT_READERS_CACHE_SIZE = 32
+GIT_TREE_MODE = b"40000"
+
+git_object_readers = OrderedDict()
+git_object_readers_lock = Lock()
+
+
+def get_mirror_directory(https_url: str) -> str:
+    """
+    Get the directory of the bare mirror shared by all the clones of a repository
+
+    :param https_url: HTTPS URL of the repository, ``str``
+    :return: path to the mirror of the repository, ``str``
+    """
+    https_url = re.sub(r"^https://[^/@]*@", "https://", https_url).rstrip("/")
+    repository_name = https_url.split("/")[-1].removesuffix(".git")
+    return join_path(
+        GIT_MIRRORS_PATH,
+        f"{repository_name}-{sha1(https_url.encode()).hexdigest()[:12]}.git",
+    )
+
+
+def get_git_object_reader(repository_directory: str) -> "GitObjectReader":
+    """
+    Get the object reader of a repository, shared by all the threads of the process
+
+    :param repository_directory: path to the repository, ``str``
+    :return: object reader of the repository, ``GitObjectReader``
+    """
+    with git_object_readers_lock:
+        if repository_directory in git_object_readers:
+            git_object_readers.move_to_end(repository_directory)
+            return git_object_readers[repository_directory]
+        git_object_reader = GitObjectReader(repository_directory=repository_directory)
+        git_object_readers[repository_directory] = git_object_reader
+        if len(git_object_readers) > GIT_OBJECT_READERS_CACHE_SIZE:
+            _, evicted_git_object_reader = git_object_readers.popitem(last=False)
+            evicted_git_object_reader.close()
+        return git_object_reader
+
+
+class GitObjectReader:
+    def __init__(self, repository_directory: str) -> None:
+        """
+        Constructor. Objects are read through a long-lived git cat-file --batch process, so files can be read at any reference without a working tree
+
+        :param repository_directory: path to the repository, bare or not, ``str``
+        """
+        self.repository_directory = repository_directory
+        self.process = None
+        self.hash_size = 20
+        self.lock = Lock()
+
+    def close(self) -> None:
+        """
+        Stop the git cat-file process
+        """
+        with self.lock:
+            if self.process and self.process.poll() is None:
+                self.process.stdin.close()
+                self.process.wait()
+            self.process = None
+
+    def read_object(self, object_name: str) -> Tuple[str, bytes]:
+        """
+        Read an object of the repository
+
+        :param object_name: name of the object, like <reference>:<path>, ``str``
+        :return: tuple with the type and the content of the object, or None and None if it does not exist, ``Tuple[str, bytes]``
+        :raise GitError:
+        """
+        _, object_type, content = self.read_object_with_id(object_name=object_name)
+        return object_type, content
+
+    def read_object_with_id(self, object_name: str) -> Tuple[str, str, bytes]:
+        """
+        Read an object of the repository together with its identifier
+
+        :param object_name: name of the object, like <reference>:<path>, ``str``
+        :return: tuple with the identifier, the type and the content of the object, or None, None and None if it does not exist, ``Tuple[str, str, bytes]``
+        :raise GitError:
+        """
+        if "\n" in object_name:
+            return None, None, None
+        with self.lock:
+            try:
+                if not self.process or self.process.poll() is not None:
+                    if not exist_directory(path=self.repository_directory):
+                        raise GitError(
+                            message=f"Repository {self.repository_directory} does not exist in local. Cannot read objects",
+                            status_code=404,
+                        )
+                    self.process = subprocess.Popen(
+                        ["git", "-C", self.repository_directory, "cat-file", "--batch"],
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL,
+                    )
+                self.process.stdin.write(f"{object_name}\n".encode())
+                self.process.stdin.flush()
+                header = self.process.stdout.readline().split()
+                if len(header) != 3:
+                    return None, None, None
+                self.hash_size = len(header[0]) // 2
+                object_size = int(header[2])
+                content = self.process.stdout.read(object_size + 1)[:-1]
+                return header[0].decode(), header[1].decode(), content
+            except (BrokenPipeError, ValueError) as e:
+                self.process = None
+                raise GitError(
+                    message=f"Error reading the object {object_name} of the repository {self.repository_directory}: {e}",
+                    status_code=500,
+                )
+
+    def resolve_commit(self, reference_value: str) -> str:
+        """
+        Get the commit pointed to by a reference
+
+        :param reference_value: branch, tag or commit, ``str``
+        :return: identifier of the commit or None if the reference does not exist, ``str``
+        :raise GitError:
+        """
+        object_id, object_type, _ = self.read_object_with_id(
+            object_name=f"{reference_value}^{{commit}}"
+        )
+        if object_type != "commit":
+            return None
+        return object_id
+
+    def read_file(self, reference_value: str, path: str) -> bytes:
+        """
+        Read a file of the repository at a reference
+
+        :param reference_value: branch, tag or commit, ``str``
+        :param path: path of the file inside the repository, ``str``
+        :return: content of the file or None if it does not exist, ``bytes``
+        :raise GitError:
+        """
+        object_type, content = self.read_object(object_name=f"{reference_value}:{path}")
+        if object_type != "blob":
+            return None
+        return content
+
+    def list_directory(
+        self, reference_value: str, path: str = ""
+    ) -> List[Tuple[str, bool]]:
+        """
+        List a directory of the repository at a reference
+
+        :param reference_value: branch, tag or commit, ``str``
+        :param path: path of the directory inside the repository, ``str``
+        :return: list of tuples with the name of each entry and whether it is a directory, or None if the directory does not exist, ``List[Tuple[str, bool]]``
+        :raise GitError:
+        """
+        object_type, content = self.read_object(object_name=f"{reference_value}:{path}")
+        if object_type != "tree":
+            return None
+        entries = []
+        position = 0
+        while position < len(content):
+            mode_end = content.index(b" ", position)
+            name_end = content.index(b"\0", mode_end)
+            entries.append(
+                (
+                    content[mode_end + 1 : name_end].decode(),
+                    content[position:mode_end] == GIT_TREE_MODE,
+                )
+            )
+            position = name_end + 1 + self.hash_size
+        return entries
 
 
 class Git:
@@ -30,6 +217,7 @@ class Git:
         self.github_local_directory = github_local_directory
         self.github_reference_type = github_reference_type
         self.github_reference_value = github_reference_value
+        self.github_mirror_directory = get_mirror_directory(https_url=github_https_url)
         self.github_token = None
         if github_token:
             self.github_token = github_token
@@ -106,14 +294,15 @@ class Git:
 
     def clone(self) -> None:
         """
-        Clone a GitHub repository to the specified path
+        Clone a GitHub repository to the specified path. The clone is made from the local mirror of the repository and shares its objects, so no network access is needed if the mirror is up to date
         """
         if exist_directory(path=self.github_local_directory) and not exist_directory(
             join_path(self.github_local_directory, ".git")
         ):
             remove_directory(path=self.github_local_directory)
         if not exist_directory(path=self.github_local_directory):
-            command = f"git clone {self.github_https_url} {self.github_local_directory}"
+            self.update_mirror()
+            command = f"git clone --shared {self.github_mirror_directory} {self.github_local_directory}"
             run_command(command=command)
 
     def commit(self, message: str) -> None:
@@ -189,6 +378,7 @@ class Git:
                 message=f"Repository {self.github_local_directory} does not exist in local. Cannot fetch the changes and prune the deleted branches",
                 status_code=404,
             )
+        self.update_mirror()
         command = f"git -C {self.github_local_directory} fetch --prune"
         run_command(command=command)
 
@@ -219,9 +409,48 @@ class Git:
                 message=f"Repository {self.github_local_directory} does not exist in local. Cannot pull the changes",
                 status_code=404,
             )
+        self.update_mirror()
         command = f"git -C {self.github_local_directory} pull"
         run_command(command=command)
 
+    def update_mirror(self, force: bool = False) -> None:
+        """
+        Create the local mirror of the repository if it does not exist, or fetch the remote repository into it if it was not refreshed in the last GIT_MIRROR_REFRESH_INTERVAL seconds. The mirror is locked while it is updated, so processes and threads do not fetch it at the same time
+
+        :param force: fetch even if the mirror was refreshed recently, ``bool``
+        :raise GitError:
+        """
+        make_directory(path=GIT_MIRRORS_PATH)
+        last_refresh_path = join_path(self.github_mirror_directory, "last_refresh")
+        with open(f"{self.github_mirror_directory}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if not is_file(path=join_path(self.github_mirror_directory, "HEAD")):
+                remove_directory(path=self.github_mirror_directory)
+                temporary_mirror_directory = f"{self.github_mirror_directory}.tmp"
+                remove_directory(path=temporary_mirror_directory)
+                run_command(
+                    command=f"git clone --mirror {self.github_https_url} {temporary_mirror_directory}"
+                )
+                run_command(
+                    command=f"git -C {temporary_mirror_directory} config gc.pruneExpire never"
+                )
+                rename_directory(
+                    old_path=temporary_mirror_directory,
+                    new_path=self.github_mirror_directory,
+                )
+            else:
+                last_refresh = 0
+                if is_file(path=last_refresh_path):
+                    with open(last_refresh_path, "r") as last_refresh_file:
+                        last_refresh = float(last_refresh_file.read() or 0)
+                if not force and time() - last_refresh < GIT_MIRROR_REFRESH_INTERVAL:
+                    return
+                run_command(
+                    command=f"git -C {self.github_mirror_directory} fetch --prune"
+                )
+            with open(last_refresh_path, "w") as last_refresh_file:
+                last_refresh_file.write(str(time()))
+
     def reset_hard(self) -> None:
         """
         Reset the repository to the last commit
@@ -1,7 +1,13 @@
 import logging
+import os
 import sys
+from collections import OrderedDict
+from datetime import datetime
+from json import dumps, loads
+from threading import Lock
+from typing import Tuple
 
-from core.utils.os import TRIAL_NETWORKS_PATH, get_dotenv_var, join_path
+from core.utils.os import TRIAL_NETWORKS_PATH, get_dotenv_var, is_file, join_path
 
 LOG_LEVELS_AND_FORMATS = {
     "DEBUG": ("\x1b[38;21m", logging.DEBUG),
@@ -10,6 +16,7 @@ LOG_LEVELS_AND_FORMATS = {
     "ERROR": ("\x1b[38;5;196m", logging.ERROR),
     "CRITICAL": ("\x1b[31;1m", logging.CRITICAL),
 }
+TRIAL_NETWORK_LOGGERS_CACHE_SIZE = 256
 
 
 class CustomFormatter(logging.Formatter):
@@ -68,46 +75,152 @@ class ConsoleLogger:
 
 
 class TrialNetworkLogger:
-    def __init__(self, tn_id: str):
-        self.tn_id = tn_id
-        log_file_name = f"{tn_id}.log"
-        log_file_path = join_path(TRIAL_NETWORKS_PATH, tn_id, log_file_name)
-        log_level_name = get_dotenv_var(key="TRIAL_NETWORK_LOG_LEVEL").upper()
-
-        self.logger = logging.getLogger(name=tn_id)
-        self.logger.setLevel(level=log_level_name)
-
-        if not self.logger.hasHandlers():
-            log_format = "[%(asctime)s] - [%(process)d] - [%(levelname)s] - [%(tn_id)s] - %(message)s"
-            file_formatter = logging.Formatter(fmt=log_format)
-            file_handler = logging.FileHandler(filename=log_file_path)
-            file_handler.setFormatter(fmt=file_formatter)
-            self.logger.addHandler(file_handler)
-
-    def _log(self, level, message, lines_to_remove=0):
-        if self.logger:
-            log_file_path = self.logger.handlers[0].baseFilename
-            if lines_to_remove > 0:
-                with open(log_file_path, "r") as log_file:
-                    lines = log_file.readlines()
-                with open(log_file_path, "w") as log_file:
-                    log_file.writelines(lines[: -(lines_to_remove + 1)])
-            self.logger.log(level, message, extra={"tn_id": self.tn_id})
-
-    def critical(self, message: str, lines_to_remove: int = 0) -> None:
-        self._log(logging.CRITICAL, message, lines_to_remove)
-
-    def debug(self, message: str, lines_to_remove: int = 0) -> None:
-        self._log(logging.DEBUG, message, lines_to_remove)
-
-    def error(self, message: str, lines_to_remove: int = 0) -> None:
-        self._log(logging.ERROR, message, lines_to_remove)
-
-    def info(self, message: str, lines_to_remove: int = 0) -> None:
-        self._log(logging.INFO, message, lines_to_remove)
+    """
+    Append-only logger of a trial network. There is one instance per trial network, so the log file is kept open and each entry is written with a single append. The file is opened again if it has been deleted or replaced by another process. Entries can be tagged with a section, whose byte ranges are stored in an index next to the log file
+    """
 
-    def warning(self, message: str, lines_to_remove: int = 0) -> None:
-        self._log(logging.WARNING, message, lines_to_remove)
+    instances = OrderedDict()
+    instances_lock = Lock()
+
+    def __new__(cls, tn_id: str):
+        with cls.instances_lock:
+            instance = cls.instances.get(tn_id)
+            if instance:
+                cls.instances.move_to_end(tn_id)
+                return instance
+            instance = super().__new__(cls)
+            instance.tn_id = tn_id
+            instance.log_file_path = join_path(
+                TRIAL_NETWORKS_PATH, tn_id, f"{tn_id}.log"
+            )
+            instance.index_file_path = f"{instance.log_file_path}.index"
+            _, instance.log_level = LOG_LEVELS_AND_FORMATS[
+                get_dotenv_var(key="TRIAL_NETWORK_LOG_LEVEL").upper()
+            ]
+            instance.log_fd = None
+            instance.index_fd = None
+            instance.lock = Lock()
+            cls.instances[tn_id] = instance
+            if len(cls.instances) > TRIAL_NETWORK_LOGGERS_CACHE_SIZE:
+                _, evicted_instance = cls.instances.popitem(last=False)
+                evicted_instance.close()
+            return instance
+
+    @classmethod
+    def discard(cls, tn_id: str) -> None:
+        """
+        Close and forget the logger of a trial network
+
+        :param tn_id: trial network identifier, ``str``
+        """
+        with cls.instances_lock:
+            instance = cls.instances.pop(tn_id, None)
+        if instance:
+            instance.close()
+
+    def close(self) -> None:
+        """
+        Close the log and index files
+        """
+        with self.lock:
+            for fd in (self.log_fd, self.index_fd):
+                if fd is not None:
+                    os.close(fd)
+            self.log_fd = None
+            self.index_fd = None
+
+    def _is_replaced(self, fd: int, file_path: str) -> bool:
+        """
+        Check if the file opened by a descriptor has been deleted or replaced, e.g. by the purge of the trial network in another process
+
+        :param fd: descriptor of the opened file, ``int``
+        :param file_path: path of the file, ``str``
+        :return: True if the descriptor no longer points to the file of the path, ``bool``
+        """
+        fd_stat = os.fstat(fd)
+        if fd_stat.st_nlink == 0:
+            return True
+        try:
+            path_stat = os.stat(file_path)
+        except FileNotFoundError:
+            return True
+        return (fd_stat.st_dev, fd_stat.st_ino) != (path_stat.st_dev, path_stat.st_ino)
+
+    def _append(self, fd: int, file_path: str, data: bytes) -> Tuple[int, int]:
+        if fd is not None and self._is_replaced(fd=fd, file_path=file_path):
+            os.close(fd)
+            fd = None
+        if fd is None:
+            fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        os.write(fd, data)
+        return fd, os.lseek(fd, 0, os.SEEK_CUR)
+
+    def _log(self, level: int, message: str, section: str = None) -> None:
+        if level < self.log_level:
+            return
+        asctime = datetime.now().strftime("%Y-%m-%d %H:%M:%S,%f")[:-3]
+        entry = f"[{asctime}] - [{os.getpid()}] - [{logging.getLevelName(level)}] - [{self.tn_id}] - {message}\n".encode()
+        with self.lock:
+            self.log_fd, end = self._append(
+                fd=self.log_fd, file_path=self.log_file_path, data=entry
+            )
+            if section:
+                index_entry = dumps(
+                    {"section": section, "start": end - len(entry), "end": end}
+                )
+                self.index_fd, _ = self._append(
+                    fd=self.index_fd,
+                    file_path=self.index_file_path,
+                    data=f"{index_entry}\n".encode(),
+                )
+
+    def critical(self, message: str, section: str = None) -> None:
+        self._log(logging.CRITICAL, message, section)
+
+    def debug(self, message: str, section: str = None) -> None:
+        self._log(logging.DEBUG, message, section)
+
+    def error(self, message: str, section: str = None) -> None:
+        self._log(logging.ERROR, message, section)
+
+    def info(self, message: str, section: str = None) -> None:
+        self._log(logging.INFO, message, section)
+
+    def warning(self, message: str, section: str = None) -> None:
+        self._log(logging.WARNING, message, section)
+
+    def read(self, offset: int = 0) -> Tuple[str, int]:
+        """
+        Read the log from a byte offset
+
+        :param offset: byte offset from which to read, ``int``
+        :return: tuple with the content of the log and the byte offset from which to read the next time, ``Tuple[str, int]``
+        """
+        with open(self.log_file_path, "rb") as log_file:
+            log_file.seek(offset)
+            content = log_file.read()
+        return content.decode(errors="replace"), offset + len(content)
+
+    def read_section(self, section: str) -> str:
+        """
+        Read the entries of the log tagged with a section
+
+        :param section: name of the section, ``str``
+        :return: content of the section, ``str``
+        """
+        ranges = []
+        if is_file(path=self.index_file_path):
+            with open(self.index_file_path, "r") as index_file:
+                for line in index_file:
+                    index_entry = loads(line)
+                    if index_entry["section"] == section:
+                        ranges.append((index_entry["start"], index_entry["end"]))
+        chunks = []
+        with open(self.log_file_path, "rb") as log_file:
+            for start, end in ranges:
+                log_file.seek(start)
+                chunks.append(log_file.read(end - start))
+        return b"".join(chunks).decode(errors="replace")
 
 
 console_logger = ConsoleLogger()
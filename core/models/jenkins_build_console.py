@@ -0,0 +1,69 @@
+import zlib
+from datetime import datetime, timezone
+from typing import Dict
+
+from mongoengine import DateTimeField, Document, FileField, IntField, StringField
+
+JENKINS_BUILD_CONSOLE_COMPRESSION_LEVEL = 6
+
+
+class JenkinsBuildConsoleModel(Document):
+    tn_id = StringField(max_length=15)
+    build_name = StringField()
+    pipeline_name = StringField()
+    build_number = IntField()
+    console = FileField(
+        db_alias="tnlcm-database-alias", collection_name="jenkins_build_console_fs"
+    )
+    console_size = IntField(default=0)
+    date_created_utc = DateTimeField(default=lambda: datetime.now(timezone.utc))
+
+    meta = {
+        "db_alias": "tnlcm-database-alias",
+        "collection": "jenkins_build_console",
+        "description": "This collection stores the console output of the Jenkins builds of the trial networks. The output is compressed and stored in chunks with GridFS",
+        "indexes": ["tn_id"],
+    }
+
+    def set_console(self, console: str) -> None:
+        """
+        Compress and store the console output of the build
+
+        :param console: console output of the build, ``str``
+        """
+        data = console.encode(encoding="utf-8")
+        self.console_size = len(data)
+        self.console.put(
+            zlib.compress(data, JENKINS_BUILD_CONSOLE_COMPRESSION_LEVEL),
+            content_type="application/zlib",
+        )
+
+    def get_console(self) -> str:
+        """
+        Get the console output of the build
+
+        :return: console output of the build, ``str``
+        """
+        if not self.console:
+            return ""
+        return zlib.decompress(self.console.read()).decode(encoding="utf-8")
+
+    def delete(self, *args, **kwargs) -> None:
+        """
+        Delete the build together with the chunks of its console output
+        """
+        self.console.delete()
+        super().delete(*args, **kwargs)
+
+    def to_dict(self) -> Dict:
+        return {
+            "tn_id": self.tn_id,
+            "build_name": self.build_name,
+            "pipeline_name": self.pipeline_name,
+            "build_number": self.build_number,
+            "build_console": self.get_console(),
+            "date_created_utc": self.date_created_utc.isoformat(),
+        }
+
+    def __repr__(self) -> str:
+        return "<JenkinsBuildConsole #%s: %s>" % (self.tn_id, self.build_name)
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+from typing import Dict
+
+from mongoengine import DateTimeField, Document, IntField, StringField
+
+
+class JenkinsBuildEventModel(Document):
+    tn_id = StringField(max_length=15)
+    pipeline_name = StringField()
+    build_number = IntField()
+    result = StringField(max_length=20)
+    date_received_utc = DateTimeField(default=lambda: datetime.now(timezone.utc))
+
+    meta = {
+        "db_alias": "tnlcm-database-alias",
+        "collection": "jenkins_build_event",
+        "description": "This collection stores the completion notifications sent by Jenkins builds",
+        "indexes": [
+            {"fields": ["pipeline_name", "build_number"], "unique": True},
+            "tn_id",
+        ],
+    }
+
+    def to_dict(self) -> Dict:
+        return {
+            "tn_id": self.tn_id,
+            "pipeline_name": self.pipeline_name,
+            "build_number": self.build_number,
+            "result": self.result,
+            "date_received_utc": self.date_received_utc.isoformat(),
+        }
+
+    def __repr__(self) -> str:
+        return "<JenkinsBuildEvent #%s: %s>" % (self.pipeline_name, self.build_number)
@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from typing import Dict
+
+from mongoengine import DateTimeField, Document, StringField
+
+
+class JenkinsPipelineModel(Document):
+    name = StringField(unique=True)
+    url = StringField()
+    base_pipeline = StringField()
+    tn_id = StringField(max_length=15)
+    date_created_utc = DateTimeField(default=lambda: datetime.now(timezone.utc))
+
+    meta = {
+        "db_alias": "tnlcm-database-alias",
+        "collection": "jenkins_pipeline",
+        "description": "This collection stores the pipelines created in Jenkins for the trial networks",
+        "indexes": ["tn_id"],
+    }
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "url": self.url,
+            "base_pipeline": self.base_pipeline,
+            "tn_id": self.tn_id,
+            "date_created_utc": self.date_created_utc.isoformat(),
+        }
+
+    def __repr__(self) -> str:
+        return "<JenkinsPipeline #%s: %s>" % (self.name, self.tn_id)
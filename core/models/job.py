@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+from typing import Dict
+from uuid import uuid4
+
+from mongoengine import DateTimeField, DictField, Document, StringField
+
+from core.exceptions.exceptions import JobError
+
+JOB_OPERATIONS = {"activate", "destroy"}
+JOB_STATES = {"queued", "running", "succeeded", "failed"}
+
+
+class JobModel(Document):
+    job_id = StringField(unique=True, default=lambda: uuid4().hex)
+    tn_id = StringField(max_length=15)
+    user_created = StringField(max_length=100)
+    operation = StringField(max_length=20)
+    parameters = DictField(default={})
+    state = StringField(max_length=20, default="queued")
+    message = StringField(default="")
+    entities = DictField(default={})
+    worker = StringField()
+    date_created_utc = DateTimeField(default=lambda: datetime.now(timezone.utc))
+    date_started_utc = DateTimeField()
+    date_finished_utc = DateTimeField()
+    date_heartbeat_utc = DateTimeField()
+
+    meta = {
+        "db_alias": "tnlcm-database-alias",
+        "collection": "job",
+        "description": "This collection stores the activation and destruction jobs of the trial networks",
+        "indexes": [
+            ("state", "date_created_utc"),
+            ("tn_id", "-date_created_utc"),
+        ],
+    }
+
+    def set_operation(self, operation: str) -> None:
+        """
+        Set the operation run by the job
+
+        :param operation: operation of the job, ``str``
+        :raise JobError:
+        """
+        if operation not in JOB_OPERATIONS:
+            raise JobError(f"Job operation {operation} not found", 404)
+        self.operation = operation
+
+    def set_entity_state(self, entity_name: str, state: str) -> None:
+        """
+        Set the state of an entity handled by the job. The update is applied directly in the database, so it can be called from the threads that deploy the entities at the same time
+
+        :param entity_name: name of the entity, ``str``
+        :param state: state of the entity, ``str``
+        """
+        self.entities[entity_name] = state
+        JobModel._get_collection().update_one(
+            {"job_id": self.job_id}, {"$set": {f"entities.{entity_name}": state}}
+        )
+
+    def finish(self, state: str, message: str) -> None:
+        """
+        Set the final state of the job
+
+        :param state: final state of the job, ``str``
+        :param message: message with the outcome of the job, ``str``
+        :raise JobError:
+        """
+        if state not in JOB_STATES:
+            raise JobError(f"Job state {state} not found", 404)
+        self.state = state
+        self.message = message
+        self.date_finished_utc = datetime.now(timezone.utc)
+        self.save()
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.job_id,
+            "tn_id": self.tn_id,
+            "user_created": self.user_created,
+            "operation": self.operation,
+            "parameters": self.parameters,
+            "state": self.state,
+            "message": self.message,
+            "entities": self.entities,
+            "date_created_utc": self.date_created_utc.isoformat(),
+            "date_started_utc": self.date_started_utc.isoformat()
+            if self.date_started_utc
+            else None,
+            "date_finished_utc": self.date_finished_utc.isoformat()
+            if self.date_finished_utc
+            else None,
+        }
+
+    def __repr__(self) -> str:
+        return "<Job #%s: %s %s>" % (self.job_id, self.operation, self.tn_id)
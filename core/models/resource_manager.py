@@ -1,6 +1,7 @@
+from collections import Counter
 from typing import Dict
 
-from mongoengine import Document, IntField, StringField
+from mongoengine import Document, IntField, NotUniqueError, StringField
 
 from core.exceptions.exceptions import ResourceManagerError
 
@@ -8,7 +9,7 @@ from core.exceptions.exceptions import ResourceManagerError
 class ResourceManagerModel(Document):
     component = StringField(unique=True)
     quantity = IntField()
-    tn_id = StringField(max_length=15, unique=True)
+    tn_id = StringField(max_length=15)
 
     meta = {
         "db_alias": "tnlcm-database-alias",
@@ -47,45 +48,100 @@ class ResourceManagerModel(Document):
             quantity = sites_component_resources["quantity"]
         return quantity
 
+    def component_quantities(self, trial_network) -> Dict[str, int]:
+        """
+        Return the number of entities of each component type in the descriptor
+
+        :param trial_network: model of the trial network, ``TrialNetworkModel``
+        :return: number of entities of each component type, ``Dict[str, int]``
+        """
+        return Counter(
+            entity_data["type"]
+            for entity_data in trial_network.sorted_descriptor["trial_network"].values()
+        )
+
+    def reserve_component(
+        self,
+        component_type: str,
+        quantity: int,
+        sites_component_quantity: int,
+        tn_id: str,
+    ) -> bool:
+        """
+        Reserve instances of a component with a single atomic operation that only succeeds if the limit of the site is not exceeded. If another trial network inserts the first reservation of the component at the same time, the operation is retried once
+
+        :param component_type: type part of the descriptor file, ``str``
+        :param quantity: number of instances to be reserved, ``int``
+        :param sites_component_quantity: maximum number of instances in the site, ``int``
+        :param tn_id: trial network identifier, ``str``
+        :return: whether the instances have been reserved, ``bool``
+        """
+        if quantity > sites_component_quantity:
+            return False
+        for _ in range(2):
+            try:
+                ResourceManagerModel.objects(
+                    component=component_type,
+                    quantity__lte=sites_component_quantity - quantity,
+                ).update_one(
+                    inc__quantity=quantity, set_on_insert__tn_id=tn_id, upsert=True
+                )
+                return True
+            except NotUniqueError:
+                pass
+        return False
+
+    def free_component(self, component_type: str, quantity: int) -> None:
+        """
+        Free instances of a component with a single atomic operation
+
+        :param component_type: type part of the descriptor file, ``str``
+        :param quantity: number of instances to be freed, ``int``
+        """
+        ResourceManagerModel.objects(
+            component=component_type, quantity__gte=quantity
+        ).update_one(inc__quantity=-quantity)
+        ResourceManagerModel.objects(component=component_type, quantity__lte=0).delete()
+
     def apply_resource_manager(
         self, trial_network, site_available_components: Dict
     ) -> None:
         """
-        Apply resource manager to check availability resource
+        Apply resource manager to check availability resource. The instances of all the components are reserved or none of them
 
         :param trial_network: model of the trial network, ``TrialNetworkModel``
         :param site_available_components: dictionary with all information of all components available on a site, ``Dict``
         :raise ResourceManagerError:
         """
         if not trial_network.resource_manager:
-            sorted_descriptor = trial_network.sorted_descriptor["trial_network"]
-            for _, entity_data in sorted_descriptor.items():
-                component_type = entity_data["type"]
+            reserved_components = {}
+            for component_type, quantity in self.component_quantities(
+                trial_network=trial_network
+            ).items():
                 sites_component_quantity = self.sites_component_resources(
                     component_type=component_type,
                     site_available_components=site_available_components,
                 )
                 if sites_component_quantity > 0:
-                    tnlcm_quantity = self.tnlcm_component_resources(
-                        component_type=component_type
-                    )
-                    if sites_component_quantity == tnlcm_quantity:
+                    if not self.reserve_component(
+                        component_type=component_type,
+                        quantity=quantity,
+                        sites_component_quantity=sites_component_quantity,
+                        tn_id=trial_network.tn_id,
+                    ):
+                        for (
+                            reserved_component_type,
+                            reserved_quantity,
+                        ) in reserved_components.items():
+                            self.free_component(
+                                component_type=reserved_component_type,
+                                quantity=reserved_quantity,
+                            )
                         raise ResourceManagerError(
                             message=f"Component {component_type} has reached the maximum number of instances",
                             status_code=400,
                         )
-                    tnlcm_component_resources = ResourceManagerModel.objects(
-                        component=component_type
-                    ).first()
-                    if not tnlcm_component_resources:
-                        tnlcm_component_resources = ResourceManagerModel(
-                            component=component_type,
-                            tn_id=trial_network.tn_id,
-                            quantity=1,
-                        )
-                    else:
-                        tnlcm_component_resources.quantity += 1
-                    tnlcm_component_resources.save()
+                    reserved_components[component_type] = quantity
         trial_network.resource_manager = True
         trial_network.save()
 
@@ -95,17 +151,11 @@ class ResourceManagerModel(Document):
 
         :param trial_network: model of the trial network, ``TrialNetworkModel``
         """
-        sorted_descriptor = trial_network.sorted_descriptor["trial_network"]
-        for _, entity_data in sorted_descriptor.items():
-            component_type = entity_data["type"]
-            tnlcm_component_resources = ResourceManagerModel.objects(
-                component=component_type
-            ).first()
-            if tnlcm_component_resources and tnlcm_component_resources.quantity > 0:
-                tnlcm_component_resources.quantity -= 1
-                tnlcm_component_resources.save()
-            if tnlcm_component_resources and tnlcm_component_resources.quantity == 0:
-                tnlcm_component_resources.delete()
+        if trial_network.resource_manager:
+            for component_type, quantity in self.component_quantities(
+                trial_network=trial_network
+            ).items():
+                self.free_component(component_type=component_type, quantity=quantity)
         trial_network.resource_manager = False
         trial_network.save()
 
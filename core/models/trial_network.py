@@ -1,15 +1,23 @@
-import ast
 import re
+from collections import deque
 from datetime import datetime, timezone
 from random import choice
 from string import ascii_lowercase, digits
 from typing import Dict, List
 
-from mongoengine import BooleanField, DateTimeField, DictField, Document, StringField
+from mongoengine import (
+    BooleanField,
+    DateTimeField,
+    DictField,
+    Document,
+    IntField,
+    ListField,
+    StringField,
+)
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
-from core.exceptions.exceptions import TrialNetworkError
+from core.exceptions.exceptions import CustomException, TrialNetworkError
 from core.utils.os import make_directory
 from core.utils.parser import yaml_to_dict
 
@@ -33,6 +41,13 @@ STATE_MACHINE = {
 }
 COMPONENTS_EXCLUDE_CUSTOM_NAME = {"tn_init", "tn_vxlan", "tn_bastion", "tsn"}
 REQUIRED_FIELDS_DESCRIPTOR = {"type", "dependencies", "input"}
+TRIAL_NETWORK_SUMMARY_FIELDS = [
+    "user_created",
+    "tn_id",
+    "state",
+    "date_created_utc",
+    "deployment_site",
+]
 TYPE_MAPPING = {
     "str": str,
     "int": int,
@@ -41,16 +56,7 @@ TYPE_MAPPING = {
     "list": list,
     "dict": dict,
 }
-OPERATORS = {
-    ast.And: lambda x, y: x and y,
-    ast.Or: lambda x, y: x or y,
-    ast.Eq: lambda x, y: x == y,
-    ast.NotEq: lambda x, y: x != y,
-    ast.Lt: lambda x, y: x < y,
-    ast.LtE: lambda x, y: x <= y,
-    ast.Gt: lambda x, y: x > y,
-    ast.GtE: lambda x, y: x >= y,
-}
+BOOLEAN_EXPRESSION_PATTERN = re.compile(r"^(\w+\s*(and|or)\s*\w+(\s*(and|or)\s*\w+)*)$")
 
 
 class TrialNetworkModel(Document):
@@ -62,6 +68,7 @@ class TrialNetworkModel(Document):
     raw_descriptor = DictField(default={})
     sorted_descriptor = DictField(default={})
     deployed_descriptor = DictField(default={})
+    descriptor_graph = DictField(default={})
     jenkins_deploy = DictField(default={})
     jenkins_destroy = DictField(default={})
     library_https_url = StringField()
@@ -70,12 +77,19 @@ class TrialNetworkModel(Document):
     sites_commit_id = StringField()
     deployment_site = StringField()
     report = StringField(default="")
+    report_fragments = ListField(DictField(), default=[])
+    report_version = IntField(default=0)
     resource_manager = BooleanField(default=False)
 
     meta = {
         "db_alias": "tnlcm-database-alias",
         "collection": "trial_network",
         "description": "This collection stores information about trial networks",
+        "indexes": [
+            ("user_created", "tn_id"),
+            "state",
+            ("date_created_utc", "tn_id"),
+        ],
     }
 
     def set_user_created(self, user_created: str) -> None:
@@ -156,31 +170,114 @@ class TrialNetworkModel(Document):
 
     def set_sorted_descriptor(self) -> None:
         """
-        Recursive method that return the raw descriptor and a new descriptor sorted according to dependencies
+        Set a new descriptor sorted according to dependencies, and keep the level and the dependents of each entity in the descriptor graph. The level of an entity is one more than the highest level of its dependencies, so the entities of the same level can be deployed at the same time
 
         :raise TrialNetworkError:
         """
         entities = self.raw_descriptor["trial_network"]
-        ordered_entities = {}
+        dependencies = {}
+        dependents = {entity_name: [] for entity_name in entities}
+        for entity_name, entity_data in entities.items():
+            dependencies[entity_name] = list(
+                dict.fromkeys(entity_data.get("dependencies", []))
+            )
+            for dependency in dependencies[entity_name]:
+                if dependency not in entities:
+                    raise TrialNetworkError(
+                        "Name of the dependency does not match the name of some entity defined in the descriptor",
+                        404,
+                    )
+                dependents[dependency].append(entity_name)
+        pending_dependencies = {
+            entity_name: len(entity_dependencies)
+            for entity_name, entity_dependencies in dependencies.items()
+        }
+        levels = {}
+        queue = deque(
+            entity_name
+            for entity_name, count in pending_dependencies.items()
+            if count == 0
+        )
+        while queue:
+            entity_name = queue.popleft()
+            levels[entity_name] = max(
+                (levels[dependency] + 1 for dependency in dependencies[entity_name]),
+                default=0,
+            )
+            for dependent in dependents[entity_name]:
+                pending_dependencies[dependent] -= 1
+                if pending_dependencies[dependent] == 0:
+                    queue.append(dependent)
+        if len(levels) != len(entities):
+            cycle = self._find_dependency_cycle(
+                dependencies=dependencies, sorted_entities=levels
+            )
+            raise TrialNetworkError(
+                message=f"Trial network descriptor contains a dependency cycle: {' -> '.join(cycle)}",
+                status_code=422,
+            )
+        ordered_entities = {
+            entity_name: entities[entity_name] for entity_name in levels
+        }
+        self.sorted_descriptor = {"trial_network": ordered_entities}
+        self.descriptor_graph = {
+            entity_name: {"level": level, "dependents": dependents[entity_name]}
+            for entity_name, level in levels.items()
+        }
+        self.deployed_descriptor = {"trial_network": dict(ordered_entities)}
 
-        def dfs(entity):
-            if entity not in entities.keys():
-                raise TrialNetworkError(
-                    "Name of the dependency does not match the name of some entity defined in the descriptor",
-                    404,
-                )
-            if entity in ordered_entities:
-                return
-            if "dependencies" in entities[entity]:
-                for dependency in entities[entity]["dependencies"]:
-                    dfs(dependency)
-            ordered_entities[entity] = entities[entity]
+    def _find_dependency_cycle(
+        self, dependencies: Dict[str, List[str]], sorted_entities: Dict
+    ) -> List[str]:
+        """
+        Find a dependency cycle among the entities that could not be sorted
 
-        for entity in entities:
-            dfs(entity)
+        :param dependencies: dependencies of each entity, ``Dict[str, List[str]]``
+        :param sorted_entities: entities that have been sorted, ``Dict``
+        :return: names of the entities of the cycle, starting and ending with the same entity, ``List[str]``
+        """
+        entity_name = next(
+            entity_name
+            for entity_name in dependencies
+            if entity_name not in sorted_entities
+        )
+        path = []
+        positions = {}
+        while entity_name not in positions:
+            positions[entity_name] = len(path)
+            path.append(entity_name)
+            entity_name = next(
+                dependency
+                for dependency in dependencies[entity_name]
+                if dependency not in sorted_entities
+            )
+        return path[positions[entity_name] :] + [entity_name]
 
-        self.sorted_descriptor = {"trial_network": ordered_entities}
-        self.deployed_descriptor = {"trial_network": ordered_entities}
+    def get_deployment_waves(self) -> List[List[str]]:
+        """
+        Group the entities pending to be deployed into waves. The entities of a wave do not depend on each other, so they can be deployed at the same time once all previous waves have been deployed
+
+        :return: list of waves, each one with the names of the entities that can be deployed concurrently, ``List[List[str]]``
+        """
+        pending_entities = self.deployed_descriptor["trial_network"]
+        graph = self.descriptor_graph
+        if graph and len(pending_entities) == len(graph):
+            levels = {
+                entity_name: graph[entity_name]["level"]
+                for entity_name in pending_entities
+            }
+        else:
+            levels = {}
+            for entity_name, entity_data in pending_entities.items():
+                level = 0
+                for dependency in entity_data.get("dependencies", []):
+                    if dependency in levels:
+                        level = max(level, levels[dependency] + 1)
+                levels[entity_name] = level
+        waves = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+        for entity_name, level in levels.items():
+            waves[level].append(entity_name)
+        return waves
 
     def set_report(self, report: str) -> None:
         """
@@ -190,6 +287,80 @@ class TrialNetworkModel(Document):
         """
         self.report = report
 
+    def get_report(self) -> str:
+        """
+        Get the trial network report, made of the markdown received from Jenkins for each entity
+
+        :return: report containing markdown data, ``str``
+        """
+        return self.report + "".join(
+            report_fragment["markdown"] for report_fragment in self.report_fragments
+        )
+
+    def get_report_etag(self) -> str:
+        """
+        Get the entity tag of the report. The report fragments are only appended, so the tag changes with each new fragment
+
+        :return: entity tag of the report, ``str``
+        """
+        return f"{self.tn_id}-{self.report_version}"
+
+    def get_report_fragments(
+        self, start: int = 0, entity_name: str = None
+    ) -> List[Dict]:
+        """
+        Get the report fragments of the trial network with their position in the report
+
+        :param start: position in the report of the first loaded fragment, ``int``
+        :param entity_name: name of the entity whose fragments are returned. If not specified, all the loaded fragments are returned, ``str``
+        :return: list of report fragments, ``List[Dict]``
+        """
+        report_fragments = []
+        for index, report_fragment in enumerate(self.report_fragments, start=start):
+            if entity_name and report_fragment["entity_name"] != entity_name:
+                continue
+            report_fragments.append(
+                {
+                    "index": index,
+                    "entity_name": report_fragment["entity_name"],
+                    "component_type": report_fragment.get("component_type"),
+                    "date_created_utc": report_fragment["date_created_utc"].isoformat()
+                    if report_fragment.get("date_created_utc")
+                    else None,
+                    "size": report_fragment.get(
+                        "size", len(report_fragment["markdown"].encode())
+                    ),
+                    "markdown": report_fragment["markdown"],
+                }
+            )
+        return report_fragments
+
+    @staticmethod
+    def push_report_fragment(
+        tn_id: str, entity_name: str, component_type: str, markdown: str
+    ) -> bool:
+        """
+        Append the markdown received from Jenkins for an entity to the report of a trial network with an atomic update
+
+        :param tn_id: trial network identifier, ``str``
+        :param entity_name: name of the entity, ``str``
+        :param component_type: type of the component of the entity, ``str``
+        :param markdown: markdown of the entity, ``str``
+        :return: whether the trial network exists, ``bool``
+        """
+        return bool(
+            TrialNetworkModel.objects(tn_id=tn_id).update_one(
+                push__report_fragments={
+                    "entity_name": entity_name,
+                    "component_type": component_type,
+                    "date_created_utc": datetime.now(timezone.utc),
+                    "size": len(markdown.encode(encoding="utf-8")),
+                    "markdown": markdown,
+                },
+                inc__report_version=1,
+            )
+        )
+
     def get_jenkins_deploy_pipeline(self) -> str:
         """
         Get pipeline use to deploy trial network
@@ -218,7 +389,7 @@ class TrialNetworkModel(Document):
         build_name: str,
         build_number: int,
         build_params: Dict,
-        build_console: str,
+        build_console_id: str,
         build_file: Dict,
     ) -> None:
         """
@@ -227,16 +398,86 @@ class TrialNetworkModel(Document):
         :param build_name: name of the build, ``str``
         :param build_number: number of the build, ``int``
         :param build_params: parameters of the build, ``Dict``
-        :param build_console: console output of the build, ``str``
+        :param build_console_id: identifier of the console output of the build stored in the jenkins_build_console collection, ``str``
         :param build_file: file output of the build, ``Dict``
         """
         self.jenkins_deploy["builds"][build_name] = {
             "build_number": build_number,
             "build_params": build_params,
-            "build_console": build_console,
+            "build_console_id": build_console_id,
             "build_file": build_file,
         }
 
+    def save_jenkins_deploy_build(
+        self,
+        build_name: str,
+        build_number: int,
+        build_params: Dict,
+        build_console_id: str,
+        build_file: Dict,
+    ) -> None:
+        """
+        Store a build for the deployment pipeline and remove its entity from the deployed descriptor with a single atomic update, so the entities deployed at the same time do not overwrite each other
+
+        :param build_name: name of the build, ``str``
+        :param build_number: number of the build, ``int``
+        :param build_params: parameters of the build, ``Dict``
+        :param build_console_id: identifier of the console output of the build stored in the jenkins_build_console collection, ``str``
+        :param build_file: file output of the build, ``Dict``
+        """
+        self.set_jenkins_deploy_build(
+            build_name=build_name,
+            build_number=build_number,
+            build_params=build_params,
+            build_console_id=build_console_id,
+            build_file=build_file,
+        )
+        self.deployed_descriptor["trial_network"].pop(build_name, None)
+        TrialNetworkModel._get_collection().update_one(
+            {"tn_id": self.tn_id},
+            {
+                "$set": {
+                    f"jenkins_deploy.builds.{build_name}": self.jenkins_deploy[
+                        "builds"
+                    ][build_name]
+                },
+                "$unset": {f"deployed_descriptor.trial_network.{build_name}": ""},
+            },
+        )
+
+    def resume_deployed_descriptor(self, failed_builds: List[str]) -> None:
+        """
+        Prepare the deployed descriptor to resume a failed activation. The entities without a verified build are deployed again together with the entities that depend on them, and the builds of the rest of the entities are kept. The deployed descriptor and the removed builds are stored with a single atomic update
+
+        :param failed_builds: names of the entities whose recorded build could not be verified in Jenkins, ``List[str]``
+        """
+        builds = self.jenkins_deploy.get("builds", {})
+        pending_entities = set(self.deployed_descriptor["trial_network"])
+        pending_entities.update(failed_builds)
+        deployed_descriptor = {}
+        removed_builds = []
+        for entity_name, entity_data in self.sorted_descriptor["trial_network"].items():
+            if (
+                entity_name in pending_entities
+                or entity_name not in builds
+                or any(
+                    dependency in deployed_descriptor
+                    for dependency in entity_data.get("dependencies", [])
+                )
+            ):
+                deployed_descriptor[entity_name] = entity_data
+                if entity_name in builds:
+                    removed_builds.append(entity_name)
+                    builds.pop(entity_name)
+        self.deployed_descriptor = {"trial_network": deployed_descriptor}
+        update = {"$set": {"deployed_descriptor": self.deployed_descriptor}}
+        if removed_builds:
+            update["$unset"] = {
+                f"jenkins_deploy.builds.{build_name}": ""
+                for build_name in removed_builds
+            }
+        TrialNetworkModel._get_collection().update_one({"tn_id": self.tn_id}, update)
+
     def get_jenkins_destroy_pipeline(self) -> str:
         """
         Get pipeline use to destroy trial network
@@ -249,20 +490,49 @@ class TrialNetworkModel(Document):
         self,
         build_number: str,
         build_params: Dict,
-        build_console: str,
+        build_console_id: str,
     ) -> None:
         """
         Set a build for the destruction pipeline
 
         :param build_number: number of the build, ``str``
         :param build_params: parameters of the build, ``Dict``
-        :param build_console: console output of the build, ``str``
+        :param build_console_id: identifier of the console output of the build stored in the jenkins_build_console collection, ``str``
         """
         self.jenkins_destroy["builds"][build_number] = {
             "build_params": build_params,
-            "build_console": build_console,
+            "build_console_id": build_console_id,
         }
 
+    def save_jenkins_destroy_build(
+        self,
+        build_number: str,
+        build_params: Dict,
+        build_console_id: str,
+    ) -> None:
+        """
+        Store a build for the destruction pipeline with an atomic update
+
+        :param build_number: number of the build, ``str``
+        :param build_params: parameters of the build, ``Dict``
+        :param build_console_id: identifier of the console output of the build stored in the jenkins_build_console collection, ``str``
+        """
+        self.set_jenkins_destroy_build(
+            build_number=build_number,
+            build_params=build_params,
+            build_console_id=build_console_id,
+        )
+        TrialNetworkModel._get_collection().update_one(
+            {"tn_id": self.tn_id},
+            {
+                "$set": {
+                    f"jenkins_destroy.builds.{build_number}": self.jenkins_destroy[
+                        "builds"
+                    ][build_number]
+                }
+            },
+        )
+
     def set_jenkins_destroy_pipeline(
         self, jenkins_destroy_pipeline: str, jenkins_destroy_pipeline_url: str
     ) -> None:
@@ -325,111 +595,184 @@ class TrialNetworkModel(Document):
         :param deployed_descriptor: deployed descriptor, ``dict``
         """
         if not deployed_descriptor:
-            self.deployed_descriptor = self.sorted_descriptor
+            self.deployed_descriptor = {
+                "trial_network": dict(self.sorted_descriptor["trial_network"])
+            }
         else:
             self.deployed_descriptor = {"trial_network": deployed_descriptor}
 
-    def _evaluate_expression(
-        self, component_input_library, expression: str, context: dict
-    ) -> bool:
-        """
-        Safely evaluate a boolean expression in the context of a dictionary, ensuring that
-        fields required in the component library are not missing.
-
-        :param component_input_library: input part in Library, ``dict``
-        :param expression: The boolean expression to evaluate, ``str``
-        :param context: The dictionary providing values for the variables in the expression, ``dict``
-        :return: The result of the evaluation, ``bool``
-        """
-
-        def _eval(node):
-            if isinstance(node, ast.BoolOp):
-                op = OPERATORS[type(node.op)]
-                return op(_eval(node.values[0]), _eval(node.values[1]))
-            elif isinstance(node, ast.BinOp):
-                op = OPERATORS[type(node.op)]
-                return op(_eval(node.left), _eval(node.right))
-            elif isinstance(node, ast.Compare):
-                left = _eval(node.left)
-                right = _eval(node.comparators[0])
-                op = OPERATORS[type(node.ops[0])]
-                return op(left, right)
-            elif isinstance(node, ast.Name):
-                field_name = node.id
-                if field_name in component_input_library:
-                    field_info = component_input_library[field_name]
-                    if field_info.get("required", False):
-                        raise ValueError(
-                            f"Field '{field_name}' is required but missing in context."
-                        )
-                return context.get(field_name, None)
-            elif isinstance(node, ast.Constant):
-                return node.value
-            raise TypeError(f"Unsupported AST node: {type(node)}")
-
-        tree = ast.parse(expression, mode="eval")
-        return _eval(tree.body)
-
     def _required_when(
         self,
-        component_input_library,
+        library_handler,
+        component_type: str,
+        input_name: str,
         input_required_when: bool | str,
         component_input: Dict,
     ) -> bool:
         """
         Function to check if the input is required
 
-        :param component_input_library: input part in Library, ``Dict``
-        :param input_required_when: boolean to check if the input is required, ``bool``
+        :param library_handler: Library handler, ``LibraryHandler``
+        :param component_type: type of the component, ``str``
+        :param input_name: name of the input, ``str``
+        :param input_required_when: boolean or expression to check if the input is required, ``bool | str``
         :param component_input: input provided in the descriptor, ``Dict``
         :return: boolean to check if the input is required, ``bool``
+        :raise LibraryError:
+        :raise ValueError:
         """
         if isinstance(input_required_when, bool):
             return input_required_when
         if isinstance(input_required_when, str):
-            return self._evaluate_expression(
-                component_input_library, input_required_when, component_input
-            )
+            return library_handler.get_required_when_predicate(
+                component_name=component_type, input_name=input_name
+            )(component_input)
+
+    def _validation_error(
+        self,
+        errors: List[Dict],
+        message: str,
+        status_code: int,
+        path: List[str],
+        entity_name: str = None,
+        field: str = None,
+        expected=None,
+    ) -> None:
+        """
+        Function to report a problem found in the descriptor. It is raised, or appended to the list of errors when all the errors are collected
 
-    def _isinstance_entity_name(self, input_type: str, input_value: str) -> None:
+        :param errors: list where the errors are collected, or None to raise the first one, ``List[Dict]``
+        :param message: description of the problem, ``str``
+        :param status_code: HTTP status code of the problem, ``int``
+        :param path: keys from the root of the descriptor to the value with the problem, ``List[str]``
+        :param entity_name: name of the entity, ``str``
+        :param field: key of the definition or name of the input with the problem, ``str``
+        :param expected: expected type or choices of the value, ``Any``
+        :raise TrialNetworkError:
+        """
+        if errors is None:
+            raise TrialNetworkError(message=message, status_code=status_code)
+        errors.append(
+            {
+                "entity": entity_name,
+                "field": field,
+                "expected": expected,
+                "path": "$"
+                + "".join(
+                    f".{key}"
+                    if key.isidentifier()
+                    else f"[{key}]"
+                    if key.isdigit()
+                    else f"['{key}']"
+                    for key in path
+                ),
+                "message": message,
+                "status_code": status_code,
+            }
+        )
+
+    def _isinstance_entity_name(
+        self,
+        input_type: str,
+        input_value: str,
+        errors: List[Dict] = None,
+        path: List[str] = None,
+        entity_name: str = None,
+        field: str = None,
+    ) -> None:
         """
         Function to check if the input is an entity name
 
         :param input_type: type of the input, ``str``
         :param input_value: value of the input, ``str``
+        :param errors: list where the errors are collected, or None to raise the first one, ``List[Dict]``
+        :param path: keys from the root of the descriptor to the input, ``List[str]``
+        :param entity_name: name of the entity that has the input, ``str``
+        :param field: name of the input, ``str``
+        :raise TrialNetworkError:
         """
         if input_value == "tn_vxlan":
             if (
                 "tn_init" not in self.raw_descriptor["trial_network"]
                 and "tn_vxlan" not in self.raw_descriptor["trial_network"]
             ):
-                raise TrialNetworkError(
+                self._validation_error(
+                    errors=errors,
                     message="Trial network descriptor entity tn_vxlan is not allowed without entity tn_init",
                     status_code=422,
+                    path=path or [],
+                    entity_name=entity_name,
+                    field=field,
+                    expected=input_type,
                 )
         else:
-            if input_value not in self.raw_descriptor["trial_network"]:
-                raise TrialNetworkError(
+            if (
+                not isinstance(input_value, str)
+                or input_value not in self.raw_descriptor["trial_network"]
+            ):
+                self._validation_error(
+                    errors=errors,
                     message=f"Trial network descriptor entity {input_value} not found",
                     status_code=422,
+                    path=path or [],
+                    entity_name=entity_name,
+                    field=field,
+                    expected=input_type,
                 )
+                return
             type_component = self.raw_descriptor["trial_network"][input_value]["type"]
             if type_component not in input_type:
-                raise TrialNetworkError(
+                self._validation_error(
+                    errors=errors,
                     message=f"Trial network descriptor entity {input_value} has to be of type {type_component}",
                     status_code=422,
+                    path=path or [],
+                    entity_name=entity_name,
+                    field=field,
+                    expected=input_type,
                 )
 
-    def _isinstance_list(self, input_type: str, input_value: List) -> None:
+    def _isinstance_list(
+        self,
+        input_type: str,
+        input_value: List,
+        errors: List[Dict] = None,
+        path: List[str] = None,
+        entity_name: str = None,
+        field: str = None,
+    ) -> None:
         """
         Function to check if the input is a list
 
         :param input_type: type of the input, ``str``
         :param input_value: value of the input, ``List``
+        :param errors: list where the errors are collected, or None to raise the first one, ``List[Dict]``
+        :param path: keys from the root of the descriptor to the input, ``List[str]``
+        :param entity_name: name of the entity that has the input, ``str``
+        :param field: name of the input, ``str``
+        :raise TrialNetworkError:
         """
+        if not isinstance(input_value, List):
+            self._validation_error(
+                errors=errors,
+                message=f"Trial network descriptor entity name {entity_name} input {field} has to be of type {input_type}",
+                status_code=422,
+                path=path or [],
+                entity_name=entity_name,
+                field=field,
+                expected=input_type,
+            )
+            return
         input_type = input_type[5:-1]
-        for value in input_value:
-            self._isinstance_entity_name(input_type, value)
+        for index, value in enumerate(input_value):
+            self._isinstance_entity_name(
+                input_type,
+                value,
+                errors=errors,
+                path=(path or []) + [str(index)],
+                entity_name=entity_name,
+                field=field,
+            )
 
     def _boolean_expression(self, input_type: str) -> bool:
         """
@@ -438,9 +781,7 @@ class TrialNetworkModel(Document):
         :param input_type: type of the input, ``str``
         :return: boolean to check if the input is a boolean expression, ``bool``
         """
-        return bool(
-            re.match(r"^(\w+\s*(and|or)\s*\w+(\s*(and|or)\s*\w+)*)$", input_type)
-        )
+        return bool(BOOLEAN_EXPRESSION_PATTERN.match(input_type))
 
     def _isinstance_component(self, input_type: str, library_handler) -> bool:
         """
@@ -450,7 +791,7 @@ class TrialNetworkModel(Document):
         :param library_handler: Library handler, ``LibraryHandler``
         :return: boolean to check if the input is a component, ``bool``
         """
-        return input_type in library_handler.get_components()
+        return library_handler.is_component(component_name=input_type)
 
     def _check_input(
         self,
@@ -459,6 +800,7 @@ class TrialNetworkModel(Document):
         library_handler,
         component_input: Dict,
         component_input_library: Dict,
+        errors: List[Dict] = None,
     ) -> None:
         """
         Function to check if the input provided in the descriptor is correct
@@ -468,185 +810,379 @@ class TrialNetworkModel(Document):
         :param library_handler: Library handler, ``LibraryHandler``
         :param component_input: input provided in the descriptor, ``Dict``
         :param component_input_library: input part in Library, ``Dict``
+        :param errors: list where the errors are collected, or None to raise the first one, ``List[Dict]``
         :raise TrialNetworkError:
         """
+        input_path = ["trial_network", entity_name, "input"]
         if (
             component_input_library is None or len(component_input_library) == 0
         ) and len(component_input) > 0:
-            raise TrialNetworkError(
+            self._validation_error(
+                errors=errors,
                 message=f"Trial network descriptor entity name {entity_name} not require input",
                 status_code=422,
+                path=input_path,
+                entity_name=entity_name,
+                field="input",
             )
         if component_input_library is not None:
             for key, value in component_input_library.items():
                 if "type" not in value:
-                    raise TrialNetworkError(
+                    self._validation_error(
+                        errors=errors,
                         message=f"Input {key} of component {component_type} does not contain the key type in 6G-Library definition. Contact component owner or create a issue in the 6G-Library repository",
                         status_code=422,
+                        path=input_path + [key],
+                        entity_name=entity_name,
+                        field=key,
                     )
+                    continue
                 input_type = value["type"]
                 if "required_when" not in value:
-                    raise TrialNetworkError(
+                    self._validation_error(
+                        errors=errors,
                         message=f"Input {key} of component {component_type} does not contain the key required_when in 6G-Library definition. Contact component owner or create a issue in the 6G-Library repository",
                         status_code=422,
+                        path=input_path + [key],
+                        entity_name=entity_name,
+                        field=key,
                     )
+                    continue
                 input_required_when = value["required_when"]
-                if (
-                    self._required_when(
-                        component_input_library, input_required_when, component_input
+                try:
+                    input_required = self._required_when(
+                        library_handler,
+                        component_type,
+                        key,
+                        input_required_when,
+                        component_input,
                     )
-                    and key not in component_input
-                ):
-                    raise TrialNetworkError(
+                except ValueError as e:
+                    if errors is None:
+                        raise
+                    self._validation_error(
+                        errors=errors,
+                        message=f"Trial network descriptor entity name {entity_name} input {key} cannot be checked: {e}",
+                        status_code=422,
+                        path=input_path + [key],
+                        entity_name=entity_name,
+                        field=key,
+                        expected=input_type,
+                    )
+                    input_required = False
+                if input_required and key not in component_input:
+                    self._validation_error(
+                        errors=errors,
                         message=f"Trial network descriptor entity name {entity_name} requires input {key}",
                         status_code=422,
+                        path=input_path + [key],
+                        entity_name=entity_name,
+                        field=key,
+                        expected=input_type,
                     )
                 if key in component_input:
                     if input_type.startswith("list[") and input_type.endswith("]"):
-                        self._isinstance_list(input_type, component_input[key])
-                    elif self._boolean_expression(input_type):
-                        self._isinstance_entity_name(input_type, component_input[key])
-                    elif self._isinstance_component(input_type, library_handler):
-                        self._isinstance_entity_name(input_type, component_input[key])
+                        self._isinstance_list(
+                            input_type,
+                            component_input[key],
+                            errors=errors,
+                            path=input_path + [key],
+                            entity_name=entity_name,
+                            field=key,
+                        )
+                    elif self._boolean_expression(input_type) or (
+                        self._isinstance_component(input_type, library_handler)
+                    ):
+                        self._isinstance_entity_name(
+                            input_type,
+                            component_input[key],
+                            errors=errors,
+                            path=input_path + [key],
+                            entity_name=entity_name,
+                            field=key,
+                        )
                     elif input_type in TYPE_MAPPING and not isinstance(
                         component_input[key], TYPE_MAPPING[input_type]
                     ):
-                        raise TrialNetworkError(
+                        self._validation_error(
+                            errors=errors,
                             message=f"Trial network descriptor entity name {entity_name} input {key} has to be of type {input_type}",
                             status_code=422,
+                            path=input_path + [key],
+                            entity_name=entity_name,
+                            field=key,
+                            expected=input_type,
                         )
                     if (
                         "choices" in value
                         and component_input[key] not in value["choices"]
                     ):
                         choices = value["choices"]
-                        raise TrialNetworkError(
+                        self._validation_error(
+                            errors=errors,
                             message=f"Trial network descriptor entity name {entity_name} input {key} has to be one of the following choices: {choices}",
                             status_code=422,
+                            path=input_path + [key],
+                            entity_name=entity_name,
+                            field=key,
+                            expected=list(choices),
                         )
 
-    def validate_descriptor(self, library_handler, sites_handler) -> None:
+    def validate_descriptor(
+        self, library_handler, sites_handler, collect_errors: bool = False
+    ) -> List[Dict]:
         """
         Function to validate the descriptor
 
         :param library_handler: Library handler, ``LibraryHandler``
         :param sites_handler: Sites handler, ``SitesHandler``
+        :param collect_errors: if true, the whole descriptor is checked and all the errors are returned instead of raising the first one, ``bool``
+        :return: errors found in the descriptor, each one with the entity, the field, the expected type or choices, the JSON path and the message. Empty if the errors are raised, ``List[Dict]``
         :raise TrialNetworkError:
         """
-        if len(self.raw_descriptor) == 0:
-            raise TrialNetworkError(
-                message="Trial network descriptor is empty", status_code=422
+        errors = [] if collect_errors else None
+        if not self.raw_descriptor:
+            self._validation_error(
+                errors=errors,
+                message="Trial network descriptor is empty",
+                status_code=422,
+                path=[],
             )
+            return errors or []
         if "trial_network" not in self.raw_descriptor:
-            raise TrialNetworkError(
+            self._validation_error(
+                errors=errors,
                 message="Trial network descriptor does not contain the trial_network key at the beginning",
                 status_code=422,
+                path=[],
             )
-        if self.raw_descriptor["trial_network"] is None:
-            raise TrialNetworkError(
+            return errors
+        entities = self.raw_descriptor["trial_network"]
+        if entities is None:
+            self._validation_error(
+                errors=errors,
                 message="Trial network descriptor does not contain any entity",
                 status_code=422,
+                path=["trial_network"],
             )
-        if "tn_init" not in self.raw_descriptor["trial_network"] and (
-            "tn_vxlan" not in self.raw_descriptor["trial_network"]
-            and "tn_bastion" not in self.raw_descriptor["trial_network"]
+            return errors
+        if "tn_init" not in entities and (
+            "tn_vxlan" not in entities and "tn_bastion" not in entities
         ):
-            raise TrialNetworkError(
+            self._validation_error(
+                errors=errors,
                 message="Trial network descriptor does not contain the mandatory entities tn_init or tn_vxlan and tn_bastion",
                 status_code=422,
+                path=["trial_network"],
             )
-        for entity_name, entity_data in self.raw_descriptor["trial_network"].items():
+        sortable = True
+        for entity_name, entity_data in entities.items():
+            entity_path = ["trial_network", str(entity_name)]
             if not isinstance(entity_name, str):
-                raise TrialNetworkError(
+                self._validation_error(
+                    errors=errors,
                     message=f"Trial network descriptor entity name {entity_name} has to be a string",
                     status_code=422,
+                    path=entity_path,
+                    entity_name=str(entity_name),
                 )
+                sortable = False
+                continue
             if entity_name == "":
-                raise TrialNetworkError(
+                self._validation_error(
+                    errors=errors,
                     message=f"Trial network descriptor entity name {entity_name} is empty",
                     status_code=422,
+                    path=entity_path,
+                    entity_name=entity_name,
                 )
+                sortable = False
+                continue
             if not isinstance(entity_data, Dict):
-                raise TrialNetworkError(
+                self._validation_error(
+                    errors=errors,
                     message=f"Trial network descriptor definition of entity {entity_name} has to be a dictionary",
                     status_code=422,
+                    path=entity_path,
+                    entity_name=entity_name,
+                    expected="dict",
                 )
+                sortable = False
+                continue
             if entity_data == {}:
-                raise TrialNetworkError(
+                self._validation_error(
+                    errors=errors,
                     message=f"Trial network descriptor entity {entity_name} has empty definition and must have defined type, dependencies and input",
                     status_code=422,
+                    path=entity_path,
+                    entity_name=entity_name,
                 )
-            for key in REQUIRED_FIELDS_DESCRIPTOR:
+                sortable = False
+                continue
+            missing_keys = False
+            for key in sorted(REQUIRED_FIELDS_DESCRIPTOR):
                 if key not in entity_data:
-                    raise TrialNetworkError(
+                    self._validation_error(
+                        errors=errors,
                         message=f"Trial network descriptor entity {entity_name} does not contain the key {key} in the definition",
                         status_code=422,
+                        path=entity_path + [key],
+                        entity_name=entity_name,
+                        field=key,
                     )
+                    missing_keys = True
+            if missing_keys:
+                sortable = False
+                continue
             component_type = entity_data["type"]
             component_dependencies = entity_data["dependencies"]
             component_input = entity_data["input"]
             if not isinstance(component_type, str):
-                raise TrialNetworkError(
+                self._validation_error(
+                    errors=errors,
                     message=f"Trial network descriptor entity {entity_name} the key type in the definition has to be a string",
                     status_code=422,
+                    path=entity_path + ["type"],
+                    entity_name=entity_name,
+                    field="type",
+                    expected="str",
                 )
+                sortable = False
+                continue
             if component_type == "":
-                raise TrialNetworkError(
+                self._validation_error(
+                    errors=errors,
                     message=f"Trial network descriptor entity {entity_name} the key type in the definition is empty",
                     status_code=422,
+                    path=entity_path + ["type"],
+                    entity_name=entity_name,
+                    field="type",
                 )
+                sortable = False
+                continue
             if not isinstance(component_dependencies, List):
-                raise TrialNetworkError(
+                self._validation_error(
+                    errors=errors,
                     message=f"Trial network descriptor entity {entity_name} the key dependencies in the definition has to be a list",
                     status_code=422,
+                    path=entity_path + ["dependencies"],
+                    entity_name=entity_name,
+                    field="dependencies",
+                    expected="list",
                 )
+                sortable = False
+            else:
+                for index, dependency in enumerate(component_dependencies):
+                    if not isinstance(dependency, str) or dependency not in entities:
+                        self._validation_error(
+                            errors=errors,
+                            message=f"Trial network descriptor entity {entity_name} dependency {dependency} does not match the name of some entity defined in the descriptor",
+                            status_code=404,
+                            path=entity_path + ["dependencies", str(index)],
+                            entity_name=entity_name,
+                            field="dependencies",
+                        )
+                        sortable = False
             if not isinstance(component_input, Dict):
-                raise TrialNetworkError(
+                self._validation_error(
+                    errors=errors,
                     message=f"Trial network descriptor entity {entity_name} the key input in the definition has to be a dictionary",
                     status_code=422,
+                    path=entity_path + ["input"],
+                    entity_name=entity_name,
+                    field="input",
+                    expected="dict",
                 )
+                component_input = None
             if component_type in COMPONENTS_EXCLUDE_CUSTOM_NAME:
                 if "name" in entity_data:
-                    raise TrialNetworkError(
+                    self._validation_error(
+                        errors=errors,
                         message=f"Trial network descriptor entity {entity_name} does not require the key name. Only tn_vxlan, tn_bastion, tn_init and tsn are excluded",
                         status_code=422,
+                        path=entity_path + ["name"],
+                        entity_name=entity_name,
+                        field="name",
                     )
             else:
                 if "name" not in entity_data:
-                    raise TrialNetworkError(
+                    self._validation_error(
+                        errors=errors,
                         message=f"Trial network entity {entity_name} does not contain the key name in the definition",
                         status_code=422,
+                        path=entity_path + ["name"],
+                        entity_name=entity_name,
+                        field="name",
                     )
-                name = entity_data["name"]
-                if not isinstance(name, str):
-                    raise TrialNetworkError(
-                        message=f"Entity {entity_name} name has to be a string",
-                        status_code=422,
-                    )
-                if name == "":
-                    raise TrialNetworkError(
-                        message=f"Trial network descriptor entity {entity_name} the key name in the definition is empty",
-                        status_code=422,
-                    )
-                if entity_name != f"{component_type}-{name}":
-                    raise TrialNetworkError(
-                        message=f"Trial network descriptor entity {entity_name} does not match with the union of component type and name which is {component_type}-{name}",
-                        status_code=422,
+                else:
+                    name = entity_data["name"]
+                    if not isinstance(name, str):
+                        self._validation_error(
+                            errors=errors,
+                            message=f"Entity {entity_name} name has to be a string",
+                            status_code=422,
+                            path=entity_path + ["name"],
+                            entity_name=entity_name,
+                            field="name",
+                            expected="str",
+                        )
+                    elif name == "":
+                        self._validation_error(
+                            errors=errors,
+                            message=f"Trial network descriptor entity {entity_name} the key name in the definition is empty",
+                            status_code=422,
+                            path=entity_path + ["name"],
+                            entity_name=entity_name,
+                            field="name",
+                        )
+                    elif entity_name != f"{component_type}-{name}":
+                        self._validation_error(
+                            errors=errors,
+                            message=f"Trial network descriptor entity {entity_name} does not match with the union of component type and name which is {component_type}-{name}",
+                            status_code=422,
+                            path=entity_path,
+                            entity_name=entity_name,
+                            expected=f"{component_type}-{name}",
+                        )
+            try:
+                library_handler.is_component_library(component_name=component_type)
+                sites_handler.validate_component_available_site(
+                    deployment_site=self.deployment_site, component_name=component_type
+                )
+                component_input_library = library_handler.get_component_input(
+                    component_name=component_type
+                )
+                if component_input is not None:
+                    self._check_input(
+                        entity_name=entity_name,
+                        component_type=component_type,
+                        library_handler=library_handler,
+                        component_input=component_input,
+                        component_input_library=component_input_library,
+                        errors=errors,
                     )
-            library_handler.is_component_library(component_name=component_type)
-            sites_handler.validate_component_available_site(
-                deployment_site=self.deployment_site, component_name=component_type
-            )
-            component_input_library = library_handler.get_component_input(
-                component_name=component_type
-            )
-            self._check_input(
-                entity_name=entity_name,
-                component_type=component_type,
-                library_handler=library_handler,
-                component_input=component_input,
-                component_input_library=component_input_library,
-            )
+            except CustomException as e:
+                if errors is None:
+                    raise
+                self._validation_error(
+                    errors=errors,
+                    message=str(e.message),
+                    status_code=e.status_code,
+                    path=entity_path + ["type"],
+                    entity_name=entity_name,
+                    field="type",
+                )
+        if errors is not None and sortable:
+            try:
+                self.set_sorted_descriptor()
+            except TrialNetworkError as e:
+                self._validation_error(
+                    errors=errors,
+                    message=str(e.message),
+                    status_code=e.status_code,
+                    path=["trial_network"],
+                )
+        return errors or []
 
     def to_dict_debug_commit_id(self) -> Dict:
         return {
@@ -688,6 +1224,15 @@ class TrialNetworkModel(Document):
             "sites_commit_id": self.sites_commit_id,
         }
 
+    def to_dict_summary(self) -> Dict:
+        return {
+            "user_created": self.user_created,
+            "tn_id": self.tn_id,
+            "state": self.state,
+            "date_created_utc": self.date_created_utc.isoformat(),
+            "deployment_site": self.deployment_site,
+        }
+
     def to_dict_full(self) -> Dict:
         return {
             "user_created": self.user_created,
@@ -697,7 +1242,7 @@ class TrialNetworkModel(Document):
             "raw_descriptor": self.raw_descriptor,
             "sorted_descriptor": self.sorted_descriptor,
             "deployed_descriptor": self.deployed_descriptor,
-            "report": self.report,
+            "report": self.get_report(),
             "directory_path": self.directory_path,
             "jenkins_deploy": self.jenkins_deploy,
             "jenkins_destroy": self.jenkins_destroy,
@@ -5,6 +5,8 @@ from jwt.exceptions import PyJWTError
 
 from conf.jenkins import JenkinsSettings
 from core.exceptions.exceptions import CustomException
+from core.jenkins.jenkins_handler import notify_build_completion
+from core.models.jenkins_build_event import JenkinsBuildEventModel
 from core.models.trial_network import TrialNetworkModel
 from core.utils.parser import decode_base64
 
@@ -60,7 +62,6 @@ class Callback(Resource):
         """
         Save Jenkins results when deploy a component
         """
-        trial_network = None
         try:
             client_ip = request.remote_addr
             if client_ip != JenkinsSettings.JENKINS_HOST:
@@ -84,15 +85,15 @@ class Callback(Resource):
                 else component_type
             )
 
-            trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
-            if not trial_network:
+            if not TrialNetworkModel.push_report_fragment(
+                tn_id=tn_id,
+                entity_name=entity_name,
+                component_type=component_type,
+                markdown=markdown,
+            ):
                 return {
                     "message": f"No trial network with the name {tn_id} in database"
                 }, 404
-            report = trial_network.report
-            report += markdown
-            trial_network.set_report(report=report)
-            trial_network.save()
             return {
                 "message": f"Results of the entity {entity_name} received by Jenkins saved successfully"
             }, 200
@@ -100,3 +101,78 @@ class Callback(Resource):
             return {"message": str(e)}, e.status_code
         except Exception as e:
             return abort(code=500, message=str(e))
+
+
+@callback_namespace.route("/build")
+class BuildCallback(Resource):
+    parser_post = reqparse.RequestParser()
+    parser_post.add_argument(
+        "tn_id",
+        type=str,
+        required=True,
+        location="json",
+        help="Trial network identifier. It should be a string",
+    )
+    parser_post.add_argument(
+        "pipeline_name",
+        type=str,
+        required=True,
+        location="json",
+        help="Name of the pipeline that run the build. It should be a string",
+    )
+    parser_post.add_argument(
+        "build_number",
+        type=str,
+        required=True,
+        location="json",
+        help="Number of the build. It should be a string",
+    )
+    parser_post.add_argument(
+        "result",
+        type=str,
+        required=True,
+        location="json",
+        help="Result of the build. It should be a string",
+    )
+
+    @callback_namespace.errorhandler(PyJWTError)
+    @callback_namespace.errorhandler(JWTExtendedException)
+    @callback_namespace.expect(parser_post)
+    def post(self):
+        """
+        Save the completion of a Jenkins build
+        """
+        try:
+            client_ip = request.remote_addr
+            if client_ip != JenkinsSettings.JENKINS_HOST:
+                return {
+                    "message": "Invalid host. Request not allowed. Only Jenkins host is allowed"
+                }, 403
+            tn_id = decode_base64(encoded_data=self.parser_post.parse_args()["tn_id"])
+            pipeline_name = decode_base64(
+                encoded_data=self.parser_post.parse_args()["pipeline_name"]
+            )
+            build_number = int(
+                decode_base64(
+                    encoded_data=self.parser_post.parse_args()["build_number"]
+                )
+            )
+            result = decode_base64(encoded_data=self.parser_post.parse_args()["result"])
+
+            if not TrialNetworkModel.objects(tn_id=tn_id).first():
+                return {
+                    "message": f"No trial network with the name {tn_id} in database"
+                }, 404
+            JenkinsBuildEventModel.objects(
+                pipeline_name=pipeline_name, build_number=build_number
+            ).update_one(set__tn_id=tn_id, set__result=result, upsert=True)
+            notify_build_completion(
+                pipeline_name=pipeline_name, build_number=build_number
+            )
+            return {
+                "message": f"Completion of the build {build_number} of the pipeline {pipeline_name} received by Jenkins saved successfully"
+            }, 200
+        except CustomException as e:
+            return {"message": str(e)}, e.status_code
+        except Exception as e:
+            return abort(code=500, message=str(e))
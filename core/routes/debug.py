@@ -3,10 +3,9 @@ from flask_jwt_extended.exceptions import JWTExtendedException
 from flask_restx import Namespace, Resource, abort
 from jwt.exceptions import PyJWTError
 
-from core.auth.auth import get_current_user_from_jwt
+from core.auth.auth import get_current_user_from_jwt, get_user_trial_network
 from core.exceptions.exceptions import CustomException
 from core.library.library_handler import LibraryHandler
-from core.models.trial_network import TrialNetworkModel
 from core.sites.sites_handler import SitesHandler
 
 debug_namespace = Namespace(
@@ -43,11 +42,9 @@ class ChangeCommitLibrary(Resource):
         """
         try:
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
             trial_network.set_library_commit_id(library_commit_id=commit_id)
             trial_network.save()
             library_handler = LibraryHandler(
@@ -92,11 +89,9 @@ class ChangeCommitSites(Resource):
         """
         try:
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
             trial_network.set_sites_commit_id(sites_commit_id=commit_id)
             trial_network.save()
             sites_handler = SitesHandler(
@@ -143,11 +138,9 @@ class AddDebugEntityName(Resource):
         """
         try:
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
             raw_descriptor = trial_network.raw_descriptor
             sorted_descriptor = trial_network.sorted_descriptor
             deployed_descriptor = trial_network.deployed_descriptor
@@ -185,11 +178,9 @@ class RemoveDebugEntityName(Resource):
         """
         try:
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
             raw_descriptor = trial_network.raw_descriptor["trial_network"]
             sorted_descriptor = trial_network.sorted_descriptor["trial_network"]
             deployed_descriptor = trial_network.deployed_descriptor["trial_network"]
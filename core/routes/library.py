@@ -39,16 +39,13 @@ class ReferenceType(Resource):
                     "message": f"Library reference type {reference_type} is not valid"
                 }, 400
             library_handler = LibraryHandler()
-            library_handler.git_client.clone()
-            library_handler.git_client.fetch_prune()
-            library_handler.git_client.checkout()
-            library_handler.git_client.pull()
+            library_handler.git_client.update_mirror()
             if reference_type == "branch":
                 library_reference_value = library_handler.branches()
             elif reference_type == "tag":
-                library_reference_value = library_handler.git_client.tags()
+                library_reference_value = library_handler.tags()
             else:
-                library_reference_value = library_handler.git_client.commits()
+                library_reference_value = library_handler.commits()
             return {f"{reference_type}": library_reference_value}, 200
         except CustomException as e:
             return {"message": str(e.message)}, e.status_code
@@ -71,16 +68,11 @@ class Components(Resource):
         Retrieve library components
         """
         try:
-            library_handler = LibraryHandler()
-            library_handler.git_client.clone()
-            library_handler.git_client.fetch_prune()
-            library_handler.git_client.checkout()
-            library_handler.git_client.pull()
             library_handler = LibraryHandler(
                 reference_type=reference_type,
                 reference_value=reference_value,
             )
-            library_handler.git_client.checkout()
+            library_handler.git_client.update_mirror()
             components = library_handler.get_components()
             return {"components": components}, 200
         except CustomException as e:
@@ -114,16 +106,11 @@ class Component(Resource):
         Retrieve library component information
         """
         try:
-            library_handler = LibraryHandler()
-            library_handler.git_client.clone()
-            library_handler.git_client.fetch_prune()
-            library_handler.git_client.checkout()
-            library_handler.git_client.pull()
             library_handler = LibraryHandler(
                 reference_type=reference_type,
                 reference_value=reference_value,
             )
-            library_handler.git_client.checkout()
+            library_handler.git_client.update_mirror()
             library_handler.is_component_library(component_name=component_name)
             component_input = library_handler.get_component(
                 component_name=component_name
@@ -152,16 +139,11 @@ class TrialNetworksTemplates(Resource):
         Retrieve trial networks templates
         """
         try:
-            library_handler = LibraryHandler()
-            library_handler.git_client.clone()
-            library_handler.git_client.fetch_prune()
-            library_handler.git_client.checkout()
-            library_handler.git_client.pull()
             library_handler = LibraryHandler(
                 reference_type=reference_type,
                 reference_value=reference_value,
             )
-            library_handler.git_client.checkout()
+            library_handler.git_client.update_mirror()
             return {
                 "trial_networks_templates": library_handler.get_trial_networks_templates()
             }, 200
@@ -191,16 +173,11 @@ class TrialNetworksTemplatesComponent(Resource):
         Retrieve trial networks templates component
         """
         try:
-            library_handler = LibraryHandler()
-            library_handler.git_client.clone()
-            library_handler.git_client.fetch_prune()
-            library_handler.git_client.checkout()
-            library_handler.git_client.pull()
             library_handler = LibraryHandler(
                 reference_type=reference_type,
                 reference_value=reference_value,
             )
-            library_handler.git_client.checkout()
+            library_handler.git_client.update_mirror()
             library_handler.is_component_library(component_name=component_name)
             trial_networks_templates_component = (
                 library_handler.get_trial_networks_templates_component(
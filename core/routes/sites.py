@@ -7,8 +7,7 @@ from jwt.exceptions import PyJWTError
 from core.auth.auth import get_current_user_from_jwt
 from core.exceptions.exceptions import CustomException
 from core.sites.sites_handler import SitesHandler
-from core.utils.os import join_path, list_dirs_no_hidden
-from core.utils.parser import ansible_decrypt
+from core.utils.os import list_dirs_no_hidden
 
 sites_namespace = Namespace(
     name="sites",
@@ -113,11 +112,8 @@ class ComponentsAvailable(Resource):
             sites_handler.git_client.checkout()
             sites_handler.git_client.pull()
             sites_handler.validate_deployment_site(deployment_site=deployment_site)
-            ansible_decrypt(
-                data_path=join_path(
-                    sites_handler.sites_local_directory, deployment_site, "core.yaml"
-                ),
-                token=deployment_site_token,
+            sites_handler.decrypt_deployment_site(
+                deployment_site=deployment_site, token=deployment_site_token
             )
             return {
                 "components": sites_handler.get_available_components_names(
@@ -1,31 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
 from threading import Lock
 
-from flask import send_file
+from flask import request, send_file
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from flask_jwt_extended.exceptions import JWTExtendedException
-from flask_restx import Namespace, Resource, abort, reqparse
+from flask_restx import Namespace, Resource, abort, inputs, reqparse
 from jwt.exceptions import PyJWTError
+from mongoengine import Q
 from werkzeug.datastructures import FileStorage
 
 from conf.jenkins import JenkinsSettings
 from conf.sites import SitesSettings
-from core.auth.auth import get_current_user_from_jwt
+from core.auth.auth import get_current_user_from_jwt, get_user_trial_network
 from core.exceptions.exceptions import CustomException
 from core.jenkins.jenkins_handler import JenkinsHandler
+from core.jobs.job_handler import job_handler
 from core.library.library_handler import LIBRARY_REFERENCES_TYPES, LibraryHandler
 from core.library.report_generator import ReportGenerator
 from core.logs.log_handler import TrialNetworkLogger
-from core.models.resource_manager import ResourceManagerModel
-from core.models.trial_network import TrialNetworkModel
+from core.models.jenkins_build_console import JenkinsBuildConsoleModel
+from core.models.jenkins_build_event import JenkinsBuildEventModel
+from core.models.jenkins_pipeline import JenkinsPipelineModel
+from core.models.job import JobModel
+from core.models.trial_network import (
+    STATE_MACHINE,
+    TRIAL_NETWORK_SUMMARY_FIELDS,
+    TrialNetworkModel,
+)
 from core.sites.sites_handler import SitesHandler
-from core.utils.file import load_file, save_file
+from core.utils.file import save_file
 from core.utils.os import (
     TRIAL_NETWORKS_PATH,
     is_file,
     join_path,
     remove_directory,
 )
-from core.utils.parser import ansible_decrypt
+from core.utils.parser import decode_base64, encode_base64, is_base64
 
 trial_network_namespace = Namespace(
     name="trial-network",
@@ -41,7 +53,11 @@ trial_network_namespace = Namespace(
 )
 
 tn_id_lock = Lock()
-tn_resource_manager_lock = Lock()
+TRIAL_NETWORKS_VIEWS = ["full", "summary"]
+TRIAL_NETWORKS_MAX_LIMIT = 1000
+REPORT_FRAGMENTS_MAX_SLICE = 2**31 - 1
+VALIDATION_MAX_DESCRIPTORS = 1000
+VALIDATION_WORKERS = 8
 
 
 @trial_network_namespace.route("/legacy")
@@ -167,12 +183,8 @@ class CreateValidateTrialNetworkSpecificSite(Resource):
             sites_handler.validate_deployment_site(
                 deployment_site=SitesSettings.SITES_DEPLOYMENT_SITE
             )
-            ansible_decrypt(
-                data_path=join_path(
-                    sites_handler.sites_local_directory,
-                    SitesSettings.SITES_DEPLOYMENT_SITE,
-                    "core.yaml",
-                ),
+            sites_handler.decrypt_deployment_site(
+                deployment_site=SitesSettings.SITES_DEPLOYMENT_SITE,
                 token=SitesSettings.SITES_DEPLOYMENT_SITE_TOKEN,
             )
             trial_network.set_sites_https_url(
@@ -189,9 +201,18 @@ class CreateValidateTrialNetworkSpecificSite(Resource):
             TrialNetworkLogger(tn_id=trial_network.tn_id).info(
                 message="Trial network validating. In this transition, the trial network descriptor is going to be validated"
             )
-            trial_network.validate_descriptor(
-                library_handler=library_handler, sites_handler=sites_handler
+            errors = trial_network.validate_descriptor(
+                library_handler=library_handler,
+                sites_handler=sites_handler,
+                collect_errors=True,
             )
+            if errors:
+                trial_network.set_state(state="created")
+                trial_network.save()
+                return {
+                    "message": errors[0]["message"],
+                    "errors": errors,
+                }, errors[0]["status_code"]
             trial_network.set_sorted_descriptor()
             trial_network.set_state(state="validated")
             trial_network.save()
@@ -444,13 +465,8 @@ class CreateValidateTrialNetwork(Resource):
                 sites_handler.git_client.fetch_prune()
                 sites_handler.git_client.checkout()
                 sites_handler.validate_deployment_site(deployment_site=deployment_site)
-                ansible_decrypt(
-                    data_path=join_path(
-                        sites_handler.sites_local_directory,
-                        deployment_site,
-                        "core.yaml",
-                    ),
-                    token=deployment_site_token,
+                sites_handler.decrypt_deployment_site(
+                    deployment_site=deployment_site, token=deployment_site_token
                 )
                 trial_network.set_sites_https_url(
                     sites_https_url=sites_handler.sites_https_url
@@ -464,9 +480,18 @@ class CreateValidateTrialNetwork(Resource):
                 TrialNetworkLogger(tn_id=trial_network.tn_id).info(
                     message="Trial network validating. In this transition, the trial network descriptor is going to be validated"
                 )
-                trial_network.validate_descriptor(
-                    library_handler=library_handler, sites_handler=sites_handler
+                errors = trial_network.validate_descriptor(
+                    library_handler=library_handler,
+                    sites_handler=sites_handler,
+                    collect_errors=True,
                 )
+                if errors:
+                    trial_network.set_state(state="created")
+                    trial_network.save()
+                    return {
+                        "message": errors[0]["message"],
+                        "errors": errors,
+                    }, errors[0]["status_code"]
                 trial_network.set_sorted_descriptor()
                 trial_network.set_state(state="validated")
                 trial_network.save()
@@ -488,25 +513,290 @@ class CreateValidateTrialNetwork(Resource):
 
 @trial_network_namespace.route("s")
 class TrialNetworks(Resource):
+    parser_get = reqparse.RequestParser()
+    parser_get.add_argument(
+        "view",
+        type=str,
+        required=False,
+        location="args",
+        choices=TRIAL_NETWORKS_VIEWS,
+        default="full",
+        help="Fields returned for each trial network. It is optional. If not specified, **full** will be used. **summary** only returns the identifier, user, state, creation date and deployment site",
+    )
+    parser_get.add_argument(
+        "state",
+        type=str,
+        required=False,
+        location="args",
+        choices=sorted(STATE_MACHINE),
+        help="State of the trial networks to be returned. It is optional",
+    )
+    parser_get.add_argument(
+        "user_created",
+        type=str,
+        required=False,
+        location="args",
+        help="User that created the trial networks to be returned. It is optional and only used by admin users",
+    )
+    parser_get.add_argument(
+        "limit",
+        type=int,
+        required=False,
+        location="args",
+        help=f"Maximum number of trial networks to be returned, from the most recent ones. It is optional. If not specified, all the trial networks are returned. Maximum **{TRIAL_NETWORKS_MAX_LIMIT}**",
+    )
+    parser_get.add_argument(
+        "cursor",
+        type=str,
+        required=False,
+        location="args",
+        help="Value of next_cursor returned by the previous request, to get the next trial networks. It is optional",
+    )
+
     @trial_network_namespace.doc(security="Bearer Auth")
     @trial_network_namespace.errorhandler(PyJWTError)
     @trial_network_namespace.errorhandler(JWTExtendedException)
     @jwt_required()
+    @trial_network_namespace.expect(parser_get)
     def get(self):
         """
         Retrieve all trial networks
         """
         try:
+            view = self.parser_get.parse_args()["view"]
+            state = self.parser_get.parse_args()["state"]
+            user_created = self.parser_get.parse_args()["user_created"]
+            limit = self.parser_get.parse_args()["limit"]
+            cursor = self.parser_get.parse_args()["cursor"]
+
+            if limit is not None and not 0 < limit <= TRIAL_NETWORKS_MAX_LIMIT:
+                return {
+                    "message": f"Limit has to be between 1 and {TRIAL_NETWORKS_MAX_LIMIT}"
+                }, 400
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
             trial_networks = TrialNetworkModel.objects(
                 user_created=current_user.username
             )
             if current_user.role == "admin":
                 trial_networks = TrialNetworkModel.objects()
+                if user_created:
+                    trial_networks = trial_networks.filter(user_created=user_created)
+            if state:
+                trial_networks = trial_networks.filter(state=state)
+            if cursor:
+                if not is_base64(data=cursor):
+                    return {"message": f"Cursor {cursor} is not valid"}, 400
+                try:
+                    cursor_date_created_utc, _, cursor_tn_id = decode_base64(
+                        encoded_data=cursor
+                    ).partition("|")
+                    cursor_date_created_utc = datetime.fromisoformat(
+                        cursor_date_created_utc
+                    )
+                except ValueError:
+                    return {"message": f"Cursor {cursor} is not valid"}, 400
+                trial_networks = trial_networks.filter(
+                    Q(date_created_utc__lt=cursor_date_created_utc)
+                    | Q(
+                        date_created_utc=cursor_date_created_utc,
+                        tn_id__lt=cursor_tn_id,
+                    )
+                )
+            trial_networks = trial_networks.order_by("-date_created_utc", "-tn_id")
+            if view == "summary":
+                trial_networks = trial_networks.only(*TRIAL_NETWORK_SUMMARY_FIELDS)
+            if limit is not None:
+                trial_networks = list(trial_networks.limit(limit + 1))
+            next_cursor = None
+            if limit is not None and len(trial_networks) > limit:
+                trial_networks = trial_networks[:limit]
+                next_cursor = encode_base64(
+                    data=f"{trial_networks[-1].date_created_utc.isoformat()}|{trial_networks[-1].tn_id}"
+                )
             return {
                 "trial_networks": [
-                    trial_network.to_dict_full() for trial_network in trial_networks
-                ]
+                    trial_network.to_dict_summary()
+                    if view == "summary"
+                    else trial_network.to_dict_full()
+                    for trial_network in trial_networks
+                ],
+                "next_cursor": next_cursor,
+            }, 200
+        except CustomException as e:
+            return {"message": str(e.message)}, e.status_code
+        except Exception as e:
+            return abort(code=500, message=str(e))
+
+
+def dry_run_validation(
+    descriptor_file: FileStorage,
+    deployment_site: str,
+    library_handler: LibraryHandler,
+    sites_handler: SitesHandler,
+) -> dict:
+    """
+    Validate a descriptor without creating the trial network, collecting all its errors
+
+    :param descriptor_file: descriptor file containing YAML data, ``FileStorage``
+    :param deployment_site: trial network deployment site, ``str``
+    :param library_handler: Library handler, ``LibraryHandler``
+    :param sites_handler: Sites handler, ``SitesHandler``
+    :return: outcome of the validation of the descriptor, ``dict``
+    """
+    trial_network = TrialNetworkModel()
+    try:
+        trial_network.set_raw_descriptor(file=descriptor_file)
+        trial_network.set_deployment_site(deployment_site=deployment_site)
+        errors = trial_network.validate_descriptor(
+            library_handler=library_handler,
+            sites_handler=sites_handler,
+            collect_errors=True,
+        )
+    except CustomException as e:
+        errors = [
+            {
+                "entity": None,
+                "field": None,
+                "expected": None,
+                "path": "$",
+                "message": str(e.message),
+                "status_code": e.status_code,
+            }
+        ]
+    except Exception as e:
+        errors = [
+            {
+                "entity": None,
+                "field": None,
+                "expected": None,
+                "path": "$",
+                "message": str(e),
+                "status_code": 500,
+            }
+        ]
+    return {
+        "descriptor": descriptor_file.filename,
+        "valid": not errors,
+        "message": errors[0]["message"] if errors else None,
+        "errors": errors,
+    }
+
+
+@trial_network_namespace.route("s/validate")
+class ValidateTrialNetworks(Resource):
+    parser_post = reqparse.RequestParser()
+    parser_post.add_argument(
+        "descriptors",
+        location="files",
+        type=FileStorage,
+        required=True,
+        action="append",
+        help=f"Trial network descriptor files. Maximum **{VALIDATION_MAX_DESCRIPTORS}**",
+    )
+    parser_post.add_argument(
+        "library_reference_type",
+        type=str,
+        required=True,
+        location="form",
+        choices=LIBRARY_REFERENCES_TYPES,
+        help="Type of the Library reference",
+    )
+    parser_post.add_argument(
+        "library_reference_value",
+        type=str,
+        required=True,
+        location="form",
+        help="Value of the Library reference type",
+    )
+    parser_post.add_argument(
+        "sites_branch",
+        type=str,
+        required=False,
+        location="form",
+        help="Branch of the Sites repository. It is optional. If not specified, the one of the backend environment will be used",
+    )
+    parser_post.add_argument(
+        "deployment_site",
+        type=str,
+        required=False,
+        location="form",
+        help="Directory inside the branch of the Sites repository. It is optional. If not specified, the one of the backend environment will be used",
+    )
+    parser_post.add_argument(
+        "deployment_site_token",
+        type=str,
+        required=False,
+        location="form",
+        help="Token to decrypt the core.yaml file from the deployment site. It is optional. If not specified, the one of the backend environment will be used",
+    )
+
+    @trial_network_namespace.doc(security="Bearer Auth")
+    @trial_network_namespace.errorhandler(PyJWTError)
+    @trial_network_namespace.errorhandler(JWTExtendedException)
+    @jwt_required()
+    @trial_network_namespace.expect(parser_post)
+    def post(self):
+        """
+        Validate trial network descriptors without creating the trial networks. Nothing is stored
+        """
+        try:
+            descriptor_files = self.parser_post.parse_args()["descriptors"]
+            library_reference_type = self.parser_post.parse_args()[
+                "library_reference_type"
+            ]
+            library_reference_value = self.parser_post.parse_args()[
+                "library_reference_value"
+            ]
+            sites_branch = (
+                self.parser_post.parse_args()["sites_branch"]
+                or SitesSettings.SITES_BRANCH
+            )
+            deployment_site = (
+                self.parser_post.parse_args()["deployment_site"]
+                or SitesSettings.SITES_DEPLOYMENT_SITE
+            )
+            deployment_site_token = (
+                self.parser_post.parse_args()["deployment_site_token"]
+                or SitesSettings.SITES_DEPLOYMENT_SITE_TOKEN
+            )
+
+            if len(descriptor_files) > VALIDATION_MAX_DESCRIPTORS:
+                return {
+                    "message": f"Maximum {VALIDATION_MAX_DESCRIPTORS} descriptors can be validated in the same request"
+                }, 400
+            library_handler = LibraryHandler(
+                reference_type=library_reference_type,
+                reference_value=library_reference_value,
+            )
+            library_handler.git_client.update_mirror()
+            library_commit_id = library_handler.get_component_index().commit_id
+            library_handler = LibraryHandler(
+                reference_type="commit", reference_value=library_commit_id
+            )
+            sites_handler = SitesHandler(
+                reference_type="branch", reference_value=sites_branch
+            )
+            sites_handler.git_client.update_mirror()
+            sites_commit_id = sites_handler.load_deployment_site(
+                deployment_site=deployment_site, token=deployment_site_token
+            )
+            with ThreadPoolExecutor(max_workers=VALIDATION_WORKERS) as executor:
+                descriptors = list(
+                    executor.map(
+                        lambda descriptor_file: dry_run_validation(
+                            descriptor_file=descriptor_file,
+                            deployment_site=deployment_site,
+                            library_handler=library_handler,
+                            sites_handler=sites_handler,
+                        ),
+                        descriptor_files,
+                    )
+                )
+            return {
+                "library_commit_id": library_commit_id,
+                "sites_commit_id": sites_commit_id,
+                "deployment_site": deployment_site,
+                "descriptors": descriptors,
             }, 200
         except CustomException as e:
             return {"message": str(e.message)}, e.status_code
@@ -529,11 +819,9 @@ class SpecificTrialNetwork(Resource):
         """
         try:
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
             if not trial_network:
                 return {
                     "message": f"No trial network with identifier {tn_id} created by the user {current_user.username}"
@@ -556,7 +844,22 @@ class ActivateTrialNetwork(Resource):
         type=str,
         required=False,
         location="args",
-        help=f"Name of the Jenkins pipeline used to deploy a trial network. It is optional. If not specified, pipeline will be created inside TNLCM folder in Jenkins with the name **{JenkinsSettings.JENKINS_DEPLOY_PIPELINE}_<tn_id>**. If specified, will be checked that it exists in Jenkins and that it has nothing queued to execute",
+        help=f"Name of the Jenkins pipeline used to deploy a trial network. It is optional. If not specified, pipeline will be created inside TNLCM folder in Jenkins with the name **{JenkinsSettings.JENKINS_DEPLOY_PIPELINE}_<tn_id>**. If specified, will be checked that it exists in Jenkins. It can be shared with other trial networks, because each build is tracked through its own queue item",
+    )
+    parser_put.add_argument(
+        "max_parallel_builds",
+        type=int,
+        required=False,
+        location="args",
+        help=f"Maximum number of independent entities deployed at the same time. It is optional. If not specified, **{JenkinsSettings.JENKINS_MAX_PARALLEL_BUILDS_PER_TRIAL_NETWORK}** will be used",
+    )
+    parser_put.add_argument(
+        "resume",
+        type=inputs.boolean,
+        required=False,
+        default=False,
+        location="args",
+        help="Resume a trial network with status failed-activation. It is optional. If true, the deployment pipeline of the previous activation is used and jenkins_deploy_pipeline cannot be indicated, the builds of the entities already deployed are verified in Jenkins and only the rest of the entities are deployed again",
     )
 
     @trial_network_namespace.doc(security="Bearer Auth")
@@ -572,13 +875,13 @@ class ActivateTrialNetwork(Resource):
             jenkins_deploy_pipeline = self.parser_put.parse_args()[
                 "jenkins_deploy_pipeline"
             ]
+            max_parallel_builds = self.parser_put.parse_args()["max_parallel_builds"]
+            resume = self.parser_put.parse_args()["resume"]
 
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
             if not trial_network:
                 return {
                     "message": f"No trial network with identifier {tn_id} created by the user {current_user.username}"
@@ -592,64 +895,46 @@ class ActivateTrialNetwork(Resource):
                 return {
                     "message": f"Trial network with identifier {tn_id} is not possible to activate. Only trial networks with status validated, failed-activation or destroyed can be activated. Current status: {state}"
                 }, 400
-            jenkins_handler = JenkinsHandler(trial_network=trial_network)
-            if not jenkins_deploy_pipeline:
-                jenkins_deploy_pipeline, jenkins_deploy_pipeline_url = (
-                    jenkins_handler.clone_pipeline(
-                        old_name=JenkinsSettings.JENKINS_DEPLOY_PIPELINE,
-                        new_name=JenkinsSettings.JENKINS_TNLCM_DIRECTORY
-                        + "/"
-                        + JenkinsSettings.JENKINS_DEPLOY_PIPELINE
-                        + "_"
-                        + trial_network.tn_id,
-                    )
+            if resume and (
+                state != "failed-activation"
+                or not trial_network.jenkins_deploy.get("pipeline_name")
+            ):
+                return {
+                    "message": f"Trial network with identifier {tn_id} is not possible to resume. Only trial networks with status failed-activation whose deployment pipeline was set can be resumed. Current status: {state}"
+                }, 400
+            if resume and jenkins_deploy_pipeline:
+                return {
+                    "message": f"Trial network with identifier {tn_id} is resumed with the deployment pipeline of its previous activation {trial_network.get_jenkins_deploy_pipeline()}. Do not indicate a deployment pipeline to resume it"
+                }, 400
+            if not TrialNetworkModel.objects(tn_id=tn_id, state=state).update_one(
+                set__state="activating"
+            ):
+                return {
+                    "message": f"Trial network with identifier {tn_id} changed its state while the activation was requested"
+                }, 409
+            try:
+                job = job_handler.submit(
+                    tn_id=tn_id,
+                    user_created=current_user.username,
+                    operation="activate",
+                    parameters={
+                        "jenkins_deploy_pipeline": jenkins_deploy_pipeline,
+                        "max_parallel_builds": max_parallel_builds,
+                        "resume": resume,
+                    },
                 )
-            sites_handler = SitesHandler(
-                https_url=trial_network.sites_https_url,
-                reference_type="commit",
-                reference_value=trial_network.sites_commit_id,
-                directory_path=trial_network.directory_path,
-            )
-            site_available_components = sites_handler.get_site_available_components(
-                deployment_site=trial_network.deployment_site
-            )
-            resource_manager = ResourceManagerModel()
-            with tn_resource_manager_lock:
-                resource_manager.apply_resource_manager(
-                    trial_network=trial_network,
-                    site_available_components=site_available_components,
+            except Exception:
+                TrialNetworkModel.objects(tn_id=tn_id, state="activating").update_one(
+                    set__state=state
                 )
-            trial_network.set_jenkins_deploy_pipeline(
-                jenkins_deploy_pipeline=jenkins_deploy_pipeline,
-                jenkins_deploy_pipeline_url=jenkins_deploy_pipeline_url,
-            )
-            trial_network.set_state(state="activating")
-            trial_network.save()
-            TrialNetworkLogger(tn_id=tn_id).info(
-                message="Trial network activating. In this transition, the trial network proceeds to the deployment of the components defined in the descriptor"
-            )
-            jenkins_handler.deploy_trial_network()
-            trial_network.set_state(state="activated")
-            trial_network.save()
-            TrialNetworkLogger(tn_id=tn_id).info(
-                message="Trial network activated. In this state, the trial network has been deployed and is ready to be used"
-            )
+                raise
             return {
-                "message": f"Trial network with identifier {tn_id} activated. The trial network deployment generates a report file showing the information of the components that have been deployed"
-            }, 200
+                "message": f"Activation of the trial network with identifier {tn_id} queued. The progress can be followed with the job {job.job_id}",
+                "job_id": job.job_id,
+            }, 202
         except CustomException as e:
-            trial_network.set_state(state="failed-activation")
-            trial_network.save()
-            TrialNetworkLogger(tn_id=tn_id).info(
-                message="Trial network failed-activation. In this state, the trial network is waiting to be deployed"
-            )
             return {"message": str(e.message)}, e.status_code
         except Exception as e:
-            trial_network.set_state(state="failed-activation")
-            trial_network.save()
-            TrialNetworkLogger(tn_id=tn_id).info(
-                message="Trial network failed-activation. In this state, the trial network is waiting to be deployed"
-            )
             return abort(code=500, message=str(e))
 
 
@@ -664,7 +949,7 @@ class DestroyTrialNetwork(Resource):
         type=str,
         required=False,
         location="args",
-        help=f"Name of the Jenkins pipeline used to destroy a trial network. It is optional. If not specified, pipeline will be created inside TNLCM folder in Jenkins with the name **{JenkinsSettings.JENKINS_DESTROY_PIPELINE}_<tn_id>**. If specified, will be checked that it exists in Jenkins and that it has nothing queued to execute",
+        help=f"Name of the Jenkins pipeline used to destroy a trial network. It is optional. If not specified, pipeline will be created inside TNLCM folder in Jenkins with the name **{JenkinsSettings.JENKINS_DESTROY_PIPELINE}_<tn_id>**. If specified, will be checked that it exists in Jenkins. It can be shared with other trial networks, because each build is tracked through its own queue item",
     )
 
     @trial_network_namespace.doc(security="Bearer Auth")
@@ -682,11 +967,9 @@ class DestroyTrialNetwork(Resource):
             ]
 
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
             if not trial_network:
                 return {
                     "message": f"No trial network with identifier {tn_id} created by the user {current_user.username}"
@@ -700,61 +983,151 @@ class DestroyTrialNetwork(Resource):
                 return {
                     "message": f"Trial network with identifier {tn_id} is not possible to destroy. Only trial networks with status activated, failed-activation or failed-destruction can be destroyed. Current status: {state}"
                 }, 400
-            library_handler = LibraryHandler(
-                https_url=trial_network.library_https_url,
-                reference_type="commit",
-                reference_value=trial_network.library_commit_id,
-                directory_path=trial_network.directory_path,
-            )
-            jenkins_handler = JenkinsHandler(
-                trial_network=trial_network, library_handler=library_handler
-            )
-            if not jenkins_destroy_pipeline:
-                jenkins_destroy_pipeline, jenkins_destroy_pipeline_url = (
-                    jenkins_handler.clone_pipeline(
-                        old_name=JenkinsSettings.JENKINS_DESTROY_PIPELINE,
-                        new_name=JenkinsSettings.JENKINS_TNLCM_DIRECTORY
-                        + "/"
-                        + JenkinsSettings.JENKINS_DESTROY_PIPELINE
-                        + "_"
-                        + trial_network.tn_id,
-                    )
+            if not TrialNetworkModel.objects(tn_id=tn_id, state=state).update_one(
+                set__state="destroying"
+            ):
+                return {
+                    "message": f"Trial network with identifier {tn_id} changed its state while the destruction was requested"
+                }, 409
+            try:
+                job = job_handler.submit(
+                    tn_id=tn_id,
+                    user_created=current_user.username,
+                    operation="destroy",
+                    parameters={"jenkins_destroy_pipeline": jenkins_destroy_pipeline},
                 )
-            trial_network.set_jenkins_destroy_pipeline(
-                jenkins_destroy_pipeline=jenkins_destroy_pipeline,
-                jenkins_destroy_pipeline_url=jenkins_destroy_pipeline_url,
-            )
-            trial_network.set_state(state="destroying")
-            trial_network.save()
-            TrialNetworkLogger(tn_id=tn_id).info(
-                message="Trial network destroying. In this transition, the trial network proceeds to the destruction of the components"
-            )
-            jenkins_handler.destroy_trial_network()
-            trial_network.set_deployed_descriptor()
-            resource_manager = ResourceManagerModel()
-            with tn_resource_manager_lock:
-                resource_manager.release_resource_manager(trial_network)
-            trial_network.set_state("destroyed")
-            trial_network.save()
-            TrialNetworkLogger(tn_id=tn_id).info(
-                message="Trial network destroyed. In this state, the trial network has been destroyed and ready for deploy again"
-            )
+            except Exception:
+                TrialNetworkModel.objects(tn_id=tn_id, state="destroying").update_one(
+                    set__state=state
+                )
+                raise
             return {
-                "message": f"Trial network with identifier {tn_id} destroyed. In this state, the trial network has been destroyed and ready for deploy again"
-            }, 200
+                "message": f"Destruction of the trial network with identifier {tn_id} queued. The progress can be followed with the job {job.job_id}",
+                "job_id": job.job_id,
+            }, 202
         except CustomException as e:
-            trial_network.set_state(state="failed-destruction")
-            trial_network.save()
-            TrialNetworkLogger(tn_id=tn_id).info(
-                message="Trial network failed-destruction. In this state, the trial network is waiting to be destroyed"
+            return {"message": str(e.message)}, e.status_code
+        except Exception as e:
+            return abort(code=500, message=str(e))
+
+
+@trial_network_namespace.param(
+    name="tn_id", type="str", description="Trial network identifier"
+)
+@trial_network_namespace.route("s/<string:tn_id>/jobs")
+class JobsTrialNetwork(Resource):
+    @trial_network_namespace.doc(security="Bearer Auth")
+    @trial_network_namespace.errorhandler(PyJWTError)
+    @trial_network_namespace.errorhandler(JWTExtendedException)
+    @jwt_required()
+    def get(self, tn_id: str):
+        """
+        Retrieve the activation and destruction jobs of a trial network
+        """
+        try:
+            current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
             )
+            if not trial_network:
+                return {
+                    "message": f"No trial network with identifier {tn_id} created by the user {current_user.username}"
+                }, 404
+            jobs = JobModel.objects(tn_id=tn_id).order_by("-date_created_utc")
+            return {"jobs": [job.to_dict() for job in jobs]}, 200
+        except CustomException as e:
             return {"message": str(e.message)}, e.status_code
         except Exception as e:
-            trial_network.set_state(state="failed-destruction")
-            trial_network.save()
-            TrialNetworkLogger(tn_id=tn_id).info(
-                message="Trial network failed-destruction. In this state, the trial network is waiting to be destroyed"
+            return abort(code=500, message=str(e))
+
+
+@trial_network_namespace.param(
+    name="tn_id", type="str", description="Trial network identifier"
+)
+@trial_network_namespace.param(name="job_id", type="str", description="Job identifier")
+@trial_network_namespace.route("s/<string:tn_id>/jobs/<string:job_id>")
+class JobTrialNetwork(Resource):
+    @trial_network_namespace.doc(security="Bearer Auth")
+    @trial_network_namespace.errorhandler(PyJWTError)
+    @trial_network_namespace.errorhandler(JWTExtendedException)
+    @jwt_required()
+    def get(self, tn_id: str, job_id: str):
+        """
+        Retrieve the state of a job of a trial network and the progress of each entity
+        """
+        try:
+            current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
             )
+            if not trial_network:
+                return {
+                    "message": f"No trial network with identifier {tn_id} created by the user {current_user.username}"
+                }, 404
+            job = JobModel.objects(tn_id=tn_id, job_id=job_id).first()
+            if not job:
+                return {
+                    "message": f"No job with identifier {job_id} for the trial network {tn_id}"
+                }, 404
+            return job.to_dict(), 200
+        except CustomException as e:
+            return {"message": str(e.message)}, e.status_code
+        except Exception as e:
+            return abort(code=500, message=str(e))
+
+
+@trial_network_namespace.param(
+    name="tn_id", type="str", description="Trial network identifier"
+)
+@trial_network_namespace.param(
+    name="build_name",
+    type="str",
+    description="Name of the entity whose deployment console is retrieved, or destroy to retrieve the console of the last destruction",
+)
+@trial_network_namespace.route("s/<string:tn_id>/console/<string:build_name>")
+class ConsoleTrialNetwork(Resource):
+    @trial_network_namespace.doc(security="Bearer Auth")
+    @trial_network_namespace.errorhandler(PyJWTError)
+    @trial_network_namespace.errorhandler(JWTExtendedException)
+    @jwt_required()
+    def get(self, tn_id: str, build_name: str):
+        """
+        Retrieve the Jenkins console output of the deployment of an entity or of the destruction of a trial network
+        """
+        try:
+            current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
+            if not trial_network:
+                return {
+                    "message": f"No trial network with identifier {tn_id} created by the user {current_user.username}"
+                }, 404
+            build = None
+            if build_name == "destroy":
+                builds = trial_network.jenkins_destroy.get("builds", {})
+                if builds:
+                    build = builds[max(builds, key=int)]
+            else:
+                build = trial_network.jenkins_deploy.get("builds", {}).get(build_name)
+            if not build:
+                return {
+                    "message": f"No build of {build_name} in the trial network {tn_id}"
+                }, 404
+            build_console = build.get("build_console", "")
+            if "build_console_id" in build:
+                jenkins_build_console = JenkinsBuildConsoleModel.objects(
+                    id=build["build_console_id"], tn_id=tn_id
+                ).first()
+                if not jenkins_build_console:
+                    return {
+                        "message": f"No console of the build of {build_name} in the trial network {tn_id}"
+                    }, 404
+                build_console = jenkins_build_console.get_console()
+            return {"build_name": build_name, "build_console": build_console}, 200
+        except CustomException as e:
+            return {"message": str(e.message)}, e.status_code
+        except Exception as e:
             return abort(code=500, message=str(e))
 
 
@@ -763,21 +1136,39 @@ class DestroyTrialNetwork(Resource):
 )
 @trial_network_namespace.route("s/<string:tn_id>/log/content")
 class LogTrialNetwork(Resource):
+    parser_get = reqparse.RequestParser()
+    parser_get.add_argument(
+        "offset",
+        type=int,
+        required=False,
+        location="args",
+        help="Byte offset from which the log is read. It is optional. If not specified, the whole log is returned. The offset to use in the next request is returned with the content",
+    )
+    parser_get.add_argument(
+        "section",
+        type=str,
+        required=False,
+        location="args",
+        help="Section of the log to be returned. It is optional. The sections are the names of the entities of the trial network and destroy",
+    )
+
     @trial_network_namespace.doc(security="Bearer Auth")
     @trial_network_namespace.errorhandler(PyJWTError)
     @trial_network_namespace.errorhandler(JWTExtendedException)
     @jwt_required()
+    @trial_network_namespace.expect(parser_get)
     def get(self, tn_id):
         """
         Retrieve the content of the trial network log file
         """
         try:
+            offset = self.parser_get.parse_args()["offset"]
+            section = self.parser_get.parse_args()["section"]
+
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
             if not trial_network:
                 return {
                     "message": f"No trial network with identifier {tn_id} created by the user {current_user.username}"
@@ -787,8 +1178,14 @@ class LogTrialNetwork(Resource):
                 return {
                     "message": f"Trial network with identifier {tn_id} log file not found"
                 }, 404
-            log_content = load_file(file_path=log_path)
-            return {"log_content": log_content}, 200
+            if offset and offset < 0:
+                return {"message": "The offset should be a positive number"}, 400
+            trial_network_logger = TrialNetworkLogger(tn_id=tn_id)
+            if section:
+                log_content = trial_network_logger.read_section(section=section)
+                return {"log_content": log_content}, 200
+            log_content, offset = trial_network_logger.read(offset=offset or 0)
+            return {"log_content": log_content, "offset": offset}, 200
         except CustomException as e:
             return {"message": str(e.message)}, e.status_code
         except Exception as e:
@@ -810,11 +1207,9 @@ class DownloadLogTrialNetwork(Resource):
         """
         try:
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
             if not trial_network:
                 return {
                     "message": f"No trial network with identifier {tn_id} created by the user {current_user.username}"
@@ -852,11 +1247,9 @@ class PurgeTrialNetwork(Resource):
         """
         try:
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
             if not trial_network:
                 return {
                     "message": f"No trial network with identifier {tn_id} created by the user {current_user.username}"
@@ -872,7 +1265,13 @@ class PurgeTrialNetwork(Resource):
                 jenkins_handler.remove_pipeline(pipeline_name=jenkins_deploy_pipeline)
                 jenkins_destroy_pipeline = trial_network.get_jenkins_destroy_pipeline()
                 jenkins_handler.remove_pipeline(pipeline_name=jenkins_destroy_pipeline)
+            TrialNetworkLogger.discard(tn_id=tn_id)
             remove_directory(path=trial_network.directory_path)
+            JenkinsBuildEventModel.objects(tn_id=tn_id).delete()
+            JenkinsPipelineModel.objects(tn_id=tn_id).delete()
+            for jenkins_build_console in JenkinsBuildConsoleModel.objects(tn_id=tn_id):
+                jenkins_build_console.delete()
+            JobModel.objects(tn_id=tn_id).delete()
             trial_network.delete()
             return {
                 "message": f"Trial network with identifier {tn_id} has been purged. In this state, the trial network has been deleted and cannot be recovered"
@@ -888,21 +1287,55 @@ class PurgeTrialNetwork(Resource):
 )
 @trial_network_namespace.route("s/<string:tn_id>/report/content")
 class ReportTrialNetwork(Resource):
+    parser_get = reqparse.RequestParser()
+    parser_get.add_argument(
+        "entity_name",
+        type=str,
+        required=False,
+        location="args",
+        help="Name of the entity whose part of the report is returned. It is optional",
+    )
+    parser_get.add_argument(
+        "start",
+        type=int,
+        required=False,
+        location="args",
+        help="Position of the first report fragment to be returned. It is optional. The position to use in the next request to get only the new fragments is returned with the content",
+    )
+    parser_get.add_argument(
+        "end",
+        type=int,
+        required=False,
+        location="args",
+        help="Position after the last report fragment to be returned. It is optional",
+    )
+
     @trial_network_namespace.doc(security="Bearer Auth")
     @trial_network_namespace.errorhandler(PyJWTError)
     @trial_network_namespace.errorhandler(JWTExtendedException)
     @jwt_required()
+    @trial_network_namespace.expect(parser_get)
     def get(self, tn_id: str):
         """
         Retrieve the content of the trial network report file
         """
         try:
+            entity_name = self.parser_get.parse_args()["entity_name"]
+            start = self.parser_get.parse_args()["start"]
+            end = self.parser_get.parse_args()["end"]
+
+            if (start is not None and start < 0) or (
+                end is not None and end < (start or 0)
+            ):
+                return {
+                    "message": "Start has to be positive and end has to be greater than or equal to start"
+                }, 400
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user,
+                tn_id=tn_id,
+                fields=["tn_id", "state", "report_version"],
+            )
             if not trial_network:
                 return {
                     "message": f"No trial network with identifier {tn_id} created by the user {current_user.username}"
@@ -911,7 +1344,52 @@ class ReportTrialNetwork(Resource):
                 return {
                     "message": f"Trial network with identifier {tn_id} is not possible to retrieve the report. Only trial networks with status activated can retrieve the report. Current status: {trial_network.state}"
                 }, 400
-            return {"report_content": trial_network.report}, 200
+            report_etag = trial_network.get_report_etag()
+            if request.if_none_match.contains(report_etag):
+                return None, 304, {"ETag": f'"{report_etag}"'}
+            if end is not None and end == (start or 0):
+                return (
+                    {
+                        "report_content": "",
+                        "report_fragments": [],
+                        "next_start": end,
+                    },
+                    200,
+                    {"ETag": f'"{report_etag}"'},
+                )
+            report_fragments_query = TrialNetworkModel.objects(tn_id=tn_id).only(
+                "tn_id", "report", "report_fragments", "report_version"
+            )
+            if start is not None or end is not None:
+                start = start or 0
+                report_fragments_query = report_fragments_query.fields(
+                    slice__report_fragments=[
+                        start,
+                        end - start if end is not None else REPORT_FRAGMENTS_MAX_SLICE,
+                    ]
+                )
+            trial_network = report_fragments_query.first()
+            report_fragments = trial_network.get_report_fragments(
+                start=start or 0, entity_name=entity_name
+            )
+            if start is None and entity_name is None:
+                report_content = trial_network.get_report()
+            else:
+                report_content = "".join(
+                    report_fragment["markdown"] for report_fragment in report_fragments
+                )
+            next_start = (start or 0) + len(trial_network.report_fragments)
+            for report_fragment in report_fragments:
+                del report_fragment["markdown"]
+            return (
+                {
+                    "report_content": report_content,
+                    "report_fragments": report_fragments,
+                    "next_start": next_start,
+                },
+                200,
+                {"ETag": f'"{report_etag}"'},
+            )
         except CustomException as e:
             return {"message": str(e.message)}, e.status_code
         except Exception as e:
@@ -933,11 +1411,9 @@ class DownloadReportTrialNetwork(Resource):
         """
         try:
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
             if not trial_network:
                 return {
                     "message": f"No trial network with identifier {tn_id} created by the user {current_user.username}"
@@ -946,15 +1422,14 @@ class DownloadReportTrialNetwork(Resource):
                 return {
                     "message": f"Trial network with identifier {tn_id} is not possible to download the report. Only trial networks with status activated can download the report. Current status: {trial_network.state}"
                 }, 400
-            report = trial_network.report
             file_name = f"{trial_network.tn_id}.md"
-            report_path = join_path(trial_network.directory_path, file_name)
-            save_file(data=report, file_path=report_path)
             return send_file(
-                path_or_file=report_path,
+                path_or_file=BytesIO(trial_network.get_report().encode("utf-8")),
                 as_attachment=True,
                 download_name=file_name,
                 mimetype="application/octet-stream",
+                etag=trial_network.get_report_etag(),
+                conditional=True,
             )
         except CustomException as e:
             return {"message": str(e.message)}, e.status_code
@@ -977,11 +1452,9 @@ class DownloadReportTrialNetworkPdf(Resource):
         """
         try:
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
             if not trial_network:
                 return {
                     "message": f"No trial network with identifier {tn_id} created by the user {current_user.username}"
@@ -990,9 +1463,9 @@ class DownloadReportTrialNetworkPdf(Resource):
                 return {
                     "message": f"Trial network with identifier {tn_id} is not possible to download the report. Only trial networks with status activated can download the report. Current status: {trial_network.state}"
                 }, 400
-            # report = trial_network.report
             file_name = f"{trial_network.tn_id}.md"
             report_path = join_path(trial_network.directory_path, file_name)
+            save_file(data=trial_network.get_report(), file_path=report_path)
         
             report_generator = ReportGenerator()
             
@@ -1050,11 +1523,9 @@ class UpdateTrialNetwork(Resource):
             descriptor_file = self.parser_put.parse_args()["descriptor"]
 
             current_user = get_current_user_from_jwt(jwt_identity=get_jwt_identity())
-            trial_network = TrialNetworkModel.objects(
-                user_created=current_user.username, tn_id=tn_id
-            ).first()
-            if current_user.role == "admin":
-                trial_network = TrialNetworkModel.objects(tn_id=tn_id).first()
+            trial_network = get_user_trial_network(
+                current_user=current_user, tn_id=tn_id
+            )
             if not trial_network:
                 return {
                     "message": f"No trial network with identifier {tn_id} created by the user {current_user.username}"
@@ -1083,7 +1554,7 @@ class UpdateTrialNetwork(Resource):
 #         "jenkins_suspend_pipeline",
 #         type=str,
 #         required=False,
-#         help=f"Name of the Jenkins pipeline used to suspend a trial network. It is optional. If not specified, pipeline will be created inside TNLCM folder in Jenkins with the name **{JenkinsSettings.JENKINS_SUSPEND_PIPELINE}_<tn_id>**. If specified, will be checked that it exists in Jenkins and that it has nothing queued to execute",
+#         help=f"Name of the Jenkins pipeline used to suspend a trial network. It is optional. If not specified, pipeline will be created inside TNLCM folder in Jenkins with the name **{JenkinsSettings.JENKINS_SUSPEND_PIPELINE}_<tn_id>**. If specified, will be checked that it exists in Jenkins. It can be shared with other trial networks, because each build is tracked through its own queue item",
 #     )
 
 #     @trial_network_namespace.doc(security="Bearer Auth")
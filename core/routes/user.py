@@ -11,7 +11,7 @@ from flask_jwt_extended.exceptions import JWTExtendedException
 from flask_restx import Namespace, Resource, abort, reqparse
 from jwt.exceptions import PyJWTError
 
-from core.auth.auth import get_current_user_from_jwt
+from core.auth.auth import get_current_user_from_jwt, invalidate_current_user
 from core.exceptions.exceptions import CustomException
 from core.models.user import UserModel
 
@@ -78,6 +78,7 @@ class ChangePassword(Resource):
                 return {"message": "New password is the same as the old password"}, 400
             user.set_password(secret=new_password)
             user.save()
+            invalidate_current_user(username=user.username)
             return {"message": "Password changed"}, 200
         except CustomException as e:
             return {"message": str(e.message)}, e.status_code
@@ -1,13 +1,56 @@
-from typing import Dict, List
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from typing import Dict, List, Tuple
 
 from conf.sites import SitesSettings
 from core.exceptions.exceptions import SitesError
-from core.libs.git import Git
-from core.utils.file import load_yaml
+from core.libs.git import Git, GitObjectReader, get_git_object_reader
+from core.utils.file import load_file, load_yaml, save_file
 from core.utils.os import exist_directory, get_absolute_path, is_file, join_path
+from core.utils.parser import ansible_vault_decrypt, yaml_to_dict
 
 SITES_PATH = join_path(get_absolute_path(__file__), SitesSettings.SITES_REPOSITORY_NAME)
 SITES_REFERENCES_TYPES = ["branch", "commit"]
+SITE_CATALOGS_CACHE_SIZE = 64
+
+site_catalogs = OrderedDict()
+site_catalogs_lock = Lock()
+
+
+def get_site_catalog(
+    encrypted_data: str, deployment_site: str, token: str
+) -> Tuple[str, Dict]:
+    """
+    Get the decrypted core.yaml file of a deployment site and its components. They are cached by the digest of the encrypted file, the deployment site and the digest of the token, so the same file of a Sites commit is decrypted and parsed only once
+
+    :param encrypted_data: content of the encrypted core.yaml file, ``str``
+    :param deployment_site: trial network deployment site, ``str``
+    :param token: the token to decrypt the core.yaml file, ``str``
+    :return: decrypted core.yaml file and components available on the site, ``Tuple[str, Dict]``
+    :raise VaultError:
+    """
+    site_catalog_key = (
+        sha256(encrypted_data.encode(encoding="utf-8")).hexdigest(),
+        deployment_site,
+        sha256(token.encode(encoding="utf-8")).hexdigest(),
+    )
+    with site_catalogs_lock:
+        site_catalog = site_catalogs.get(site_catalog_key)
+        if site_catalog:
+            site_catalogs.move_to_end(site_catalog_key)
+            return site_catalog
+    decrypted_data = ansible_vault_decrypt(data=encrypted_data, token=token)
+    data = yaml_to_dict(data=decrypted_data)
+    site_available_components = {}
+    if data and "site_available_components" in data:
+        site_available_components = data["site_available_components"]
+    site_catalog = (decrypted_data, site_available_components)
+    with site_catalogs_lock:
+        site_catalogs[site_catalog_key] = site_catalog
+        if len(site_catalogs) > SITE_CATALOGS_CACHE_SIZE:
+            site_catalogs.popitem(last=False)
+    return site_catalog
 
 
 class SitesHandler:
@@ -54,6 +97,75 @@ class SitesHandler:
             github_reference_type=self.sites_reference_type,
             github_reference_value=self.sites_reference_value,
         )
+        self.sites_available_components = {}
+
+    def decrypt_deployment_site(self, deployment_site: str, token: str) -> None:
+        """
+        Function to decrypt the core.yaml file of the deployment site. The decrypted file and its components are cached, so the same file of a Sites commit is decrypted and parsed only once
+
+        :param deployment_site: trial network deployment site, ``str``
+        :param token: the token to decrypt the core.yaml file, ``str``
+        :raise SitesError:
+        """
+        sites_core_path = join_path(
+            self.sites_local_directory, deployment_site, "core.yaml"
+        )
+        if not is_file(path=sites_core_path):
+            raise SitesError(
+                message=f"File {sites_core_path} not found in {self.sites_reference_type} reference type and {self.sites_reference_value} reference value",
+                status_code=404,
+            )
+        decrypted_data, site_available_components = get_site_catalog(
+            encrypted_data=load_file(file_path=sites_core_path),
+            deployment_site=deployment_site,
+            token=token,
+        )
+        save_file(data=decrypted_data, file_path=sites_core_path)
+        self.sites_available_components[deployment_site] = site_available_components
+
+    def get_git_object_reader(self) -> GitObjectReader:
+        """
+        Function to get the reader of the Git objects of the mirror of the Sites repository
+
+        :return: reader of the Git objects, ``GitObjectReader``
+        """
+        return get_git_object_reader(
+            repository_directory=self.git_client.github_mirror_directory
+        )
+
+    def load_deployment_site(self, deployment_site: str, token: str) -> str:
+        """
+        Function to decrypt the core.yaml file of the deployment site read from the mirror of the Sites repository. Nothing is written to disk
+
+        :param deployment_site: trial network deployment site, ``str``
+        :param token: the token to decrypt the core.yaml file, ``str``
+        :return: commit of the Sites repository the file has been read from, ``str``
+        :raise SitesError:
+        """
+        git_object_reader = self.get_git_object_reader()
+        commit_id = git_object_reader.resolve_commit(
+            reference_value=self.sites_reference_value
+        )
+        if commit_id is None:
+            raise SitesError(
+                message=f"Reference {self.sites_reference_value} not found in the Sites repository",
+                status_code=404,
+            )
+        encrypted_data = git_object_reader.read_file(
+            reference_value=commit_id, path=f"{deployment_site}/core.yaml"
+        )
+        if encrypted_data is None:
+            raise SitesError(
+                message=f"File {deployment_site}/core.yaml not found in {self.sites_reference_type} reference type and {self.sites_reference_value} reference value",
+                status_code=404,
+            )
+        _, site_available_components = get_site_catalog(
+            encrypted_data=encrypted_data.decode(),
+            deployment_site=deployment_site,
+            token=token,
+        )
+        self.sites_available_components[deployment_site] = site_available_components
+        return commit_id
 
     def get_available_components_names(self, deployment_site: str) -> List[str]:
         """
@@ -78,6 +190,8 @@ class SitesHandler:
         :return: dictionary with all information of all components available on a site, ``Dict``
         :raise SitesError:
         """
+        if deployment_site in self.sites_available_components:
+            return self.sites_available_components[deployment_site]
         sites_core_path = join_path(
             self.sites_local_directory, deployment_site, "core.yaml"
         )
@@ -87,9 +201,11 @@ class SitesHandler:
                 status_code=404,
             )
         data = load_yaml(file_path=sites_core_path)
-        if not data or "site_available_components" not in data:
-            return {}
-        return data["site_available_components"]
+        site_available_components = {}
+        if data and "site_available_components" in data:
+            site_available_components = data["site_available_components"]
+        self.sites_available_components[deployment_site] = site_available_components
+        return site_available_components
 
     def validate_component_available_site(
         self, deployment_site: str, component_name: str
@@ -1,4 +1,5 @@
 import json
+from io import StringIO
 from typing import Dict
 
 from ruamel.yaml import YAML
@@ -83,14 +84,12 @@ def save_json_file(
         json.dump(data, json_file, indent=4)
 
 
-def save_yaml_file(
-    data, file_path: str, mode: str = "wt", encoding: str = "utf-8"
-) -> None:
+def dumps_yaml(data) -> str:
     """
-    Save the data to a YAML file, preserving quotes using ruamel.yaml
+    Dump the data to a YAML string, preserving quotes using ruamel.yaml
 
-    :param data: the data to be saved (must be serializable to YAML)
-    :param file_path: The file path where the data will be saved, ``str``
+    :param data: the data to be dumped (must be serializable to YAML)
+    :return: the data dumped to YAML with the strings double quoted, ``str``
     """
     yaml = YAML()
     yaml.preserve_quotes = True
@@ -105,7 +104,18 @@ def save_yaml_file(
         else:
             return data
 
-    data = convert_to_double_quoted(data)
+    stream = StringIO()
+    yaml.dump(data=convert_to_double_quoted(data), stream=stream)
+    return stream.getvalue()
 
-    with open(file=file_path, mode=mode, encoding=encoding) as yaml_file:
-        yaml.dump(data=data, stream=yaml_file)
\ No newline at end of file
+
+def save_yaml_file(
+    data, file_path: str, mode: str = "wt", encoding: str = "utf-8"
+) -> None:
+    """
+    Save the data to a YAML file, preserving quotes using ruamel.yaml
+
+    :param data: the data to be saved (must be serializable to YAML)
+    :param file_path: The file path where the data will be saved, ``str``
+    """
+    save_file(data=dumps_yaml(data), file_path=file_path, mode=mode, encoding=encoding)
@@ -8,6 +8,7 @@ SITES_PATH = os.path.join(CORE_PATH, "sites")
 TEMP_PATH = os.path.join(PROJECT_PATH, ".temp")
 DOTENV_DEV_PATH = os.path.join(PROJECT_PATH, ".env.dev")
 DOTENV_PATH = os.path.join(PROJECT_PATH, ".env")
+GIT_MIRRORS_PATH = os.path.join(CORE_PATH, "git_mirrors")
 PYPROJECT_TOML_PATH = os.path.join(PROJECT_PATH, "pyproject.toml")
 SITES_TOKEN_PATH = os.path.join(SITES_PATH, "sites_token")
 TRIAL_NETWORKS_PATH = os.path.join(CORE_PATH, "trial_networks")
@@ -1,13 +1,24 @@
+import ast
 import base64
-from typing import Dict
-
+import binascii
+import hashlib
+import hmac
+import operator
+from typing import Any, Callable, Dict, Set
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.padding import PKCS7
 from ruamel.yaml import YAML
 
-from core.exceptions.exceptions import Base64Error
+from core.exceptions.exceptions import Base64Error, VaultError
 from core.utils.cli import run_command
-from core.utils.file import save_file
+from core.utils.file import load_file, save_file
 from core.utils.os import SITES_TOKEN_PATH
 
+ANSIBLE_VAULT_HEADER = "$ANSIBLE_VAULT"
+ANSIBLE_VAULT_CIPHER = "AES256"
+ANSIBLE_VAULT_KEY_ITERATIONS = 10000
+
 
 def ansible_decrypt(data_path: str, token: str) -> None:
     """
@@ -15,14 +26,62 @@ def ansible_decrypt(data_path: str, token: str) -> None:
 
     :param data_path: the path to the file to be decrypted, ``str``
     :param token: the token to decrypt the file, ``str``
+    :raise VaultError:
     """
     save_file(
-        file_path=SITES_TOKEN_PATH,
-        data=token,
+        file_path=data_path,
+        data=ansible_vault_decrypt(data=load_file(file_path=data_path), token=token),
     )
-    run_command(
-        command=f"ansible-vault decrypt {data_path} --vault-password={SITES_TOKEN_PATH}"
+
+
+def ansible_vault_decrypt(data: str, token: str) -> str:
+    """
+    Decrypt a string encrypted with Ansible Vault (format 1.1 or 1.2 with AES256), in the same way as ansible-vault but without running it
+
+    :param data: the encrypted string, ``str``
+    :param token: the token to decrypt the string, ``str``
+    :return: the decrypted string, ``str``
+    :raise VaultError:
+    """
+    lines = data.strip().splitlines()
+    header = lines[0].strip().split(";") if lines else []
+    if (
+        len(header) < 3
+        or header[0] != ANSIBLE_VAULT_HEADER
+        or header[2] != ANSIBLE_VAULT_CIPHER
+    ):
+        raise VaultError(
+            message="Data is not encrypted with Ansible Vault", status_code=400
+        )
+    try:
+        salt, expected_hmac, ciphertext = [
+            binascii.unhexlify(part)
+            for part in binascii.unhexlify("".join(lines[1:]).strip()).split(b"\n")
+        ]
+    except (binascii.Error, ValueError):
+        raise VaultError(
+            message="Data encrypted with Ansible Vault is malformed", status_code=400
+        )
+    key = hashlib.pbkdf2_hmac(
+        hash_name="sha256",
+        password=token.strip().encode(encoding="utf-8"),
+        salt=salt,
+        iterations=ANSIBLE_VAULT_KEY_ITERATIONS,
+        dklen=80,
     )
+    cipher_key, hmac_key, iv = key[:32], key[32:64], key[64:]
+    if not hmac.compare_digest(
+        hmac.new(key=hmac_key, msg=ciphertext, digestmod=hashlib.sha256).digest(),
+        expected_hmac,
+    ):
+        raise VaultError(
+            message="Decryption failed. The token does not decrypt the data encrypted with Ansible Vault",
+            status_code=400,
+        )
+    decryptor = Cipher(algorithms.AES(cipher_key), modes.CTR(iv)).decryptor()
+    unpadder = PKCS7(algorithms.AES.block_size).unpadder()
+    plaintext = unpadder.update(decryptor.update(ciphertext) + decryptor.finalize())
+    return (plaintext + unpadder.finalize()).decode(encoding="utf-8")
 
 
 def ansible_encrypt(data_path: str, token: str) -> None:
@@ -88,3 +147,96 @@ def yaml_to_dict(data: str) -> Dict:
     yaml.preserve_quotes = True
     yaml.default_flow_style = False
     return yaml.load(stream=data)
+
+
+COMPARISON_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+
+def compile_boolean_expression(
+    expression: str, required_fields: Set[str] = frozenset()
+) -> Callable[[Dict], Any]:
+    """
+    Compile a boolean expression once into a function that evaluates it in the context of a dictionary. Only and, or, comparisons, names and constants are allowed
+
+    :param expression: the boolean expression to be compiled, ``str``
+    :param required_fields: names that cannot be used in the expression because they are always required, ``Set[str]``
+    :return: function that evaluates the expression with the values of a dictionary, ``Callable[[Dict], Any]``
+    :raise SyntaxError:
+    :raise TypeError:
+    """
+    return _compile_boolean_node(
+        node=ast.parse(expression, mode="eval").body, required_fields=required_fields
+    )
+
+
+def _compile_boolean_node(node: ast.AST, required_fields: Set[str]) -> Callable:
+    """
+    Compile a node of the syntax tree of a boolean expression
+
+    :param node: node of the syntax tree, ``ast.AST``
+    :param required_fields: names that cannot be used in the expression because they are always required, ``Set[str]``
+    :return: function that evaluates the node with the values of a dictionary, ``Callable``
+    :raise TypeError:
+    """
+    if isinstance(node, ast.BoolOp):
+        operands = [
+            _compile_boolean_node(node=value, required_fields=required_fields)
+            for value in node.values
+        ]
+        stop_value = isinstance(node.op, ast.Or)
+
+        def evaluate_bool_op(context: Dict) -> Any:
+            for operand in operands:
+                value = operand(context)
+                if bool(value) is stop_value:
+                    return value
+            return value
+
+        return evaluate_bool_op
+    if isinstance(node, ast.Compare):
+        left = _compile_boolean_node(node=node.left, required_fields=required_fields)
+        comparisons = []
+        for op, comparator in zip(node.ops, node.comparators):
+            if type(op) not in COMPARISON_OPERATORS:
+                raise TypeError(f"Unsupported operator: {type(op).__name__}")
+            comparisons.append(
+                (
+                    COMPARISON_OPERATORS[type(op)],
+                    _compile_boolean_node(
+                        node=comparator, required_fields=required_fields
+                    ),
+                )
+            )
+
+        def evaluate_compare(context: Dict) -> bool:
+            left_value = left(context)
+            for comparison_operator, right in comparisons:
+                right_value = right(context)
+                if not comparison_operator(left_value, right_value):
+                    return False
+                left_value = right_value
+            return True
+
+        return evaluate_compare
+    if isinstance(node, ast.Name):
+        field_name = node.id
+        if field_name in required_fields:
+
+            def evaluate_required_name(context: Dict) -> Any:
+                raise ValueError(
+                    f"Field '{field_name}' is required but missing in context."
+                )
+
+            return evaluate_required_name
+        return lambda context: context.get(field_name, None)
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda context: value
+    raise TypeError(f"Unsupported AST node: {type(node)}")